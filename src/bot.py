@@ -1,10 +1,11 @@
 from typing import Any
 
 import discord
+from config import Config
 from control.controller import Controller
 from control.logger import BotLogger
 from datalayer.database import Database
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 
 class CrunchyBot(commands.Bot):
@@ -15,6 +16,7 @@ class CrunchyBot(commands.Bot):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        self.database: Database = None
 
     async def setup_hook(self) -> None:
         self.logger = BotLogger(self, self.LOG_FILE)
@@ -22,6 +24,7 @@ class CrunchyBot(commands.Bot):
         self.controller = Controller(self, self.logger, self.database)
 
         await self.database.create_tables()
+        self.db_maintenance.start()
 
         await self.load_extension("cogs.police")
         await self.load_extension("cogs.jail")
@@ -35,6 +38,20 @@ class CrunchyBot(commands.Bot):
         await self.load_extension("cogs.chat")
         await self.load_extension("cogs.combat")
 
+    @tasks.loop(minutes=Config.DB_MAINTENANCE_INTERVAL)
+    async def db_maintenance(self):
+        await self.database.run_maintenance()
+
+    @db_maintenance.before_loop
+    async def before_db_maintenance(self):
+        await self.wait_until_ready()
+
+    async def close(self) -> None:
+        self.db_maintenance.cancel()
+        await super().close()
+        if self.database is not None:
+            await self.database.close()
+
     async def on_guild_join(self, guild):
         self.logger.log(guild.id, "new guild registered.")
 
@@ -346,6 +346,54 @@ class BeansBasics(BeansGroup):
         output = "Action complete."
         await self.bot.command_response(self.__cog_name__, interaction, output)
 
+    @app_commands.command(
+        name="rebuild_balances",
+        description="Replay all beans events and rebuild the stored balances.",
+    )
+    @app_commands.check(__has_permission)
+    @app_commands.guild_only()
+    async def rebuild_balances(self, interaction: discord.Interaction) -> None:
+        author_id = 90043934247501824
+        await interaction.response.defer(ephemeral=True)
+        if interaction.user.id != author_id:
+            raise app_commands.MissingPermissions
+
+        mismatches = await self.database.verify_beans_balances(rebuild=True)
+
+        for guild_id, member_id, season, stored, replayed in mismatches:
+            self.logger.log(
+                guild_id,
+                f"Beans balance mismatch for {member_id} in {season.value}: stored {stored}, replayed {replayed}.",
+                cog=self.__cog_name__,
+            )
+
+        output = f"Balances rebuilt, {len(mismatches)} mismatches were corrected."
+        await self.bot.command_response(self.__cog_name__, interaction, output)
+
+    @app_commands.command(
+        name="rebuild_inventories",
+        description="Replay all inventory events and rebuild the stored item counts.",
+    )
+    @app_commands.check(__has_permission)
+    @app_commands.guild_only()
+    async def rebuild_inventories(self, interaction: discord.Interaction) -> None:
+        author_id = 90043934247501824
+        await interaction.response.defer(ephemeral=True)
+        if interaction.user.id != author_id:
+            raise app_commands.MissingPermissions
+
+        mismatches = await self.database.verify_inventory_counts(rebuild=True)
+
+        for guild_id, member_id, item_type, season, stored, replayed in mismatches:
+            self.logger.log(
+                guild_id,
+                f"Item count mismatch for {member_id} {item_type} in {season.value}: stored {stored}, replayed {replayed}.",
+                cog=self.__cog_name__,
+            )
+
+        output = f"Item counts rebuilt, {len(mismatches)} mismatches were corrected."
+        await self.bot.command_response(self.__cog_name__, interaction, output)
+
     @app_commands.command(
         name="settings",
         description="Overview of all beans related settings and their current value.",
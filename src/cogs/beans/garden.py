@@ -64,7 +64,7 @@ class Garden(BeansGroup):
             "sys", "Garden view refresh task started.", cog=self.__cog_name__
         )
 
-        for view in self.controller.views:
+        for view in list(self.controller.views.values()):
             if isinstance(view, GardenView | PlotView):
                 garden = await self.database.get_user_garden(
                     view.guild_id, view.member_id
@@ -46,6 +46,9 @@ class Bully(commands.Cog):
 
     @commands.Cog.listener()
     async def on_ready(self):
+        await self.item_manager.rebuild_trigger_index(
+            [guild.id for guild in self.bot.guilds]
+        )
         self.logger.log(
             "init", str(self.__cog_name__) + " loaded.", cog=self.__cog_name__
         )
@@ -14,7 +14,7 @@ from control.role_manager import RoleManager
 from control.settings_manager import SettingsManager
 from datalayer.database import Database
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 from events.jail_event import JailEvent
 from events.types import JailEventType
 from view.settings_modal import SettingsModal
@@ -53,50 +53,6 @@ class Jail(commands.Cog):
             return False
         return True
     
-    @tasks.loop(seconds=20)
-    async def jail_check(self):
-        self.logger.debug("sys", 'Jail Check task started', cog=self.__cog_name__)
-        
-        for guild in self.bot.guilds:
-            guild_id = guild.id
-            self.logger.debug(guild_id, f'Jail Check for guild {guild.name}.', cog=self.__cog_name__)
-            active_jails = await self.database.get_active_jails_by_guild(guild_id)
-            
-            for jail in active_jails:
-                member = guild.get_member(jail.member_id)
-                duration = await self.jail_manager.get_jail_duration(jail)
-                remaining = await self.jail_manager.get_jail_remaining(jail)
-                
-                self.logger.debug(guild_id, f'Jail Check for {member.name}. Duration: {duration}, Remaining: {remaining}', cog=self.__cog_name__)
-                
-                if remaining > 0:
-                    continue
-                    
-                jail_role = await self.settings_manager.get_jail_role(guild_id)
-                jail_channels = await self.settings_manager.get_jail_channels(guild_id)
-                
-                await member.remove_roles(member.get_role(jail_role))
-                
-                self.logger.log(guild_id, f'User {member.name} was released from jail after {BotUtil.strfdelta(duration, inputtype='minutes')}.', cog=self.__cog_name__)
-                
-                time_now = datetime.datetime.now()
-                event = JailEvent(time_now, guild_id, JailEventType.RELEASE, self.bot.user.id, 0, jail.id)
-                await self.controller.dispatch_event(event)
-                
-                for channel_id in jail_channels:
-                    channel = guild.get_channel(channel_id)
-                    await channel.send(f'<@{member.id}> was released from jail after {BotUtil.strfdelta(duration, inputtype='minutes')}.')
-    
-    @jail_check.before_loop
-    async def before_jail_check(self):
-        await self.bot.wait_until_ready()
-    
-    @jail_check.after_loop
-    async def on_jail_check_cancel(self):
-        # pylint: disable-next=no-member
-        if self.jail_check.is_being_cancelled():
-            self.logger.log(self.__cog_name__, 'Jail check task was cancelled.')
-    
     @commands.Cog.listener()
     async def on_ready(self):
         jails = await self.database.get_active_jails()
@@ -130,8 +86,7 @@ class Jail(commands.Cog):
             
             self.logger.log("init",f'Continuing jail sentence of {member.name} in {guild.name}. Remaining duration: {BotUtil.strfdelta(remaining, inputtype='minutes')}', cog=self.__cog_name__)
         
-        # pylint: disable-next=no-member
-        self.jail_check.start()
+        await self.jail_manager.start_release_scheduler()
         
         self.logger.log("init",str(self.__cog_name__) + " loaded.", cog=self.__cog_name__)
     
@@ -251,6 +206,24 @@ class Jail(commands.Cog):
         await self.bot.command_response(self.__cog_name__, interaction, f'Jail role was set to `{role.name}` .', args=[role.name])
 
     
+    @group.command(name="rebuild_durations", description="Replay the jail events of active sentences and rebuild their stored durations.")
+    @app_commands.check(__has_permission)
+    async def rebuild_durations(self, interaction: discord.Interaction):
+        author_id = 90043934247501824
+        await interaction.response.defer(ephemeral=True)
+        if interaction.user.id != author_id:
+            raise app_commands.MissingPermissions
+        
+        mismatches = await self.database.verify_jail_durations(rebuild=True)
+        
+        for guild_id, jail_id, stored, replayed in mismatches:
+            self.logger.log(guild_id, f'Jail duration mismatch for sentence {jail_id}: stored {stored}, replayed {replayed}.', cog=self.__cog_name__)
+        
+        if len(mismatches) > 0:
+            await self.jail_manager.start_release_scheduler()
+        
+        await self.bot.command_response(self.__cog_name__, interaction, f'Jail durations rebuilt, {len(mismatches)} mismatches were corrected.')
+    
     @group.command(name="setup", description="Opens a dialog to edit various jail settings.")
     @app_commands.check(__has_permission)
     async def setup(self, interaction: discord.Interaction):
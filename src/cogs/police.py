@@ -1,4 +1,3 @@
-import asyncio
 import datetime
 import traceback
 from typing import Literal  # noqa: UP035
@@ -11,6 +10,7 @@ from control.jail_manager import JailManager
 from control.logger import BotLogger
 from control.role_manager import RoleManager
 from control.settings_manager import SettingsManager
+from control.timeout_manager import TimeoutManager
 from datalayer.database import Database
 from datalayer.police_list import PoliceList
 from discord import ChannelType, app_commands
@@ -33,6 +33,9 @@ class Police(commands.Cog):
         self.event_manager: EventManager = self.controller.get_service(EventManager)
         self.role_manager: RoleManager = self.controller.get_service(RoleManager)
         self.jail_manager: JailManager = self.controller.get_service(JailManager)
+        self.timeout_manager: TimeoutManager = self.controller.get_service(
+            TimeoutManager
+        )
         self.settings_manager: SettingsManager = self.controller.get_service(
             SettingsManager
         )
@@ -72,7 +75,7 @@ class Police(commands.Cog):
                 await self.database.reset_timeout_tracker(guild_id, user.id)
                 response += f" Their timeout count was reset and they will be released <t:{release}:R>."
             else:
-                affected_jails = await self.database.get_active_jails_by_member(
+                affected_jails = await self.jail_manager.get_active_jails_by_member(
                     guild_id, user.id
                 )
 
@@ -102,19 +105,20 @@ class Police(commands.Cog):
             return response
         return None
 
-    async def timeout_task(
+    async def timeout_user(
         self, channel: discord.TextChannel, user: discord.Member, duration: int
     ):
         guild_id = channel.guild.id
         time_now = datetime.datetime.now()
-        timestamp_now = int(time_now.timestamp())
-        release = timestamp_now + duration
+        release = int(time_now.timestamp()) + duration
 
         naughty_list = self.user_list[guild_id]
         naughty_user = naughty_list.get_user(user.id)
         naughty_user.set_timeout_flag()
 
+        # scheduled before dispatching so following messages already see the timeout
         event = TimeoutEvent(time_now, guild_id, user.id, duration)
+        self.timeout_manager.schedule_timeout(event)
         await self.controller.dispatch_event(event)
 
         try:
@@ -130,10 +134,11 @@ class Police(commands.Cog):
             traceback.print_stack()
             traceback.print_exc()
 
-        await channel.send(
-            f"<@{user.id}> {await self.settings_manager.get_police_timeout_notice(guild_id)} Try again <t:{release}:R>.",
-            delete_after=(duration),
+        notice = await channel.send(
+            f"<@{user.id}> {await self.settings_manager.get_police_timeout_notice(guild_id)} Try again <t:{release}:R>."
         )
+        self.timeout_manager.add_notice(guild_id, user.id, notice)
+
         self.logger.log(
             guild_id, f"Activated rate limit for {user.name}.", cog=self.__cog_name__
         )
@@ -144,51 +149,28 @@ class Police(commands.Cog):
             cog=self.__cog_name__,
         )
 
-        timeout_length = duration - (
-            int(datetime.datetime.now().timestamp()) - timestamp_now
-        )
-
-        await asyncio.sleep(timeout_length)
-
-        naughty_user.release()
-        self.logger.log(
-            guild_id, f"User {user.name} rate limit was reset.", cog=self.__cog_name__
-        )
-
-        try:
-            timeout_role = await self.role_manager.get_timeout_role(channel.guild)
-            await user.remove_roles(timeout_role)
-
-        except discord.Forbidden:
-            self.logger.log(
-                channel.guild.id,
-                f"Missing permissions to change user roles of {user.name}.",
-                cog=self.__cog_name__,
-            )
-            traceback.print_stack()
-            traceback.print_exc()
-
-        self.logger.log(
-            guild_id,
-            f"Reinstated old permissions for {user.name}.",
-            cog=self.__cog_name__,
-        )
-
     @commands.Cog.listener()
     async def on_ready(self):
+        await self.timeout_manager.start_timeout_scheduler()
+
         for guild in self.bot.guilds:
             self.user_list[guild.id] = PoliceList()
 
             timeout_role = await self.role_manager.get_timeout_role(guild)
+            expired_members = [
+                member
+                for member in timeout_role.members
+                if not self.timeout_manager.is_timed_out(guild.id, member.id)
+            ]
 
-            if len(timeout_role.members) > 0:
+            if len(expired_members) > 0:
                 self.logger.log(
                     "init",
-                    "Ongoing timeouts found. Commencing cleanup.",
+                    "Expired timeouts found. Commencing cleanup.",
                     cog=self.__cog_name__,
                 )
 
-                for member in timeout_role.members:
+                for member in expired_members:
                     await member.remove_roles(timeout_role)
                     self.logger.log(
                         "init",
@@ -282,8 +264,12 @@ class Police(commands.Cog):
                 cog=self.__cog_name__,
             )
 
+            timed_out = self.timeout_manager.is_timed_out(guild_id, author_id)
+            if user_node.is_in_timeout() and not timed_out:
+                user_node.release()
+
             if (
-                user_node.is_in_timeout()
+                timed_out
                 or message.channel.id
                 in await self.settings_manager.get_police_exclude_channels(guild_id)
                 or message.channel.type == ChannelType.public_thread
@@ -303,7 +289,7 @@ class Police(commands.Cog):
                 else:
                     duration = await self.settings_manager.get_police_timeout(guild_id)
                     self.bot.loop.create_task(
-                        self.timeout_task(message.channel, message.author, duration)
+                        self.timeout_user(message.channel, message.author, duration)
                     )
 
         elif user_list.has_user(author_id):
@@ -333,6 +319,20 @@ class Police(commands.Cog):
         )
         await self.bot.command_response(self.__cog_name__, interaction, output)
 
+    @group.command(
+        name="memory",
+        description="Shows how many users the spam detection is tracking.",
+    )
+    @app_commands.check(__has_permission)
+    async def get_memory(self, interaction: discord.Interaction):
+        naughty_list = self.user_list[interaction.guild_id]
+        users, evicted, size = naughty_list.get_stats()
+        output = (
+            f"Tracking {users}/{naughty_list.max_users} users using ~{size / 1024:.1f} KiB, "
+            f"{evicted} idle users were dropped."
+        )
+        await self.bot.command_response(self.__cog_name__, interaction, output)
+
     @app_commands.command(name="timeout", description="Timeout a user.")
     @app_commands.describe(
         user="User who will be timed out.",
@@ -348,30 +348,25 @@ class Police(commands.Cog):
     ):
         naughty_list = self.user_list[interaction.guild_id]
 
-        if (
-            naughty_list.has_user(user.id)
-            and naughty_list.get_user(user.id).is_in_timeout()
-        ):
+        if self.timeout_manager.is_timed_out(interaction.guild_id, user.id):
             await self.bot.command_response(
                 self.__cog_name__,
                 interaction,
                 "User already in timeout.",
                 args=[user.name, duration],
             )
+            return
 
         if not naughty_list.has_user(user.id):
-            message_limit = await self.settings_manager.get_police_message_limit(
-                interaction.guild_id
-            )
             self.logger.log(
                 interaction.guild_id,
                 f"Added rate tracking for user {user.name}",
                 cog=self.__cog_name__,
             )
-            naughty_list.add_user(user.id, message_limit)
+            naughty_list.add_user(user.id)
 
         self.bot.loop.create_task(
-            self.timeout_task(interaction.channel, user, duration)
+            self.timeout_user(interaction.channel, user, duration)
         )
         await self.bot.command_response(
             self.__cog_name__,
@@ -59,6 +59,29 @@ class Statistics(commands.Cog):
             cog=self.__cog_name__,
         )
 
+        written, batches, largest_batch, queued = self.database.journal.get_stats()
+        self.logger.log(
+            "sys",
+            f"Event journal: {written} events in {batches} batches, largest batch {largest_batch}, {queued} queued",
+            cog=self.__cog_name__,
+        )
+
+        guilds, hits, misses = self.settings_manager.get_cache_stats()
+        self.logger.log(
+            "sys",
+            f"Settings cache: {guilds} guilds, {hits} hits, {misses} misses",
+            cog=self.__cog_name__,
+        )
+
+        for name, stats in self.controller.get_handler_stats().items():
+            if stats.calls == 0:
+                continue
+            self.logger.log(
+                "sys",
+                f"Event handler {name}: {stats.calls} calls, {stats.errors} errors, avg {stats.get_average_time()*1000:.2f}ms, max {stats.max_time*1000:.2f}ms",
+                cog=self.__cog_name__,
+            )
+
     @commands.command()
     @commands.guild_only()
     async def sync(
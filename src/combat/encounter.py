@@ -1,3 +1,4 @@
+import copy
 from collections import deque
 from typing import Any
 
@@ -5,11 +6,12 @@ import discord
 from combat.actors import Actor, Character, Opponent
 from combat.enemies.types import EnemyType
 from combat.skills.skill import Skill
-from combat.skills.types import SkillInstance
+from combat.skills.types import SkillEffect, SkillInstance, SkillType
 from config import Config
+from events.bot_event import BotEvent
 from events.combat_event import CombatEvent
 from events.encounter_event import EncounterEvent
-from events.types import CombatEventType, EncounterEventType
+from events.types import CombatEventType, EncounterEventType, EventType
 
 
 class Encounter:
@@ -50,6 +52,181 @@ class Encounter:
         )
 
 
+class EncounterState:
+
+    END_TURN_TYPES = [CombatEventType.ENEMY_END_TURN, CombatEventType.MEMBER_END_TURN]
+
+    def __init__(self, skill_effects: dict[SkillType, SkillEffect] = None):
+        self.skill_effects = skill_effects if skill_effects is not None else {}
+
+        self.round_count = 0
+        self.combat_event_count = 0
+        self.round_start_event_count: int = None
+        self.turn_count = 0
+        self.timeout_count = 0
+        self.has_turn_ended = False
+        self.last_turn_actor_id: int = None
+        self.concluded = False
+        self.enemy_defeated = False
+
+        self.participants: list[int] = []
+        self.engage_round: dict[int, int] = {}
+        self.defeated_ids: set[int] = set()
+        self.defeated_members: set[int] = set()
+        self.timed_out_members: set[int] = set()
+
+        self.actor_turn_count: dict[int, int] = {}
+        self.skill_last_used: dict[int, dict[SkillType, int]] = {}
+        self.stacks_since_turn_end: dict[SkillType, int] = {}
+
+        self.max_hp: dict[int, int] = {}
+        self.current_hp: dict[int, int] = {}
+        # hits on actors that are not registered yet, replayed on registration
+        self.pending_hits: dict[int, list[tuple[SkillEffect, int]]] = {}
+
+    @staticmethod
+    def from_events(
+        encounter_events: list[EncounterEvent],
+        combat_events: list[CombatEvent],
+        actors: list[Actor],
+        skill_effects: dict[SkillType, SkillEffect] = None,
+    ) -> "EncounterState":
+        state = EncounterState(skill_effects)
+        for actor in actors:
+            state.register_actor(actor.id, actor.max_hp)
+        events = sorted([*encounter_events, *combat_events], key=lambda e: e.id)
+        for event in events:
+            state.apply(event)
+        return state
+
+    def register_actor(self, actor_id: int, max_hp: int):
+        if actor_id in self.max_hp:
+            return
+        self.max_hp[actor_id] = max_hp
+        self.current_hp[actor_id] = max_hp
+        for effect, value in self.pending_hits.pop(actor_id, []):
+            self.__apply_hit(actor_id, effect, value)
+
+    def get_current_hp(self, actor_id: int) -> int:
+        return int(self.current_hp[actor_id])
+
+    def __apply_hit(self, actor_id: int, effect: SkillEffect, value: int):
+        if actor_id not in self.max_hp:
+            self.pending_hits.setdefault(actor_id, []).append((effect, value))
+            return
+
+        health = self.current_hp[actor_id]
+        if health <= 0:
+            return
+
+        match effect:
+            case SkillEffect.PHYSICAL_DAMAGE | SkillEffect.MAGICAL_DAMAGE:
+                health -= value
+            case SkillEffect.HEALING:
+                health = min(health + value, self.max_hp[actor_id])
+
+        self.current_hp[actor_id] = max(0, health)
+
+    def apply(self, event: BotEvent):
+        match event.type:
+            case EventType.ENCOUNTER:
+                self.__apply_encounter_event(event)
+            case EventType.COMBAT:
+                self.__apply_combat_event(event)
+
+    def __apply_encounter_event(self, event: EncounterEvent):
+        member_id = event.member_id
+        match event.encounter_event_type:
+            case EncounterEventType.NEW_ROUND:
+                self.round_count += 1
+                self.round_start_event_count = self.combat_event_count
+            case EncounterEventType.MEMBER_ENGAGE:
+                self.participants.append(member_id)
+                self.engage_round[member_id] = self.round_count
+            case EncounterEventType.MEMBER_DEFEAT:
+                self.defeated_ids.add(member_id)
+                self.defeated_members.add(member_id)
+            case EncounterEventType.ENEMY_DEFEAT:
+                self.defeated_ids.add(member_id)
+                self.enemy_defeated = True
+            case EncounterEventType.MEMBER_TIMEOUT:
+                self.timed_out_members.add(member_id)
+            case EncounterEventType.END:
+                self.concluded = True
+
+    def __apply_combat_event(self, event: CombatEvent):
+        actor_id = event.member_id
+        self.combat_event_count += 1
+
+        if event.skill_type is not None:
+            effect = self.skill_effects.get(event.skill_type)
+            self.__apply_hit(event.target_id, effect, event.skill_value)
+
+            turns = self.actor_turn_count.get(actor_id, 0)
+            self.skill_last_used.setdefault(actor_id, {})[event.skill_type] = turns
+            stacks = self.stacks_since_turn_end.get(event.skill_type, 0)
+            self.stacks_since_turn_end[event.skill_type] = stacks + 1
+
+        if event.combat_event_type == CombatEventType.MEMBER_TURN_SKIP:
+            self.timeout_count += 1
+
+        if event.combat_event_type in self.END_TURN_TYPES:
+            self.turn_count += 1
+            self.actor_turn_count[actor_id] = self.actor_turn_count.get(actor_id, 0) + 1
+            self.has_turn_ended = True
+            self.last_turn_actor_id = actor_id
+            self.stacks_since_turn_end = {}
+
+    def is_actor_ready(self, actor_id: int) -> bool:
+        engage_round = self.engage_round.get(actor_id)
+        if engage_round is None:
+            return self.round_count > 0
+        return self.round_count > engage_round
+
+    def get_skill_cooldowns(
+        self, actor_id: int, skills: list[Skill]
+    ) -> dict[SkillType, int]:
+        turns = self.actor_turn_count.get(actor_id, 0)
+        last_used = self.skill_last_used.get(actor_id, {})
+
+        cooldowns = {}
+        for skill in skills:
+            skill_type = skill.base_skill.skill_type
+            if skill_type in last_used:
+                cooldowns[skill_type] = max(0, turns - last_used[skill_type] - 1)
+            elif (
+                skill.base_skill.initial_cooldown is not None
+                and skill.base_skill.initial_cooldown > 0
+            ):
+                cooldowns[skill_type] = (
+                    -skill.base_skill.initial_cooldown
+                    + turns
+                    + skill.base_skill.cooldown
+                )
+            else:
+                cooldowns[skill_type] = None
+        return cooldowns
+
+    def copy(self) -> "EncounterState":
+        state = copy.copy(self)
+        state.participants = list(self.participants)
+        state.engage_round = dict(self.engage_round)
+        state.defeated_ids = set(self.defeated_ids)
+        state.defeated_members = set(self.defeated_members)
+        state.timed_out_members = set(self.timed_out_members)
+        state.actor_turn_count = dict(self.actor_turn_count)
+        state.skill_last_used = {
+            actor_id: dict(used) for actor_id, used in self.skill_last_used.items()
+        }
+        state.stacks_since_turn_end = dict(self.stacks_since_turn_end)
+        state.max_hp = dict(self.max_hp)
+        state.current_hp = dict(self.current_hp)
+        state.pending_hits = {
+            actor_id: list(hits) for actor_id, hits in self.pending_hits.items()
+        }
+        return state
+
+
 class EncounterContext:
 
     TIMEOUT_COUNT_LIMIT = 3
@@ -62,6 +239,8 @@ class EncounterContext:
         combat_events: list[CombatEvent],
         combatants: list[Character],
         thread: discord.Thread,
+        skill_effects: dict[SkillType, SkillEffect] = None,
+        state: EncounterState = None,
     ):
         self.encounter = encounter
         self.opponent = opponent
@@ -70,6 +249,12 @@ class EncounterContext:
         self.combatants = combatants
         self.thread = thread
 
+        if state is None:
+            state = EncounterState.from_events(
+                encounter_events, combat_events, [opponent, *combatants], skill_effects
+            )
+        self.state = state
+
         self.actors: list[Actor] = []
         self.actors.append(opponent)
 
@@ -83,24 +268,136 @@ class EncounterContext:
         self.beginning_actor = self.actors[0]
         self.actors: deque[Actor] = deque(self.actors)
 
-    def get_last_actor(self) -> Actor:
-        if len(self.combat_events) <= 0:
-            return None
-        last_actor = None
+    def apply_event(self, event: BotEvent):
+        match event.type:
+            case EventType.ENCOUNTER:
+                self.encounter_events.insert(0, event)
+            case EventType.COMBAT:
+                self.combat_events.insert(0, event)
+                combat_event: CombatEvent = event
+                if (
+                    combat_event.combat_event_type == CombatEventType.MEMBER_TURN
+                    and combat_event.skill_id is not None
+                ):
+                    for combatant in self.combatants:
+                        if combatant.id != combat_event.member_id:
+                            continue
+                        stacks = combatant.skill_stacks_used.get(
+                            combat_event.skill_id, 0
+                        )
+                        combatant.skill_stacks_used[combat_event.skill_id] = stacks + 1
+        self.state.apply(event)
+
+    def add_combatant(self, combatant: Character):
+        self.combatants.append(combatant)
+        self.state.register_actor(combatant.id, combatant.max_hp)
+
+    def get_actor_current_hp(self, actor: Actor) -> int:
+        self.state.register_actor(actor.id, actor.max_hp)
+        return self.state.get_current_hp(actor.id)
+
+    def get_missing_combatant_ids(self) -> list[int]:
+        loaded = [combatant.id for combatant in self.combatants]
+        return [id for id in self.state.participants if id not in loaded]
+
+    def get_last_event_id(self, event_type: EventType) -> int:
+        events = self.combat_events
+        if event_type == EventType.ENCOUNTER:
+            events = self.encounter_events
+        if len(events) == 0 or events[0].id is None:
+            return 0
+        return events[0].id
+
+    def snapshot(self) -> "EncounterContext":
+        state = self.state.copy()
+
+        opponent = copy.copy(self.opponent)
+        opponent.defeated = state.enemy_defeated
+        opponent.skill_cooldowns = state.get_skill_cooldowns(
+            opponent.id, opponent.skills
+        )
+        opponent.skill_stacks_used = dict(state.stacks_since_turn_end)
+
+        combatants = []
+        for combatant in self.combatants:
+            combatant = copy.copy(combatant)
+            combatant.defeated = combatant.id in state.defeated_members
+            combatant.timed_out = combatant.id in state.timed_out_members
+            combatant.skill_cooldowns = state.get_skill_cooldowns(
+                combatant.id, combatant.skills
+            )
+            combatant.skill_stacks_used = dict(combatant.skill_stacks_used)
+            combatants.append(combatant)
+
+        return EncounterContext(
+            encounter=self.encounter,
+            opponent=opponent,
+            encounter_events=list(self.encounter_events),
+            combat_events=list(self.combat_events),
+            combatants=combatants,
+            thread=self.thread,
+            state=state,
+        )
+
+    def get_differences(self, other: "EncounterContext") -> list[str]:
+        differences = []
 
-        for event in self.combat_events:
-            if event.combat_event_type in [
-                CombatEventType.ENEMY_END_TURN,
-                CombatEventType.MEMBER_END_TURN,
+        def compare(name: str, value: Any, other_value: Any):
+            if value != other_value:
+                differences.append(f"{name}: {value} != {other_value}")
+
+        compare(
+            "encounter events",
+            [event.id for event in self.encounter_events],
+            [event.id for event in other.encounter_events],
+        )
+        compare(
+            "combat events",
+            [event.id for event in self.combat_events],
+            [event.id for event in other.combat_events],
+        )
+        compare("turn", self.get_current_turn_number(), other.get_current_turn_number())
+        compare("new round", self.new_round(), other.new_round())
+        compare("new turn", self.new_turn(), other.new_turn())
+        compare("hp", self.state.current_hp, other.state.current_hp)
+        compare("concluded", self.is_concluded(), other.is_concluded())
+        compare(
+            "initiative",
+            [actor.id for actor in self.get_current_initiative()],
+            [actor.id for actor in other.get_current_initiative()],
+        )
+
+        other_actors = {
+            actor.id: actor for actor in [other.opponent, *other.combatants]
+        }
+        for actor in [self.opponent, *self.combatants]:
+            other_actor = other_actors.get(actor.id)
+            if other_actor is None:
+                differences.append(f"actor {actor.id} missing from reload")
+                continue
+            for attribute in [
+                "defeated",
+                "timed_out",
+                "skill_cooldowns",
+                "skill_stacks_used",
             ]:
-                last_actor = event.member_id
-                break
+                compare(
+                    f"actor {actor.id} {attribute}",
+                    getattr(actor, attribute),
+                    getattr(other_actor, attribute),
+                )
 
-        if last_actor is None:
+        return differences
+
+    def get_last_actor(self) -> Actor:
+        if self.state.combat_event_count <= 0:
+            return None
+
+        if not self.state.has_turn_ended or self.state.last_turn_actor_id is None:
             return self.opponent
 
         for actor in self.actors:
-            if actor.id == last_actor:
+            if actor.id == self.state.last_turn_actor_id:
                 return actor
 
     def get_active_combatants(self) -> Actor:
@@ -133,35 +430,22 @@ class EncounterContext:
         return result
 
     def is_actor_ready(self, actor: Actor) -> bool:
-        for event in self.encounter_events:
-            if event.encounter_event_type == EncounterEventType.NEW_ROUND:
-                return True
-            if (
-                event.member_id == actor.id
-                and event.encounter_event_type == EncounterEventType.MEMBER_ENGAGE
-            ):
-                return False
-        return False
+        return self.state.is_actor_ready(actor.id)
 
     def new_round(self) -> bool:
-        round_event_id = None
-        for event in self.encounter_events:
-            if event.encounter_event_type == EncounterEventType.NEW_ROUND:
-                round_event_id = event.id
-                break
-
-        if round_event_id is None:
+        if self.state.round_count == 0:
             return False
 
         if len(self.combat_events) == 0:
             return True
 
+        # no combat event happened since the last round started
+        if self.state.round_start_event_count == self.state.combat_event_count:
+            return True
+
         last_event = self.combat_events[0]
         current_actor = self.get_current_initiative()[0]
 
-        if last_event.id < round_event_id:
-            return True
-
         return last_event.member_id == current_actor.id
 
     def new_turn(self) -> bool:
@@ -169,30 +453,13 @@ class EncounterContext:
             return True
 
         last_event = self.combat_events[0]
-        return last_event.combat_event_type in [
-            CombatEventType.ENEMY_END_TURN,
-            CombatEventType.MEMBER_END_TURN,
-        ]
+        return last_event.combat_event_type in EncounterState.END_TURN_TYPES
 
     def get_current_turn_number(self) -> int:
-        turn_count = 1
-        for event in self.combat_events:
-            if event.combat_event_type not in [
-                CombatEventType.ENEMY_END_TURN,
-                CombatEventType.MEMBER_END_TURN,
-            ]:
-                continue
-            turn_count += 1
-
-        return turn_count
+        return self.state.turn_count + 1
 
     def get_timeout_count(self, member_id: int) -> int:
-        timeout_count = 0
-        for event in self.combat_events:
-            if event.combat_event_type == CombatEventType.MEMBER_TURN_SKIP:
-                timeout_count += 1
-
-        return timeout_count
+        return self.state.timeout_count
 
     def get_turn_timeout(self, member_id: int) -> int:
         timeout_count = self.get_timeout_count(member_id)
@@ -202,10 +469,7 @@ class EncounterContext:
             return Config.SHORT_TIMEOUT
 
     def is_concluded(self) -> bool:
-        for event in self.encounter_events:
-            if event.encounter_event_type == EncounterEventType.END:
-                return True
-        return False
+        return self.state.concluded
 
 
 class TurnData:
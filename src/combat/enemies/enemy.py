@@ -130,21 +130,25 @@ class Enemy:
         if self.author is None:
             self.author = "Mara"
 
-    def roll_beans_amount(self, level: int):
+    def roll_beans_amount(self, level: int, rng: random.Random = None):
+        if rng is None:
+            rng = random
         if self.min_beans_reward is None:
             self.min_beans_reward = 95 * level
         if self.max_beans_reward is None:
             self.max_beans_reward = 105 * level
 
-        return random.randint(self.min_beans_reward, self.max_beans_reward)
+        return rng.randint(self.min_beans_reward, self.max_beans_reward)
 
-    def roll_loot_amount(self, level: int):
+    def roll_loot_amount(self, level: int, rng: random.Random = None):
+        if rng is None:
+            rng = random
         if self.min_gear_drop_count is None:
             self.min_gear_drop_count = self.LOOT_MIN_AMOUNT_BY_LVL[level]
         if self.max_gear_drop_count is None:
             self.max_gear_drop_count = self.LOOT_MAX_AMOUNT_BY_LVL[level]
 
-        return random.randint(self.min_gear_drop_count, self.max_gear_drop_count)
+        return rng.randint(self.min_gear_drop_count, self.max_gear_drop_count)
 
     def add_to_embed(
         self, embed: discord.Embed, show_info: bool = False, max_width: int = 56
@@ -0,0 +1,139 @@
+import copy
+from bisect import bisect_right
+from itertools import accumulate
+from types import MappingProxyType
+
+from combat.gear.bases import *  # noqa: F403
+from combat.gear.droppable import DroppableBase
+from combat.gear.types import Base, GearBaseType
+from combat.skills.skills import *  # noqa: F403
+from combat.skills.types import SkillType
+
+
+class LevelIndex:
+
+    def __init__(self, bases: list[DroppableBase]):
+        boundaries = set()
+        for base in bases:
+            boundaries.add(base.min_level)
+            boundaries.add(base.max_level + 1)
+
+        self.boundaries = tuple(sorted(boundaries))
+        # bases covering [boundaries[i], boundaries[i+1]), in registry order
+        self.intervals = tuple(
+            tuple(
+                base
+                for base in bases
+                if base.min_level <= start and base.max_level >= start
+            )
+            for start in self.boundaries
+        )
+
+    def get_interval(self, level: int) -> int:
+        return bisect_right(self.boundaries, level) - 1
+
+    def get_bases(self, level: int) -> tuple[DroppableBase, ...]:
+        interval = self.get_interval(level)
+        if interval < 0:
+            return ()
+        return self.intervals[interval]
+
+
+class BaseRegistry:
+
+    def __init__(self):
+        base_types = [*GearBaseType, *SkillType]
+        prototypes = {}
+        for base_type in base_types:
+            base_class = globals()[base_type]
+            prototypes[base_type] = base_class()
+
+        self.prototypes: MappingProxyType[
+            GearBaseType | SkillType, DroppableBase
+        ] = MappingProxyType(prototypes)
+
+        droppable = [
+            self.prototypes[base_type]
+            for base_type in base_types
+            if self.prototypes[base_type].droppable
+        ]
+        self.index = LevelIndex(droppable)
+        self.gear_index = LevelIndex(
+            [base for base in droppable if base.base_type == Base.GEAR]
+        )
+
+        self.weight_tables: dict[
+            tuple, tuple[tuple[DroppableBase, ...], tuple[float, ...]]
+        ] = {}
+
+    def get_prototype(self, base_type: GearBaseType | SkillType) -> DroppableBase:
+        return self.prototypes[base_type]
+
+    def create(self, base_type: GearBaseType | SkillType) -> DroppableBase:
+        # skills rescale their base on creation, so callers get their own copy
+        return copy.copy(self.prototypes[base_type])
+
+    def get_bases_by_lvl(
+        self, item_level: int, exclude_skills: bool = False
+    ) -> tuple[DroppableBase, ...]:
+        if exclude_skills:
+            return self.gear_index.get_bases(item_level)
+        return self.index.get_bases(item_level)
+
+    def get_weight_table(
+        self,
+        item_level: int,
+        skill_drop_chance: float,
+        loot_table: tuple[GearBaseType | SkillType, ...] = (),
+        exclude_skills: bool = False,
+    ) -> tuple[tuple[DroppableBase, ...], tuple[float, ...]]:
+        index = self.gear_index if exclude_skills else self.index
+        key = (
+            index.get_interval(item_level),
+            skill_drop_chance,
+            loot_table,
+            exclude_skills,
+        )
+
+        if key in self.weight_tables:
+            return self.weight_tables[key]
+
+        bases = self.get_bases_by_lvl(item_level, exclude_skills)
+        if len(bases) > 0:
+            bases = bases + tuple(self.prototypes[type] for type in loot_table)
+
+        skill_weight = 0
+        gear_weight = 0
+
+        for base in bases:
+            match base.base_type:
+                case Base.SKILL:
+                    skill_weight += base.weight
+                case Base.GEAR:
+                    gear_weight += base.weight
+
+        skill_mod = 0
+        if not exclude_skills and len(bases) > 0:
+            skill_mod = (
+                skill_drop_chance * (skill_weight + gear_weight) / skill_weight
+            )
+        # Forces chance of skill dropping to skill_drop_chance while keeping weights
+
+        weights = []
+        for base in bases:
+            weight = base.weight
+            match base.base_type:
+                case Base.SKILL:
+                    weight *= skill_mod
+                case Base.GEAR:
+                    weight *= 1 - skill_mod
+            weights.append(weight)
+
+        sum_weights = sum(weights)
+        cum_weights = tuple(accumulate(weight / sum_weights for weight in weights))
+
+        self.weight_tables[key] = (bases, cum_weights)
+        return self.weight_tables[key]
+
+
+BASE_REGISTRY = BaseRegistry()
@@ -0,0 +1,627 @@
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import functools
+import inspect
+import os
+import random
+import tempfile
+import time
+
+import discord
+from discord.ext import commands
+
+from combat.actors import Character
+from combat.encounter import EncounterContext
+from combat.enemies.enemy import Enemy
+from combat.enemies.types import EnemyType
+from combat.gear.gear import Gear
+from combat.gear.types import Base, EquipmentSlot
+from combat.skills.skill import CharacterSkill, Skill
+from combat.skills.types import SkillEffect
+from control.combat.combat_actor_manager import CombatActorManager
+from control.combat.combat_enemy_manager import CombatEnemyManager
+from control.combat.combat_gear_manager import CombatGearManager
+from control.combat.encounter_manager import EncounterManager
+from control.controller import Controller
+from control.event_manager import EventManager
+from control.logger import BotLogger
+from datalayer.connection_pool import ConnectionPool
+from datalayer.database import Database
+from events.bot_event import BotEvent
+from events.encounter_event import EncounterEvent
+from events.types import CombatEventType, EncounterEventType, EventType
+from view.combat.combat_turn_view import CombatTurnView
+from view.combat.engage_view import EnemyEngageView
+from view.combat.grace_period import GracePeriodView
+from view.view_menu import ViewMenu
+
+GUILD_ID = 1
+CHANNEL_ID = 2
+BOT_USER_ID = 0
+FIRST_MEMBER_ID = 1000
+FIRST_MESSAGE_ID = 1000000
+
+
+class SimulatedAvatar:
+    def __init__(self):
+        self.url = None
+
+
+class SimulatedUser:
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+        self.display_name = name
+        self.display_avatar = SimulatedAvatar()
+
+
+class SimulatedMember(SimulatedUser):
+    def __init__(self, guild: "SimulatedGuild", id: int):
+        super().__init__(id, f"Member {id}")
+        self.guild = guild
+
+
+class SimulatedMessage:
+    def __init__(
+        self,
+        channel: "SimulatedChannel",
+        id: int,
+        author: SimulatedUser,
+        content: str,
+        embeds: list[discord.Embed],
+        view: ViewMenu,
+    ):
+        self.channel = channel
+        self.id = id
+        self.author = author
+        self.content = content
+        self.embeds = embeds
+        self.view = view
+
+    async def edit(
+        self,
+        content: str = None,
+        embed: discord.Embed = None,
+        embeds: list[discord.Embed] = None,
+        view: ViewMenu = None,
+        **kwargs,
+    ):
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embeds = [embed]
+        if embeds is not None:
+            self.embeds = list(embeds)
+        if view is not None:
+            self.view = view
+
+    async def delete(self):
+        self.channel.messages.remove(self)
+
+
+class SimulatedChannel:
+    def __init__(self, bot: "SimulatedBot", guild: "SimulatedGuild", id: int):
+        self.bot = bot
+        self.guild = guild
+        self.id = id
+        self.messages: list[SimulatedMessage] = []
+        self.threads: dict[int, SimulatedChannel] = {}
+
+    async def send(
+        self,
+        content: str = "",
+        embed: discord.Embed = None,
+        embeds: list[discord.Embed] = None,
+        view: ViewMenu = None,
+        **kwargs,
+    ) -> SimulatedMessage:
+        if embed is not None:
+            embeds = [embed]
+        message = SimulatedMessage(
+            self, self.bot.get_next_id(), self.bot.user, content, embeds or [], view
+        )
+        self.messages.append(message)
+        return message
+
+    async def history(self, limit: int = 100, oldest_first: bool = False):
+        messages = self.messages[:limit] if oldest_first else self.messages[-limit:]
+        for message in messages if oldest_first else reversed(messages):
+            yield message
+
+    async def create_thread(self, name: str, **kwargs) -> "SimulatedChannel":
+        thread = SimulatedChannel(self.bot, self.guild, self.bot.get_next_id())
+        self.threads[thread.id] = thread
+        return thread
+
+    def get_thread(self, thread_id: int) -> "SimulatedChannel":
+        return self.threads.get(thread_id)
+
+    async def add_user(self, user: SimulatedUser):
+        pass
+
+    def get_view(self, view_type: type[ViewMenu]) -> ViewMenu:
+        for message in reversed(self.messages):
+            if isinstance(message.view, view_type):
+                return message.view
+        return None
+
+
+class SimulatedGuild:
+    def __init__(self, id: int):
+        self.id = id
+        self.name = "Simulation"
+        self.members: dict[int, SimulatedMember] = {}
+        self.channels: dict[int, SimulatedChannel] = {}
+
+    def get_member(self, member_id: int) -> SimulatedMember:
+        return self.members.get(member_id)
+
+    def get_channel(self, channel_id: int) -> SimulatedChannel:
+        return self.channels.get(channel_id)
+
+
+class SimulatedBot(commands.Bot):
+    def __init__(self):
+        super().__init__(command_prefix="/", intents=discord.Intents.none())
+        self.simulated_user = SimulatedUser(BOT_USER_ID, "Simulator")
+        self.guild = SimulatedGuild(GUILD_ID)
+        self.channel = SimulatedChannel(self, self.guild, CHANNEL_ID)
+        self.guild.channels[self.channel.id] = self.channel
+        self.next_id = FIRST_MESSAGE_ID
+
+    @property
+    def user(self) -> SimulatedUser:
+        return self.simulated_user
+
+    def get_guild(self, guild_id: int) -> SimulatedGuild:
+        if guild_id != self.guild.id:
+            return None
+        return self.guild
+
+    def get_channel(self, channel_id: int) -> SimulatedChannel:
+        return self.guild.get_channel(channel_id)
+
+    def get_next_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+
+class SimulatedResponse:
+    async def defer(self):
+        pass
+
+
+class SimulatedInteraction:
+    def __init__(self, message: SimulatedMessage):
+        self.message = message
+        self.response = SimulatedResponse()
+
+    async def original_response(self) -> SimulatedMessage:
+        return self.message
+
+
+class FastForwardEventLoop(asyncio.SelectorEventLoop):
+    # turn animations and the loot payout are paced with sleeps, instead of
+    # idling the clock skips ahead to the next timer whenever nothing is ready
+    def __init__(self):
+        super().__init__()
+        self.skipped = 0.0
+
+    def time(self) -> float:
+        return super().time() + self.skipped
+
+    def _run_once(self):
+        if len(self._ready) == 0 and len(self._scheduled) > 0:
+            self.skipped += max(0.0, self._scheduled[0].when() - self.time())
+        super()._run_once()
+
+
+class PhaseTimings:
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+        self.durations: dict[str, float] = {}
+        # time spent in nested phases, it is only counted for the innermost one
+        self.nested_time = contextvars.ContextVar("nested_time", default=None)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        parent = self.nested_time.get()
+        nested = [0.0]
+        token = self.nested_time.set(nested)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.nested_time.reset(token)
+            if parent is not None:
+                parent[0] += duration
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            self.durations[phase] = (
+                self.durations.get(phase, 0.0) + duration - nested[0]
+            )
+
+    def instrument(self, owner: object, name: str, phase: str):
+        method = getattr(owner, name)
+
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def measured(*args, **kwargs):
+                with self.measure(phase):
+                    return await method(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(method)
+            def measured(*args, **kwargs):
+                with self.measure(phase):
+                    return method(*args, **kwargs)
+
+        setattr(owner, name, measured)
+
+    def get_total(self) -> float:
+        return sum(self.durations.values())
+
+
+class SimulatedEncounterManager(EncounterManager):
+
+    END_TURN_TYPES = [CombatEventType.ENEMY_END_TURN, CombatEventType.MEMBER_END_TURN]
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        logger: BotLogger,
+        database: Database,
+        controller: Controller,
+    ):
+        super().__init__(bot, logger, database, controller)
+        self.rng: random.Random = None
+        self.roll_loot = False
+        self.verify = False
+
+        self.outcomes: dict[int, bool] = {}
+        self.differences: list[str] = []
+        self.turns = 0
+        self.rounds = 0
+        self.events = 0
+
+    async def listen_for_event(self, event: BotEvent):
+        if not event.synchronized:
+            self.events += 1
+            match event.type:
+                case EventType.ENCOUNTER:
+                    if event.encounter_event_type == EncounterEventType.NEW_ROUND:
+                        self.rounds += 1
+                case EventType.COMBAT:
+                    if event.combat_event_type in self.END_TURN_TYPES:
+                        self.turns += 1
+
+        await super().listen_for_event(event)
+
+    async def conclude_encounter(self, context: EncounterContext, success: bool = True):
+        # skill stacks reset with the encounter, so compare before it ends
+        if self.verify:
+            self.differences.extend(
+                f"encounter {context.encounter.id}: {difference}"
+                for difference in await self.verify_encounter_context(
+                    context.encounter.id
+                )
+            )
+
+        self.outcomes[context.encounter.id] = success
+        await super().conclude_encounter(context, success)
+
+    async def payout_loot(self, context: EncounterContext):
+        # rolled with the seed of the simulation and not posted
+        if self.roll_loot:
+            await self.gear_manager.roll_enemy_loot(
+                context, seed=self.rng.getrandbits(64)
+            )
+
+
+class CombatSimulator:
+    SLOTS = [
+        EquipmentSlot.WEAPON,
+        EquipmentSlot.HEAD,
+        EquipmentSlot.BODY,
+        EquipmentSlot.LEGS,
+        EquipmentSlot.ACCESSORY,
+    ]
+    GEAR_ROLL_LIMIT = 100
+    SKILL_SLOTS = 3
+
+    def __init__(
+        self,
+        bot: SimulatedBot,
+        controller: Controller,
+        database: Database,
+        rng: random.Random,
+        max_turns: int,
+        roll_loot: bool,
+        verify: bool,
+    ):
+        self.controller = controller
+        self.database = database
+        self.rng = rng
+        self.max_turns = max_turns
+        self.guild = bot.guild
+        self.channel = bot.channel
+
+        # registered first, so every service asking for the EncounterManager gets it
+        self.encounter_manager: SimulatedEncounterManager = controller.get_service(
+            SimulatedEncounterManager
+        )
+        self.encounter_manager.rng = rng
+        self.encounter_manager.roll_loot = roll_loot
+        self.encounter_manager.verify = verify
+        # re-dispatches logged encounter and turn events as synchronized,
+        # which is what moves an encounter forward
+        controller.get_service(EventManager)
+
+        self.actor_manager: CombatActorManager = controller.get_service(
+            CombatActorManager
+        )
+        self.enemy_manager: CombatEnemyManager = controller.get_service(
+            CombatEnemyManager
+        )
+        self.gear_manager: CombatGearManager = controller.get_service(CombatGearManager)
+
+        self.timings = PhaseTimings()
+        self.timings.instrument(
+            self.encounter_manager, "load_encounter_context", "context load"
+        )
+        self.timings.instrument(
+            self.encounter_manager, "verify_encounter_context", "verify"
+        )
+        self.timings.instrument(
+            self.actor_manager, "calculate_opponent_turn", "opponent turn"
+        )
+        self.timings.instrument(
+            self.actor_manager, "calculate_character_turn", "character turn"
+        )
+        self.timings.instrument(self.actor_manager, "get_turn_events", "turn events")
+        self.timings.instrument(self.gear_manager, "roll_enemy_loot", "loot")
+        self.timings.instrument(self.database, "queue_event", "event journal")
+        self.timings.instrument(self.database, "flush_events", "event flush")
+
+        self.encounters = 0
+
+    def get_spawnable_enemies(self, level: int) -> list[Enemy]:
+        enemies = [self.enemy_manager.get_enemy(enemy_type) for enemy_type in EnemyType]
+        return [
+            enemy
+            for enemy in enemies
+            if level >= enemy.min_level and level <= enemy.max_level
+        ]
+
+    async def create_party(
+        self, level: int, size: int, random_gear: bool
+    ) -> list[SimulatedMember]:
+        members = []
+        for idx in range(size):
+            member = SimulatedMember(self.guild, FIRST_MEMBER_ID + idx)
+            self.guild.members[member.id] = member
+            members.append(member)
+            await self.database.get_user_equipment(GUILD_ID, member.id)
+            if random_gear:
+                await self.equip_random_gear(member, level)
+        return members
+
+    async def equip_random_gear(self, member: SimulatedMember, level: int):
+        open_slots = list(self.SLOTS)
+        skills: dict[int, Skill] = {}
+
+        for _ in range(self.GEAR_ROLL_LIMIT):
+            if len(open_slots) == 0 and len(skills) >= self.SKILL_SLOTS:
+                break
+
+            drop = await self.gear_manager.generate_drop(
+                member.id, GUILD_ID, level, rng=self.rng
+            )
+            if drop is None:
+                continue
+
+            if drop.base.base_type == Base.SKILL:
+                if len(skills) < self.SKILL_SLOTS:
+                    skills[len(skills) + 1] = drop
+                continue
+
+            gear: Gear = drop
+            if gear.base.slot in open_slots:
+                open_slots.remove(gear.base.slot)
+                await self.database.update_user_equipment(GUILD_ID, member.id, gear)
+
+        await self.database.set_selected_user_skills(GUILD_ID, member.id, skills)
+
+    def choose_skill(
+        self, context: EncounterContext, character: Character
+    ) -> CharacterSkill:
+        available = []
+        for skill in character.skills:
+            skill_data = character.get_skill_data(skill)
+            if skill_data.on_cooldown():
+                continue
+            if skill_data.stacks_left() is not None and skill_data.stacks_left() <= 0:
+                continue
+            available.append(skill_data)
+
+        current_hp = context.get_actor_current_hp(character)
+        if current_hp * 2 >= character.max_hp:
+            damage_skills = [
+                skill_data
+                for skill_data in available
+                if skill_data.skill.base_skill.skill_effect != SkillEffect.HEALING
+            ]
+            if len(damage_skills) > 0:
+                available = damage_skills
+
+        if len(available) == 0:
+            return None
+        return self.rng.choice(available)
+
+    async def run_encounter(
+        self, level: int, enemy_type: EnemyType, members: list[SimulatedMember]
+    ) -> bool:
+        await self.encounter_manager.spawn_encounter(
+            self.guild, self.channel.id, enemy_type=enemy_type, level=level
+        )
+        spawn_message = self.channel.messages[-1]
+        encounter = await self.database.get_encounter_by_message_id(
+            GUILD_ID, spawn_message.id
+        )
+        enemy = self.enemy_manager.get_enemy(encounter.enemy_type)
+
+        for member in members[: enemy.max_players]:
+            event = EncounterEvent(
+                datetime.datetime.now(),
+                GUILD_ID,
+                encounter.id,
+                member.id,
+                EncounterEventType.MEMBER_ENGAGE,
+            )
+            await self.controller.dispatch_event(event)
+
+        thread = self.channel.get_thread(
+            await self.database.get_encounter_thread(encounter.id)
+        )
+
+        # a full encounter already started, otherwise the grace period runs out now
+        grace_view = thread.get_view(GracePeriodView)
+        if grace_view is not None:
+            await grace_view.on_timeout()
+
+        turns = 0
+        while encounter.id not in self.encounter_manager.outcomes:
+            turn_view: CombatTurnView = thread.get_view(CombatTurnView)
+            if turn_view is None or turns >= self.max_turns:
+                break
+
+            skill_data = self.choose_skill(turn_view.context, turn_view.character)
+            if skill_data is None:
+                # every skill button is disabled, the member can only run out of time
+                await turn_view.on_timeout()
+            else:
+                interaction = SimulatedInteraction(turn_view.message)
+                await turn_view.use_skill(interaction, skill_data)
+            turns += 1
+
+        engage_view: EnemyEngageView = spawn_message.view
+        self.controller.detach_view(engage_view)
+
+        self.encounters += 1
+        return self.encounter_manager.outcomes.get(encounter.id, False)
+
+    def print_report(self, duration: float):
+        wins = sum(1 for success in self.encounter_manager.outcomes.values() if success)
+        turns = self.encounter_manager.turns
+        events = self.encounter_manager.events
+        print(
+            f"{self.encounters} encounters, {wins} won, "
+            f"{self.encounters - wins} lost or unfinished"
+        )
+        print(
+            f"{turns} turns in {self.encounter_manager.rounds} rounds, {events} events "
+            f"in {duration:.3f}s"
+        )
+        print(f"{turns / duration:.0f} turns/s, {events / duration:.0f} events/s")
+        print()
+        print(f"{'phase':<18}{'calls':>10}{'seconds':>10}{'avg ms':>10}{'share':>8}")
+        for phase, phase_duration in sorted(
+            self.timings.durations.items(), key=lambda item: item[1], reverse=True
+        ):
+            calls = self.timings.calls[phase]
+            print(
+                f"{phase:<18}{calls:>10}{phase_duration:>10.3f}"
+                f"{phase_duration / calls * 1000:>10.3f}"
+                f"{phase_duration / duration * 100:>7.1f}%"
+            )
+        # encounter manager, embeds, controller and the simulated discord objects
+        other = duration - self.timings.get_total()
+        print(
+            f"{'other':<18}{'':>10}{other:>10.3f}{'':>10}{other / duration * 100:>7.1f}%"
+        )
+
+        differences = self.encounter_manager.differences
+        if len(differences) > 0:
+            print()
+            print(f"{len(differences)} context differences after reload:")
+            for difference in differences:
+                print(f"  {difference}")
+
+
+async def simulate(args: argparse.Namespace):
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    enemy_type = EnemyType(args.enemy) if args.enemy is not None else None
+
+    bot = SimulatedBot()
+    with tempfile.TemporaryDirectory() as directory:
+        logger = BotLogger(bot, os.path.join(directory, "simulator.log"))
+        database = Database(bot, logger, args.database)
+        try:
+            await database.create_tables()
+            await database.get_guild_level(GUILD_ID)
+            await database.set_guild_level(GUILD_ID, args.level)
+
+            controller = Controller(bot, logger, database)
+            simulator = CombatSimulator(
+                bot, controller, database, rng, args.max_turns, args.loot, args.verify
+            )
+
+            enemies = simulator.get_spawnable_enemies(args.level)
+            if enemy_type is not None:
+                enemies = [enemy for enemy in enemies if enemy.type == enemy_type]
+            if len(enemies) == 0:
+                print(f"No enemy to fight at level {args.level}.")
+                return
+
+            members = await simulator.create_party(
+                args.level, args.party_size, not args.default_gear
+            )
+
+            start = time.perf_counter()
+            for _ in range(args.encounters):
+                await simulator.run_encounter(args.level, enemy_type, members)
+            await database.flush_events()
+            duration = time.perf_counter() - start
+
+            simulator.print_report(duration)
+        finally:
+            await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Headless combat simulator and throughput benchmark."
+    )
+    parser.add_argument("-n", "--encounters", type=int, default=20)
+    parser.add_argument("-l", "--level", type=int, default=3)
+    parser.add_argument("-p", "--party-size", type=int, default=3)
+    parser.add_argument(
+        "-e",
+        "--enemy",
+        choices=[enemy_type.value for enemy_type in EnemyType],
+        default=None,
+        help="enemy to fight, defaults to a random enemy spawning at the level",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument(
+        "--default-gear",
+        action="store_true",
+        help="fight with default gear instead of rolled gear of the encounter level",
+    )
+    parser.add_argument("--loot", action="store_true", help="roll loot for wins")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="compare the incremental context with a reload from the db",
+    )
+    parser.add_argument("--database", default=ConnectionPool.IN_MEMORY_DB)
+    args = parser.parse_args()
+
+    asyncio.run(simulate(args), loop_factory=FastForwardEventLoop)
@@ -73,3 +73,18 @@ class Config:
         12: 40,
     }
     BOSS_LEVELS = [3, 6, 9, 12]
+
+    # Database
+    DB_READER_POOL_SIZE = 2
+    DB_CONNECTION_TIMEOUT = 30
+    DB_HEALTH_CHECK_INTERVAL = 60
+    # one of "default", "wal", "wal_safe"
+    DB_PRAGMA_PROFILE = "wal"
+    DB_MAINTENANCE_INTERVAL = 30
+    # write-behind event journal, interval in milliseconds
+    DB_EVENT_QUEUE_SIZE = 1000
+    DB_EVENT_BATCH_SIZE = 100
+    DB_EVENT_FLUSH_INTERVAL = 5
+
+    # compare cached encounter contexts against a full reload on every load
+    COMBAT_CONTEXT_VERIFICATION = False
@@ -20,6 +20,8 @@ from control.types import AIVersion
 
 class AIManager(Service):
 
+    EVENT_TYPES = []
+
     KEY_FILE = "openai.txt"
     TOKEN_SUMMARIZE_LIMIT = 2500
     TOKEN_SUMMARIZE_THRESHOLD = 2000
@@ -131,7 +133,7 @@ class AIManager(Service):
 
         if self.JAIL_EXTEND_COMMAND_MESSAGE.lower() in response_text.lower():
             time_now = datetime.datetime.now()
-            affected_jails = await self.database.get_active_jails_by_member(message.guild.id, message.author.id)
+            affected_jails = await self.jail_manager.get_active_jails_by_member(message.guild.id, message.author.id)
             if len(affected_jails) > 0:
                 
                 event = JailEvent(
@@ -356,7 +358,7 @@ class AIManager(Service):
                 self.channel_logs[channel_id].add_assistant_message(
                     reference_message.content
                 )
-        active_jails = await self.database.get_active_jails_by_member(
+        active_jails = await self.jail_manager.get_active_jails_by_member(
             message.guild.id, message.author.id
         )
         jail_state = self.NOT_JAILED
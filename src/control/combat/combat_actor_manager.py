@@ -1,10 +1,13 @@
+import datetime
 import random
 
 import discord
 from combat.actors import Actor, Character, Opponent
 from combat.encounter import EncounterContext, TurnData
 from combat.enemies.enemy import Enemy
-from combat.skills.skill import Skill
+from combat.equipment import CharacterEquipment
+from combat.gear.registry import BASE_REGISTRY
+from combat.skills.skill import CharacterSkill, Skill
 from combat.skills.types import SkillEffect, SkillInstance, SkillType
 from control.combat.combat_skill_manager import CombatSkillManager
 from control.controller import Controller
@@ -20,6 +23,8 @@ from events.types import CombatEventType, EncounterEventType
 
 class CombatActorManager(Service):
 
+    EVENT_TYPES = []
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -38,33 +43,7 @@ class CombatActorManager(Service):
         pass
 
     def get_skill(self, skill_type: SkillType) -> Skill:
-        skill = globals()[skill_type]
-        instance = skill()
-        return instance
-
-    async def get_actor_current_hp(
-        self, actor: Actor, combat_events: list[CombatEvent]
-    ):
-        health = actor.max_hp
-
-        for event in reversed(combat_events):
-            if event.target_id != actor.id:
-                continue
-            if event.skill_type is None:
-                continue
-            base_skill = await self.skill_manager.get_base_skill(event.skill_type)
-            match base_skill.skill_effect:
-                case SkillEffect.PHYSICAL_DAMAGE:
-                    health -= event.skill_value
-                case SkillEffect.MAGICAL_DAMAGE:
-                    health -= event.skill_value
-                case SkillEffect.HEALING:
-                    health += event.skill_value
-                    health = min(health, actor.max_hp)
-
-            if health <= 0:
-                return 0
-        return int(health)
+        return BASE_REGISTRY.create(skill_type)
 
     async def get_opponent(
         self,
@@ -108,6 +87,7 @@ class CombatActorManager(Service):
         member: discord.Member,
         encounter_events: list[EncounterEvent] = None,
         combat_events: list[CombatEvent] = None,
+        equipment: CharacterEquipment = None,
     ) -> Character:
         if encounter_events is None:
             encounter_events = []
@@ -129,7 +109,10 @@ class CombatActorManager(Service):
             ):
                 timed_out = True
 
-        equipment = await self.database.get_user_equipment(member.guild.id, member.id)
+        if equipment is None:
+            equipment = await self.database.get_user_equipment(
+                member.guild.id, member.id
+            )
 
         weapon_skills = equipment.weapon.base.skills
 
@@ -225,9 +208,7 @@ class CombatActorManager(Service):
             instance = instances[0]
 
             if target.id not in hp_cache:
-                current_hp = await self.get_actor_current_hp(
-                    target, context.combat_events
-                )
+                current_hp = context.get_actor_current_hp(target)
             else:
                 current_hp = hp_cache[target.id]
 
@@ -266,9 +247,7 @@ class CombatActorManager(Service):
             target = random.choice(available_targets)
 
             if target.id not in hp_cache:
-                current_hp = await self.get_actor_current_hp(
-                    target, context.combat_events
-                )
+                current_hp = context.get_actor_current_hp(target)
             else:
                 current_hp = hp_cache[target.id]
 
@@ -322,3 +301,74 @@ class CombatActorManager(Service):
             )
 
         return turn_data
+
+    async def calculate_character_turn(
+        self,
+        context: EncounterContext,
+        character: Character,
+        skill_data: CharacterSkill,
+        target: Actor = None,
+    ) -> list[TurnData]:
+        if target is None:
+            target = await self.skill_manager.get_character_default_target(
+                character, skill_data.skill, context
+            )
+
+        skill_instances = character.get_skill_effect(
+            skill_data.skill, combatant_count=context.get_combat_scale()
+        )
+
+        skill_value_data = []
+        hp_cache = {}
+
+        for instance in skill_instances:
+            total_skill_value = target.get_damage_after_defense(
+                skill_data.skill, instance.scaled_value
+            )
+
+            target_id = target.id
+            if target_id is None:
+                target_id = -1
+
+            if target_id not in hp_cache:
+                hp_cache[target_id] = context.get_actor_current_hp(target)
+
+            current_hp = hp_cache[target_id]
+
+            if skill_data.skill.base_skill.skill_effect != SkillEffect.HEALING:
+                total_skill_value *= -1
+
+            new_target_hp = min(
+                max(0, current_hp + total_skill_value), character.max_hp
+            )
+            skill_value_data.append((target, instance, new_target_hp))
+
+        return [TurnData(character, skill_data.skill, skill_value_data)]
+
+    def get_turn_events(
+        self, context: EncounterContext, turn: TurnData
+    ) -> list[CombatEvent]:
+        combat_event_type = CombatEventType.MEMBER_TURN
+        skill_id = turn.skill.id
+        if turn.actor.is_enemy:
+            combat_event_type = CombatEventType.ENEMY_TURN
+            skill_id = None
+
+        events = []
+        for target, damage_instance, _ in turn.damage_data:
+            total_damage = target.get_damage_after_defense(
+                turn.skill, damage_instance.scaled_value
+            )
+            event = CombatEvent(
+                datetime.datetime.now(),
+                context.encounter.guild_id,
+                context.encounter.id,
+                turn.actor.id,
+                target.id,
+                turn.skill.base_skill.skill_type,
+                total_damage,
+                skill_id,
+                combat_event_type,
+            )
+            events.append(event)
+        return events
@@ -21,6 +21,8 @@ from events.bot_event import BotEvent
 
 class CombatEmbedManager(Service):
 
+    EVENT_TYPES = []
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -138,9 +140,7 @@ class CombatEmbedManager(Service):
             title=title, description=content, color=discord.Colour.red()
         )
 
-        current_hp = await self.actor_manager.get_actor_current_hp(
-            context.opponent, context.combat_events
-        )
+        current_hp = context.get_actor_current_hp(context.opponent)
         max_hp = context.opponent.max_hp
         self.add_health_bar(embed, current_hp, max_hp, max_width=Config.ENEMY_MAX_WIDTH)
 
@@ -180,9 +180,7 @@ class CombatEmbedManager(Service):
             title=title, description=content, color=discord.Colour.green()
         )
 
-        current_hp = await self.actor_manager.get_actor_current_hp(
-            context.opponent, context.combat_events
-        )
+        current_hp = context.get_actor_current_hp(context.opponent)
         max_hp = context.opponent.max_hp
         self.add_health_bar(embed, current_hp, max_hp, max_width=Config.ENEMY_MAX_WIDTH)
 
@@ -203,9 +201,7 @@ class CombatEmbedManager(Service):
             title=title, description=content, color=discord.Colour.red()
         )
 
-        current_hp = await self.actor_manager.get_actor_current_hp(
-            context.opponent, context.combat_events
-        )
+        current_hp = context.get_actor_current_hp(context.opponent)
         max_hp = context.opponent.max_hp
         self.add_health_bar(embed, current_hp, max_hp, max_width=Config.ENEMY_MAX_WIDTH)
 
@@ -244,9 +240,7 @@ class CombatEmbedManager(Service):
             title=title, description=content, color=discord.Colour.blurple()
         )
 
-        current_hp = await self.actor_manager.get_actor_current_hp(
-            actor, context.combat_events
-        )
+        current_hp = context.get_actor_current_hp(actor)
         max_hp = int(actor.max_hp)
         self.add_health_bar(
             head_embed,
@@ -537,9 +531,7 @@ class CombatEmbedManager(Service):
 
         for idx, actor in enumerate(initiative_list):
             number = idx + 1
-            current_hp = await self.actor_manager.get_actor_current_hp(
-                actor, context.combat_events
-            )
+            current_hp = context.get_actor_current_hp(actor)
             fraction = current_hp / actor.max_hp
             percentage = f"{round(fraction * 100, 1)}".rstrip("0").rstrip(".")
             display_hp = f"[{percentage}%]" if not actor.is_enemy else ""
@@ -11,6 +11,8 @@ from events.bot_event import BotEvent
 
 class CombatEnemyManager(Service):
 
+    EVENT_TYPES = []
+
     def __init__(
         self,
         bot: commands.Bot,
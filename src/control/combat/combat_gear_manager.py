@@ -1,4 +1,5 @@
 import random
+from itertools import accumulate
 
 from combat.actors import Character
 from combat.encounter import EncounterContext
@@ -12,8 +13,8 @@ from combat.gear import (
     DefaultStick,
     DefaultWand,
 )
-from combat.gear.bases import *  # noqa: F403
-from combat.gear.gear import DroppableBase, Gear, GearBase
+from combat.gear.gear import Droppable, DroppableBase, Gear, GearBase
+from combat.gear.registry import BASE_REGISTRY
 from combat.gear.types import (
     Base,
     EquipmentSlot,
@@ -22,7 +23,6 @@ from combat.gear.types import (
     Rarity,
 )
 from combat.skills.skill import BaseSkill, Skill
-from combat.skills.skills import *  # noqa: F403
 from combat.skills.types import SkillType
 from control.combat.combat_skill_manager import CombatSkillManager
 from control.controller import Controller
@@ -38,6 +38,8 @@ from events.types import EncounterEventType
 
 class CombatGearManager(Service):
 
+    EVENT_TYPES = []
+
     GENERATOR_VERSION = "0.0.1"
 
     ITEM_LEVEL_MIN_DROP = 0.6
@@ -149,6 +151,7 @@ class CombatGearManager(Service):
         self.skill_manager: CombatSkillManager = self.controller.get_service(
             CombatSkillManager
         )
+        self.rarity_tables: dict[int, tuple[list[Rarity], tuple[float, ...]]] = {}
 
     async def listen_for_event(self, event: BotEvent):
         pass
@@ -156,84 +159,73 @@ class CombatGearManager(Service):
     async def get_bases_by_lvl(
         self, item_level: int, exclude_skills: bool = False
     ) -> list[DroppableBase]:
-        matching_bases = []
-
-        gear_base_types = [base_type for base_type in GearBaseType]
+        bases = BASE_REGISTRY.get_bases_by_lvl(item_level, exclude_skills)
+        return [BASE_REGISTRY.create(base.type) for base in bases]
 
-        if not exclude_skills:
-            skill_base_types = [base_type for base_type in SkillType]
-            base_types = gear_base_types + skill_base_types
-        else:
-            base_types = gear_base_types
+    async def get_random_base(
+        self,
+        item_level: int,
+        enemy: Enemy = None,
+        exclude_skills: bool = False,
+        rng: random.Random = None,
+    ) -> DroppableBase:
+        return self.__roll_base(
+            rng, item_level, self.__get_loot_table(enemy), exclude_skills
+        )
 
-        for base_type in base_types:
-            base_class = globals()[base_type]
-            base: DroppableBase = base_class()
+    async def get_random_rarity(self, item_level, rng: random.Random = None) -> Rarity:
+        return self.__roll_rarity(rng, item_level)
 
-            if not base.droppable:
-                continue
+    async def get_random_modifiers(
+        self,
+        base: GearBase,
+        item_level: int,
+        rarity: Rarity,
+        rng: random.Random = None,
+    ) -> dict[GearModifierType, float]:
+        return self.__roll_modifiers(rng, base, item_level, rarity)
 
-            if item_level >= base.min_level and item_level <= base.max_level:
-                matching_bases.append(base)
+    async def get_modifier_boundaries(
+        self, base: GearBase, item_level: int, modifier_type: GearModifierType
+    ):
+        return self.__get_modifier_boundaries(base, item_level, modifier_type)
 
-        return matching_bases
+    def __get_loot_table(self, enemy: Enemy) -> tuple[GearBaseType | SkillType, ...]:
+        if enemy is None:
+            return ()
+        return (*enemy.gear_loot_table, *enemy.skill_loot_table)
 
-    async def get_random_base(
-        self, item_level: int, enemy: Enemy = None, exclude_skills: bool = False
+    def __roll_base(
+        self,
+        rng: random.Random,
+        item_level: int,
+        loot_table: tuple[GearBaseType | SkillType, ...],
+        exclude_skills: bool,
     ) -> DroppableBase:
+        if rng is None:
+            rng = random
+
         max_level = item_level
         min_level = max(1, int(item_level * self.ITEM_LEVEL_MIN_DROP))
 
-        drop_item_level = random.randint(min_level, max_level)
+        drop_item_level = rng.randint(min_level, max_level)
 
-        bases = await self.get_bases_by_lvl(drop_item_level, exclude_skills)
+        bases, cum_weights = BASE_REGISTRY.get_weight_table(
+            drop_item_level, self.SKILL_DROP_CHANCE, loot_table, exclude_skills
+        )
 
         if len(bases) <= 0:
             return None
 
-        if enemy is not None:
-            skill_base_types = enemy.skill_loot_table
-            gear_base_types = enemy.gear_loot_table
-
-            table_base_types = gear_base_types + skill_base_types
-
-            for base_type in table_base_types:
-                base_class = globals()[base_type]
-                base: DroppableBase = base_class()
-                bases.append(base)
-
-        skill_weight = 0
-        gear_weight = 0
+        base = rng.choices(bases, cum_weights=cum_weights)[0]
+        return BASE_REGISTRY.create(base.type)
 
-        for base in bases:
-            match base.base_type:
-                case Base.SKILL:
-                    skill_weight += base.weight
-                case Base.GEAR:
-                    gear_weight += base.weight
+    def __get_rarity_table(
+        self, item_level: int
+    ) -> tuple[list[Rarity], tuple[float, ...]]:
+        if item_level in self.rarity_tables:
+            return self.rarity_tables[item_level]
 
-        skill_mod = 0
-        if not exclude_skills:
-            skill_mod = (
-                self.SKILL_DROP_CHANCE * (skill_weight + gear_weight) / skill_weight
-            )
-        # Forces chance of skill dropping to self.SKILL_DROP_CHANCE while keeping weights
-
-        weights = []
-        for base in bases:
-            weight = base.weight
-            match base.base_type:
-                case Base.SKILL:
-                    weight *= skill_mod
-                case Base.GEAR:
-                    weight *= 1 - skill_mod
-            weights.append(weight)
-
-        sum_weights = sum(weights)
-        chances = [v / sum_weights for v in weights]
-        return random.choices(bases, weights=chances)[0]
-
-    async def get_random_rarity(self, item_level) -> Rarity:
         weights = {}
 
         for rarity, weight in self.RARITY_WEIGHTS.items():
@@ -249,23 +241,34 @@ class CombatGearManager(Service):
         chances = [v / sum_weights for _, v in weights.items()]
         rarities = [k for k in weights]
 
-        return random.choices(rarities, weights=chances)[0]
+        self.rarity_tables[item_level] = (rarities, tuple(accumulate(chances)))
+        return self.rarity_tables[item_level]
 
-    async def get_random_modifiers(
-        self, base: GearBase, item_level: int, rarity: Rarity
+    def __roll_rarity(self, rng: random.Random, item_level: int) -> Rarity:
+        if rng is None:
+            rng = random
+
+        rarities, cum_weights = self.__get_rarity_table(item_level)
+        return rng.choices(rarities, cum_weights=cum_weights)[0]
+
+    def __roll_modifiers(
+        self, rng: random.Random, base: GearBase, item_level: int, rarity: Rarity
     ) -> dict[GearModifierType, float]:
+        if rng is None:
+            rng = random
+
         modifiers = {}
         allowed_modifiers = base.get_allowed_modifiers()
         modifier_count = self.MODIFIER_COUNT[rarity]
 
-        modifier_types = random.sample(allowed_modifiers, k=modifier_count)
+        modifier_types = rng.sample(allowed_modifiers, k=modifier_count)
         modifier_types.extend(base.modifiers)
 
         for modifier_type in modifier_types:
-            min_roll, max_roll = await self.get_modifier_boundaries(
+            min_roll, max_roll = self.__get_modifier_boundaries(
                 base, item_level, modifier_type
             )
-            value = random.uniform(min_roll, max_roll)
+            value = rng.uniform(min_roll, max_roll)
 
             if modifier_type in self.INT_MODIFIERS:
                 value = int(value)
@@ -274,7 +277,7 @@ class CombatGearManager(Service):
 
         return modifiers
 
-    async def get_modifier_boundaries(
+    def __get_modifier_boundaries(
         self, base: GearBase, item_level: int, modifier_type: GearModifierType
     ):
         slot_scaling = (
@@ -302,54 +305,39 @@ class CombatGearManager(Service):
 
         return min_roll, max_roll
 
-    async def generate_drop(
+    def __roll_drop(
         self,
-        member_id: int,
-        guild_id: int,
+        rng: random.Random,
         item_level: int,
-        enemy: Enemy = None,
+        loot_table: tuple[GearBaseType | SkillType, ...] = (),
         exclude_skills: bool = False,
-    ) -> Gear:
-        droppable_base = await self.get_random_base(
-            item_level, enemy=enemy, exclude_skills=exclude_skills
-        )
+    ) -> Droppable:
+        droppable_base = self.__roll_base(rng, item_level, loot_table, exclude_skills)
 
         if droppable_base is None:
             return None
 
-        rarity = await self.get_random_rarity(item_level)
+        rarity = self.__roll_rarity(rng, item_level)
 
         match droppable_base.base_type:
             case Base.SKILL:
                 skill_base: BaseSkill = droppable_base
-                skill = Skill(
+                return Skill(
                     base_skill=skill_base,
                     rarity=rarity,
                     level=item_level,
                 )
 
-                if member_id is not None:
-                    skill.id = await self.database.log_user_drop(
-                        guild_id=guild_id,
-                        member_id=member_id,
-                        drop=skill,
-                        generator_version=self.GENERATOR_VERSION,
-                    )
-
-                return skill
-
             case Base.GEAR:
                 gear_base: GearBase = droppable_base
-                modifiers = await self.get_random_modifiers(
-                    gear_base, item_level, rarity
-                )
+                modifiers = self.__roll_modifiers(rng, gear_base, item_level, rarity)
 
                 skills = []
                 skills.extend(gear_base.skills)
 
                 # add enchantments
 
-                gear_item = Gear(
+                return Gear(
                     name="",
                     base=gear_base,
                     rarity=rarity,
@@ -359,30 +347,43 @@ class CombatGearManager(Service):
                     enchantments=[],
                 )
 
-                if member_id is not None:
-                    gear_item.id = await self.database.log_user_drop(
-                        guild_id=guild_id,
-                        member_id=member_id,
-                        drop=gear_item,
-                        generator_version=self.GENERATOR_VERSION,
-                    )
-
-                return gear_item
+    async def roll_drops(
+        self,
+        item_level: int,
+        count: int,
+        enemy: Enemy = None,
+        exclude_skills: bool = False,
+        rng: random.Random = None,
+    ) -> list[Droppable]:
+        loot_table = self.__get_loot_table(enemy)
+        drops = [
+            self.__roll_drop(rng, item_level, loot_table, exclude_skills)
+            for _ in range(count)
+        ]
+        return [drop for drop in drops if drop is not None]
 
-    async def generate_encounter_drop(
+    async def generate_drop(
         self,
-        combatant: Character,
-        context: EncounterContext,
-    ) -> Gear:
-        guild_id = combatant.member.guild.id
-        member_id = combatant.member.id
-        enemy_level = context.opponent.level
-        enemy = context.opponent.enemy
+        member_id: int,
+        guild_id: int,
+        item_level: int,
+        enemy: Enemy = None,
+        exclude_skills: bool = False,
+        rng: random.Random = None,
+    ) -> Droppable:
+        drop = self.__roll_drop(
+            rng, item_level, self.__get_loot_table(enemy), exclude_skills
+        )
 
-        guild_level = await self.database.get_guild_level(guild_id)
-        item_level = min(enemy_level, guild_level)
+        if drop is not None and member_id is not None:
+            drop.id = await self.database.log_user_drop(
+                guild_id=guild_id,
+                member_id=member_id,
+                drop=drop,
+                generator_version=self.GENERATOR_VERSION,
+            )
 
-        return await self.generate_drop(member_id, guild_id, item_level, enemy)
+        return drop
 
     async def get_combatant_penalty(
         self, character: Character, encounter_events: list[EncounterEvent]
@@ -396,34 +397,34 @@ class CombatGearManager(Service):
                         return 0.75
         return 0
 
-    async def roll_enemy_loot(self, context: EncounterContext):
+    async def roll_enemy_loot(self, context: EncounterContext, seed: int = None):
+        rng = random.Random(seed)
         enemy = context.opponent.enemy
+        enemy_level = context.opponent.level
+        guild_id = context.encounter.guild_id
+
+        guild_level = await self.database.get_guild_level(guild_id)
+        item_level = min(enemy_level, guild_level)
 
         loot = {}
+        new_drops: list[tuple[int, Droppable]] = []
 
         for combatant in context.combatants:
 
-            guild_id = combatant.member.guild.id
-
             penalty = await self.get_combatant_penalty(
                 combatant, context.encounter_events
             )
 
             beans_amount = int(
-                enemy.roll_beans_amount(context.opponent.level) * (1 - penalty)
+                enemy.roll_beans_amount(enemy_level, rng) * (1 - penalty)
             )
             loot_amount = max(
-                1, int(enemy.roll_loot_amount(context.opponent.level) * (1 - penalty))
-            )
-            bonus_loot_drop = random.random() < (
-                enemy.bonus_loot_chance * (1 - penalty)
+                1, int(enemy.roll_loot_amount(enemy_level, rng) * (1 - penalty))
             )
+            bonus_loot_drop = rng.random() < (enemy.bonus_loot_chance * (1 - penalty))
 
-            drops = []
-            for _ in range(loot_amount):
-                drop = await self.generate_encounter_drop(combatant, context)
-                if drop is not None:
-                    drops.append(drop)
+            drops = await self.roll_drops(item_level, loot_amount, enemy, rng=rng)
+            new_drops.extend((combatant.member.id, drop) for drop in drops)
 
             bonus_loot = None
             if bonus_loot_drop and len(enemy.item_loot_table) > 0:
@@ -435,10 +436,16 @@ class CombatGearManager(Service):
                 weights = [1.0 / w for w in weights]
                 sum_weights = sum(weights)
                 weights = [w / sum_weights for w in weights]
-                bonus_loot = random.choices(loot_items, weights=weights)[0]
+                bonus_loot = rng.choices(loot_items, weights=weights)[0]
 
             loot[combatant.member] = (beans_amount, drops, bonus_loot)
 
+        drop_ids = await self.database.log_user_drops(
+            guild_id, new_drops, self.GENERATOR_VERSION
+        )
+        for (_, drop), drop_id in zip(new_drops, drop_ids, strict=True):
+            drop.id = drop_id
+
         return loot
 
     async def get_default_gear(self) -> list[Gear]:
@@ -468,45 +475,3 @@ class CombatGearManager(Service):
         gear_score *= rarity_weight[gear.rarity]
 
         return gear_score
-
-    async def test_generation(self):
-        for _ in range(10):
-            gear = await self.generate_drop(1197312669179461683, None, 1)
-            print("Gear:")
-            print(f"{gear.base.name}")
-            print(f"{gear.rarity.value}")
-            print(f"lvl: {gear.level}")
-            print("Modifiers:")
-
-            for mod, value in gear.modifiers.items():
-                print(f"  {mod.name}: {value}")
-
-    async def test(self):
-        # levels = range(9, 13)
-
-        for base_type in GearBaseType:
-            base_class = globals()[base_type]
-            base: GearBase = base_class()
-
-            if base.slot != EquipmentSlot.WEAPON:
-                continue
-
-            print("#" * 30)
-            print(f"Base: {base.type.value}")
-            print("#" * 30)
-            print("-" * 30)
-            print("Levels:")
-            print("-" * 30)
-
-            for level in range(base.min_level, base.max_level):
-                print(f"  {level}:")
-                allowed_modifiers = base.get_allowed_modifiers()
-
-                allowed_modifiers.extend(base.modifiers)
-
-                for modifier_type in allowed_modifiers:
-                    min_roll, max_roll = await self.get_modifier_boundaries(
-                        base, level, modifier_type
-                    )
-
-                    print(f"    {modifier_type.value}: {min_roll:.2f} - {max_roll:.2f}")
@@ -1,9 +1,9 @@
 from combat.actors import Actor
 from combat.encounter import EncounterContext
+from combat.gear.registry import BASE_REGISTRY
 from combat.gear.types import Rarity
 from combat.skills.skill import Skill
-from combat.skills.skills import *  # noqa: F403
-from combat.skills.types import SkillTarget, SkillType
+from combat.skills.types import SkillEffect, SkillTarget, SkillType
 from control.controller import Controller
 from control.logger import BotLogger
 from control.service import Service
@@ -14,6 +14,8 @@ from events.bot_event import BotEvent
 
 class CombatSkillManager(Service):
 
+    EVENT_TYPES = []
+
     CHARACTER_ENCOUNTER_SCALING_FACOTR = 0.9
     OPPONENT_ENCOUNTER_SCALING_FACTOR = 1.2
     OPPONENT_LEVEL_SCALING_FACTOR = 0.2
@@ -29,26 +31,34 @@ class CombatSkillManager(Service):
         self.controller = controller
         self.log_name = "Combat Skills"
 
+        self.skill_effects: dict[SkillType, SkillEffect] = {
+            skill_type: BASE_REGISTRY.get_prototype(skill_type).skill_effect
+            for skill_type in SkillType
+        }
+
     async def listen_for_event(self, event: BotEvent):
         pass
 
     async def get_weapon_skill(
         self, skill_type: SkillType, rarity: Rarity, level: int
     ) -> Skill:
-        skill = globals()[skill_type]
-        instance = skill()
+        instance = BASE_REGISTRY.create(skill_type)
         weapon_skill = Skill(base_skill=instance, rarity=rarity, level=level)
         return weapon_skill
 
     async def get_enemy_skill(self, skill_type: SkillType) -> Skill:
-        skill = globals()[skill_type]
-        instance = skill()
+        instance = BASE_REGISTRY.create(skill_type)
         enemy_skill = Skill(base_skill=instance, rarity=Rarity.NORMAL, level=1)
         return enemy_skill
 
+    def get_skill_effect(self, skill_type: SkillType) -> SkillEffect:
+        return self.skill_effects[skill_type]
+
+    def get_skill_effects(self) -> dict[SkillType, SkillEffect]:
+        return self.skill_effects
+
     async def get_base_skill(self, skill_type: SkillType) -> Skill:
-        skill = globals()[skill_type]
-        instance = skill()
+        instance = BASE_REGISTRY.create(skill_type)
         return instance
 
     async def get_character_default_target(
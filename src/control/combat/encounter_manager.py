@@ -4,11 +4,10 @@ import random
 
 import discord
 from combat.actors import Actor, Character
-from combat.encounter import Encounter, EncounterContext, TurnData
+from combat.encounter import Encounter, EncounterContext
 from combat.enemies import *  # noqa: F403
 from combat.enemies.types import EnemyType
 from combat.skills.skill import CharacterSkill
-from combat.skills.types import SkillEffect
 from config import Config
 from control.combat.combat_actor_manager import CombatActorManager
 from control.combat.combat_embed_manager import CombatEmbedManager
@@ -43,6 +42,8 @@ from view.combat.grace_period import GracePeriodView
 
 class EncounterManager(Service):
 
+    EVENT_TYPES = [EventType.ENCOUNTER, EventType.COMBAT]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -73,7 +74,14 @@ class EncounterManager(Service):
         )
         self.log_name = "Encounter"
 
+        self.context_cache: dict[int, EncounterContext] = {}
+        self.context_buffer: dict[int, list[BotEvent]] = {}
+        self.context_lock = asyncio.Lock()
+
     async def listen_for_event(self, event: BotEvent):
+        if not event.synchronized:
+            self.__apply_to_cached_context(event)
+
         match event.type:
             case EventType.ENCOUNTER:
                 if not event.synchronized:
@@ -193,26 +201,11 @@ class EncounterManager(Service):
         await self.controller.dispatch_event(event)
 
     async def apply_late_join_penalty(self, encounter_id: int, member_id: int) -> str:
-        encounter = await self.database.get_encounter_by_encounter_id(encounter_id)
-        encounter_events = await self.database.get_encounter_events_by_encounter_id(
-            encounter_id
-        )
-        combat_events = await self.database.get_combat_events_by_encounter_id(
-            encounter_id
-        )
-        enemy = self.enemy_manager.get_enemy(encounter.enemy_type)
-        opponent = await self.actor_manager.get_opponent(
-            enemy,
-            encounter.enemy_level,
-            encounter.max_hp,
-            encounter_events,
-            combat_events,
-        )
+        context = await self.load_encounter_context(encounter_id)
+        encounter = context.encounter
 
         max_enemy_hp = encounter.max_hp
-        current_enemy_hp = await self.actor_manager.get_actor_current_hp(
-            opponent, combat_events
-        )
+        current_enemy_hp = context.get_actor_current_hp(context.opponent)
 
         combat_progress = current_enemy_hp / max_enemy_hp
 
@@ -303,7 +296,86 @@ class EncounterManager(Service):
             event = UIEvent(UIEventType.COMBAT_FULL, encounter.id)
             await self.controller.dispatch_ui_event(event)
 
-    async def load_encounter_context(self, encounter_id) -> EncounterContext:
+    def __apply_to_cached_context(self, event: BotEvent):
+        encounter_id = event.encounter_id
+
+        if encounter_id in self.context_buffer:
+            self.context_buffer[encounter_id].append(event)
+            return
+
+        context = self.context_cache.get(encounter_id)
+        if context is None:
+            return
+
+        context.apply_event(event)
+
+        if context.is_concluded():
+            del self.context_cache[encounter_id]
+
+    async def load_encounter_context(self, encounter_id: int) -> EncounterContext:
+        async with self.context_lock:
+            context = self.context_cache.get(encounter_id)
+
+            if context is not None:
+                await self.__load_missing_combatants(context)
+
+            if context is not None and Config.COMBAT_CONTEXT_VERIFICATION:
+                differences = await self.verify_encounter_context(encounter_id)
+                for difference in differences:
+                    self.logger.error(
+                        context.encounter.guild_id,
+                        f"Cached context of encounter {encounter_id} differs: {difference}",
+                        self.log_name,
+                    )
+                if len(differences) > 0:
+                    del self.context_cache[encounter_id]
+                    context = None
+
+            if context is None:
+                context = await self.__cache_encounter_context(encounter_id)
+
+            return context.snapshot()
+
+    async def __cache_encounter_context(self, encounter_id: int) -> EncounterContext:
+        # events dispatched while loading are buffered, they may or may not
+        # have made it into the db snapshot yet
+        self.context_buffer[encounter_id] = []
+        try:
+            context = await self.__load_encounter_context_from_db(encounter_id)
+            await self.database.flush_events()
+            for event in self.context_buffer[encounter_id]:
+                if event.id is None or event.id > context.get_last_event_id(event.type):
+                    context.apply_event(event)
+        finally:
+            del self.context_buffer[encounter_id]
+
+        if not context.is_concluded() and context.thread is not None:
+            self.context_cache[encounter_id] = context
+
+        return context
+
+    async def __load_missing_combatants(self, context: EncounterContext):
+        guild = self.bot.get_guild(context.encounter.guild_id)
+        for member_id in context.get_missing_combatant_ids():
+            combatant = await self.actor_manager.get_character(
+                guild.get_member(member_id),
+                context.encounter_events,
+                context.combat_events,
+            )
+            context.add_combatant(combatant)
+
+    async def verify_encounter_context(self, encounter_id: int) -> list[str]:
+        context = self.context_cache.get(encounter_id)
+        if context is None:
+            return []
+
+        await self.database.flush_events()
+        reloaded = await self.__load_encounter_context_from_db(encounter_id)
+        return context.snapshot().get_differences(reloaded)
+
+    async def __load_encounter_context_from_db(
+        self, encounter_id: int
+    ) -> EncounterContext:
         encounter = await self.database.get_encounter_by_encounter_id(encounter_id)
         encounter_events = await self.database.get_encounter_events_by_encounter_id(
             encounter_id
@@ -328,12 +400,15 @@ class EncounterManager(Service):
         )
         guild = self.bot.get_guild(encounter.guild_id)
         members = [guild.get_member(id) for id in combatant_ids]
+        equipment = await self.database.get_user_equipment_many(
+            encounter.guild_id, combatant_ids
+        )
 
         combatants = []
 
         for member in members:
             combatant = await self.actor_manager.get_character(
-                member, encounter_events, combat_events
+                member, encounter_events, combat_events, equipment.get(member.id)
             )
             combatants.append(combatant)
 
@@ -344,6 +419,7 @@ class EncounterManager(Service):
             combat_events=combat_events,
             combatants=combatants,
             thread=thread,
+            skill_effects=self.skill_manager.get_skill_effects(),
         )
 
     async def skip_turn(
@@ -410,21 +486,7 @@ class EncounterManager(Service):
 
             # await asyncio.sleep(2)
 
-            for target, damage_instance, _ in turn.damage_data:
-                total_damage = target.get_damage_after_defense(
-                    turn.skill, damage_instance.scaled_value
-                )
-                event = CombatEvent(
-                    datetime.datetime.now(),
-                    context.encounter.guild_id,
-                    context.encounter.id,
-                    opponent.id,
-                    target.id,
-                    turn.skill.base_skill.skill_type,
-                    total_damage,
-                    None,
-                    CombatEventType.ENEMY_TURN,
-                )
+            for event in self.actor_manager.get_turn_events(context, turn):
                 await self.controller.dispatch_event(event)
 
             await self.refresh_encounter_thread(context.encounter.id)
@@ -449,44 +511,10 @@ class EncounterManager(Service):
         skill_data: CharacterSkill,
         target: Actor = None,
     ):
-        if target is None:
-            target = await self.skill_manager.get_character_default_target(
-                character, skill_data.skill, context
-            )
-
-        skill_instances = character.get_skill_effect(
-            skill_data.skill, combatant_count=context.get_combat_scale()
+        turn_data = await self.actor_manager.calculate_character_turn(
+            context, character, skill_data, target
         )
 
-        skill_value_data = []
-        hp_cache = {}
-
-        for instance in skill_instances:
-            total_skill_value = target.get_damage_after_defense(
-                skill_data.skill, instance.scaled_value
-            )
-
-            target_id = target.id
-            if target_id is None:
-                target_id = -1
-
-            if target_id not in hp_cache:
-                hp_cache[target_id] = await self.actor_manager.get_actor_current_hp(
-                    target, context.combat_events
-                )
-
-            current_hp = hp_cache[target_id]
-
-            if skill_data.skill.base_skill.skill_effect != SkillEffect.HEALING:
-                total_skill_value *= -1
-
-            new_target_hp = min(
-                max(0, current_hp + total_skill_value), character.max_hp
-            )
-            skill_value_data.append((target, instance, new_target_hp))
-
-        turn_data = [TurnData(character, skill_data.skill, skill_value_data)]
-
         for turn in turn_data:
             turn_message = await self.get_previous_turn_message(context.thread)
             previous_embeds = turn_message.embeds
@@ -497,21 +525,7 @@ class EncounterManager(Service):
                 current_embeds = previous_embeds + [embed]
                 await turn_message.edit(embeds=current_embeds)
 
-            for target, damage_instance, _ in turn.damage_data:
-                total_damage = target.get_damage_after_defense(
-                    turn.skill, damage_instance.scaled_value
-                )
-                event = CombatEvent(
-                    datetime.datetime.now(),
-                    context.encounter.guild_id,
-                    context.encounter.id,
-                    character.id,
-                    target.id,
-                    skill_data.skill.base_skill.skill_type,
-                    total_damage,
-                    skill_data.skill.id,
-                    CombatEventType.MEMBER_TURN,
-                )
+            for event in self.actor_manager.get_turn_events(context, turn):
                 await self.controller.dispatch_event(event)
 
             # await asyncio.sleep(2)
@@ -621,21 +635,14 @@ class EncounterManager(Service):
                 await self.controller.dispatch_event(event)
 
     async def context_needs_update_check(self, context: EncounterContext) -> bool:
-        already_defeated = []
+        already_defeated = context.state.defeated_ids
         update_context = False
 
-        for event in context.encounter_events:
-            match event.encounter_event_type:
-                case EncounterEventType.MEMBER_DEFEAT | EncounterEventType.ENEMY_DEFEAT:
-                    already_defeated.append(event.member_id)
-
         for actor in context.actors:
             if actor.id in already_defeated:
                 continue
 
-            health = await self.actor_manager.get_actor_current_hp(
-                actor, context.combat_events
-            )
+            health = context.get_actor_current_hp(actor)
 
             if health <= 0:
                 encounter_event_type = EncounterEventType.MEMBER_DEFEAT
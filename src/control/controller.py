@@ -1,10 +1,12 @@
 import asyncio
 import importlib
+import time
 
 import discord
 from datalayer.database import Database
 from discord.ext import commands
 from events.bot_event import BotEvent
+from events.types import EventType
 from events.ui_event import UIEvent
 from view.view_menu import ViewMenu
 
@@ -14,6 +16,27 @@ from control.types import ControllerModuleMap
 from control.view.view_controller import ViewController
 
 
+class HandlerStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, duration: float, failed: bool):
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        if failed:
+            self.errors += 1
+
+    def get_average_time(self) -> float:
+        if self.calls == 0:
+            return 0.0
+        return self.total_time / self.calls
+
+
 class Controller:
 
     def __init__(
@@ -28,7 +51,24 @@ class Controller:
 
         self.services: list[Service] = []
         self.view_controllers: list[ViewController] = []
-        self.views: list[ViewMenu] = []
+        self.views: dict[int, ViewMenu] = {}
+        self.broadcast_views: set[int] = set()
+
+        self.subscriptions: dict[EventType, list[Service]] = {}
+        self.global_subscribers: list[Service] = []
+        self.handler_stats: dict[str, HandlerStats] = {}
+
+    def __subscribe(self, handler: Service):
+        self.handler_stats[handler.__class__.__name__] = HandlerStats()
+
+        if handler.EVENT_TYPES is None:
+            self.global_subscribers.append(handler)
+            return
+
+        for event_type in handler.EVENT_TYPES:
+            if event_type not in self.subscriptions:
+                self.subscriptions[event_type] = []
+            self.subscriptions[event_type].append(handler)
 
     def register_view(self, view: ViewMenu):
         controller_type = view.controller_type.value
@@ -39,20 +79,20 @@ class Controller:
             ),
             controller_type,
         )
-        self.views.append(view)
+        self.views[view.id] = view
+        if view.RECEIVES_BROADCASTS:
+            self.broadcast_views.add(view.id)
         self.add_view_controller(controller_class)
 
     def detach_view(self, view: ViewMenu):
-        if view in self.views:
-            self.views.remove(view)
+        self.detach_view_by_id(view.id)
 
     def detach_view_by_id(self, view_id: int):
-        for view in self.views:
-            if view.id == view_id:
-                self.views.remove(view)
+        self.views.pop(view_id, None)
+        self.broadcast_views.discard(view_id)
 
     async def execute_garbage_collection(self):
-        for view in self.views:
+        for view in list(self.views.values()):
             if view.message is None:
                 continue
 
@@ -60,20 +100,54 @@ class Controller:
                 await asyncio.sleep(5)
                 await view.message.edit()
             except (discord.NotFound, discord.HTTPException):
-                if view in self.views:
-                    self.views.remove(view)
+                self.detach_view(view)
+
+    async def __deliver_event(self, handler: Service, event: BotEvent):
+        start = time.perf_counter()
+        failed = False
+        try:
+            await handler.listen_for_event(event)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.handler_stats[handler.__class__.__name__].record(
+                time.perf_counter() - start, failed
+            )
 
     async def dispatch_event(self, event: BotEvent):
-        tasks = []
-        for service in self.services:
-            tasks.append(asyncio.create_task(service.listen_for_event(event)))
-        for view_controller in self.view_controllers:
-            tasks.append(asyncio.create_task(view_controller.listen_for_event(event)))
+        # queued before any handler runs, so their reads already include the event
+        if self.database is not None and not event.synchronized:
+            await self.database.queue_event(event)
+
+        handlers = self.subscriptions.get(event.type, []) + self.global_subscribers
+
+        if len(handlers) == 0:
+            return
+
+        if len(handlers) == 1:
+            await self.__deliver_event(handlers[0], event)
+            return
+
+        tasks = [
+            asyncio.create_task(self.__deliver_event(handler, event))
+            for handler in handlers
+        ]
         result = await asyncio.gather(*tasks, return_exceptions=True)
 
-        for res in result:
+        errors = [res for res in result if isinstance(res, Exception)]
+        for handler, res in zip(handlers, result, strict=True):
             if isinstance(res, Exception):
-                raise res
+                self.logger.error(
+                    "Controller",
+                    f"{handler.__class__.__name__} failed handling {event.type}: {res}",
+                )
+
+        if len(errors) > 0:
+            raise errors[0]
+
+    def get_handler_stats(self) -> dict[str, HandlerStats]:
+        return self.handler_stats
 
     async def dispatch_ui_event(self, event: UIEvent):
         tasks = []
@@ -81,7 +155,14 @@ class Controller:
             tasks.append(
                 asyncio.create_task(view_controller.listen_for_ui_event(event))
             )
-        for view in self.views:
+
+        if event.view_id is None:
+            views = [self.views[view_id] for view_id in self.broadcast_views]
+        else:
+            view = self.views.get(event.view_id)
+            views = [view] if view is not None else []
+
+        for view in views:
             tasks.append(asyncio.create_task(view.listen_for_ui_event(event)))
         result = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -96,13 +177,11 @@ class Controller:
 
         new_service = service_class(self.bot, self.logger, self.database, self)
         self.services.append(new_service)
+        self.__subscribe(new_service)
         return new_service
 
     def get_view(self, id: int) -> ViewMenu:
-        for view in self.views:
-            if view.id == id:
-                return view
-        return None
+        return self.views.get(id)
 
     def add_view_controller(self, controller: type[ViewController]) -> ViewController:
         for view_controller in self.view_controllers:
@@ -111,3 +190,4 @@ class Controller:
 
         new_controller = controller(self.bot, self.logger, self.database, self)
         self.view_controllers.append(new_controller)
+        self.__subscribe(new_controller)
@@ -106,7 +106,6 @@ class EventManager(Service):
 
         from_user = event.get_causing_user_id()
         args = event.get_type_specific_args()
-        await self.database.log_event(event)
         self.__log_event(event, from_user, *args)
 
         if synchronized:
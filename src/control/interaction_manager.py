@@ -28,6 +28,8 @@ from control.settings_manager import SettingsManager
 
 class InteractionManager(Service):
 
+    EVENT_TYPES = []
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -337,7 +339,7 @@ class InteractionManager(Service):
         match item.group:
             case ItemGroup.VALUE_MODIFIER:
                 if item.type == ItemType.SATAN_FART:
-                    affected_jails = await self.database.get_active_jails_by_member(
+                    affected_jails = await self.jail_manager.get_active_jails_by_member(
                         guild_id, user_id
                     )
                     if len(affected_jails) > 0:
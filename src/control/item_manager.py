@@ -1,3 +1,5 @@
+import asyncio
+import copy
 import datetime
 import random
 import secrets
@@ -14,7 +16,7 @@ from events.bot_event import BotEvent
 from events.inventory_event import InventoryEvent
 from events.lootbox_event import LootBoxEvent
 from events.notification_event import NotificationEvent
-from events.types import BeansEventType, LootBoxEventType
+from events.types import BeansEventType, EventType, LootBoxEventType
 
 # needed for global access
 from items import *  # noqa: F403
@@ -31,6 +33,8 @@ from control.settings_manager import SettingsManager
 
 class ItemManager(Service):
 
+    EVENT_TYPES = [EventType.INVENTORY]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -45,17 +49,151 @@ class ItemManager(Service):
         )
         self.log_name = "Items"
 
+        # guild -> trigger -> member -> item type -> count
+        self.trigger_index: dict[
+            int, dict[ItemTrigger, dict[int, dict[ItemType, int]]]
+        ] = {}
+        # guild -> id of the last event already counted by the loaded index
+        self.trigger_index_event_ids: dict[int, int] = {}
+        # guild -> events the next database read might not include yet
+        self.trigger_index_unsaved: dict[int, list[InventoryEvent]] = {}
+        self.trigger_index_locks: dict[int, asyncio.Lock] = {}
+        self.item_triggers: dict[ItemType, list[ItemTrigger]] = {}
+        # guild -> item type -> (shop price setting, priced prototype)
+        self.item_cache: dict[int, dict[ItemType, tuple[int, Item]]] = {}
+
     async def listen_for_event(self, event: BotEvent):
-        pass
+        match event.type:
+            case EventType.INVENTORY:
+                inventory_event: InventoryEvent = event
+                await self.__update_trigger_index(inventory_event)
+
+    async def __get_item_triggers(
+        self, guild_id: int, item_type: ItemType
+    ) -> list[ItemTrigger]:
+        if item_type not in self.item_triggers:
+            item = await self.get_item(guild_id, item_type)
+            self.item_triggers[item_type] = item.trigger if item.trigger else []
+        return self.item_triggers[item_type]
+
+    def __get_trigger_index_lock(self, guild_id: int) -> asyncio.Lock:
+        if guild_id not in self.trigger_index_locks:
+            self.trigger_index_locks[guild_id] = asyncio.Lock()
+        return self.trigger_index_locks[guild_id]
+
+    async def __load_trigger_index(
+        self, guild_id: int
+    ) -> dict[ItemTrigger, dict[int, dict[ItemType, int]]]:
+        # inventory events for this guild wait until the index is swapped in
+        async with self.__get_trigger_index_lock(guild_id):
+            (
+                guild_item_counts,
+                last_event_id,
+            ) = await self.database.get_item_counts_snapshot_by_guild(guild_id)
+            guild_index = {trigger: {} for trigger in ItemTrigger}
+
+            for user_id, item_counts in guild_item_counts.items():
+                for item_type, count in item_counts.items():
+                    if count <= 0:
+                        continue
+                    for trigger in await self.__get_item_triggers(guild_id, item_type):
+                        holders = guild_index[trigger]
+                        if user_id not in holders:
+                            holders[user_id] = {}
+                        holders[user_id][item_type] = count
+
+            # replay what was handled but not yet written when the counts were read
+            unsaved = [
+                event
+                for event in self.trigger_index_unsaved.get(guild_id, [])
+                if event.id is None or event.id > last_event_id
+            ]
+            for event in unsaved:
+                await self.__apply_trigger_index_event(guild_index, event)
+
+            self.trigger_index[guild_id] = guild_index
+            self.trigger_index_event_ids[guild_id] = last_event_id
+            self.trigger_index_unsaved[guild_id] = unsaved
+        return guild_index
+
+    async def rebuild_trigger_index(self, guild_ids: list[int]):
+        for guild_id in guild_ids:
+            await self.__load_trigger_index(guild_id)
+        self.logger.log(
+            "init",
+            f"Item trigger index built for {len(guild_ids)} guilds.",
+            cog=self.log_name,
+        )
+
+    async def __get_trigger_holders(
+        self, guild_id: int, trigger: ItemTrigger
+    ) -> dict[int, dict[ItemType, int]]:
+        guild_index = self.trigger_index.get(guild_id)
+        if guild_index is None:
+            guild_index = await self.__load_trigger_index(guild_id)
+        return guild_index[trigger]
+
+    async def __update_trigger_index(self, event: InventoryEvent):
+        async with self.__get_trigger_index_lock(event.guild_id):
+            # written before the index was read, so already part of its counts
+            last_event_id = self.trigger_index_event_ids.get(event.guild_id)
+            if (
+                event.id is not None
+                and last_event_id is not None
+                and event.id <= last_event_id
+            ):
+                return
+
+            # anything written by now is part of every future read
+            unsaved = [
+                unsaved_event
+                for unsaved_event in self.trigger_index_unsaved.get(event.guild_id, [])
+                if unsaved_event.id is None
+            ]
+            if event.id is None:
+                unsaved.append(event)
+            self.trigger_index_unsaved[event.guild_id] = unsaved
+
+            guild_index = self.trigger_index.get(event.guild_id)
+            if guild_index is None:
+                # loaded from the database on first use
+                return
+
+            await self.__apply_trigger_index_event(guild_index, event)
+
+    async def __apply_trigger_index_event(
+        self,
+        guild_index: dict[ItemTrigger, dict[int, dict[ItemType, int]]],
+        event: InventoryEvent,
+    ):
+        for trigger in await self.__get_item_triggers(event.guild_id, event.item_type):
+            holders = guild_index[trigger]
+            user_items = holders.get(event.member_id, {})
+            count = user_items.get(event.item_type, 0) + event.amount
+
+            if count > 0:
+                user_items[event.item_type] = count
+                holders[event.member_id] = user_items
+                continue
+
+            user_items.pop(event.item_type, None)
+            if len(user_items) == 0:
+                holders.pop(event.member_id, None)
 
     async def get_item(self, guild_id: int, item_type: ItemType) -> Item:
+        price = await self.settings_manager.get_shop_item_price(guild_id, item_type)
 
-        item = globals()[item_type]
-        instance = item(
-            await self.settings_manager.get_shop_item_price(guild_id, item_type)
-        )
+        guild_cache = self.item_cache.setdefault(guild_id, {})
+        cached = guild_cache.get(item_type)
+
+        # a changed shop price replaces the stale prototype
+        if cached is None or cached[0] != price:
+            item = globals()[item_type]
+            cached = (price, item(price))
+            guild_cache[item_type] = cached
 
-        return instance
+        # callers may edit their instance, the prototype must stay untouched
+        return copy.copy(cached[1])
 
     async def get_catalog_items(self, guild_id: int) -> list[Item]:
         items = [x for x in ItemType]
@@ -427,40 +565,35 @@ class ItemManager(Service):
     async def get_guild_items_activated(
         self, guild_id: int, trigger: ItemTrigger
     ) -> dict[int, list[Item]]:
-        guild_item_counts = await self.database.get_item_counts_by_guild(guild_id)
+        holders = await self.__get_trigger_holders(guild_id, trigger)
         items: dict[int, list[Item]] = {}
 
-        for user_id, item_counts in guild_item_counts.items():
-            for item_type, count in item_counts.items():
+        if len(holders) == 0:
+            return items
 
-                item = await self.get_item(guild_id, item_type)
-
-                if count <= 0 or not item.activated(trigger):
-                    continue
-
-                if user_id not in items:
-                    items[user_id] = [item]
-                    continue
-                items[user_id].append(item)
+        for user_id, item_counts in holders.items():
+            items[user_id] = [
+                await self.get_item(guild_id, item_type) for item_type in item_counts
+            ]
 
         return items
 
     async def consume_trigger_items(self, guild: discord.Guild, trigger: ItemTrigger):
-        guild_item_counts = await self.database.get_item_counts_by_guild(guild.id)
-
-        for user_id, item_counts in guild_item_counts.items():
-            for item_type, count in item_counts.items():
+        holders = await self.__get_trigger_holders(guild.id, trigger)
 
-                item = await self.get_item(guild.id, item_type)
-
-                if count <= 0 or not item.activated(trigger):
-                    continue
+        # use_item updates the index, so iterate over a snapshot
+        snapshot = [
+            (user_id, item_type, count)
+            for user_id, item_counts in holders.items()
+            for item_type, count in item_counts.items()
+        ]
 
-                amount = 1
-                if item_type == ItemType.PRESTIGE_BEAN:
-                    amount = count
+        for user_id, item_type, count in snapshot:
+            amount = 1
+            if item_type == ItemType.PRESTIGE_BEAN:
+                amount = count
 
-                await self.use_item(guild, user_id, item_type, amount)
+            await self.use_item(guild, user_id, item_type, amount)
 
     async def use_item_interaction(
         self, interaction: discord.Interaction, item_type: ItemType, amount: int = 1
@@ -1,4 +1,7 @@
+import asyncio
+import contextlib
 import datetime
+import heapq
 import random
 
 import discord
@@ -21,8 +24,23 @@ from control.service import Service
 from control.settings_manager import SettingsManager
 
 
+class JailRelease:
+
+    def __init__(self, jail: UserJail, duration: int, last_event_id: int = 0):
+        self.jail = jail
+        self.duration = duration
+        self.last_event_id = last_event_id
+        self.scheduled_on = self.get_release_timestamp()
+
+    def get_release_timestamp(self) -> float:
+        return self.jail.jailed_on.timestamp() + self.duration * 60
+
+
 class JailManager(Service):
 
+    EVENT_TYPES = [EventType.INVENTORY, EventType.JAIL]
+    RELEASE_RETRY_DELAY = 60
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -37,8 +55,23 @@ class JailManager(Service):
         )
         self.log_name = "Jail"
 
+        self.release_schedule: dict[int, JailRelease] = {}
+        # (release timestamp, jail id), outdated entries are skipped when popped
+        self.release_heap: list[tuple[float, int]] = []
+        self.release_lock = asyncio.Lock()
+        self.release_wakeup = asyncio.Event()
+        self.release_worker: asyncio.Task = None
+
+        # (guild id, member id) -> active sentence, the db is used until it is loaded
+        self.active_jails: dict[tuple[int, int], UserJail] = {}
+        self.active_jail_keys: dict[int, tuple[int, int]] = {}
+        self.jailed_members: dict[int, set[int]] = {}
+        self.active_jails_loaded = False
+
     async def listen_for_event(self, event: BotEvent):
         match event.type:
+            case EventType.JAIL:
+                await self.update_release_schedule(event)
             case EventType.INVENTORY:
                 inventory_event: InventoryEvent = event
                 match inventory_event.item_type:
@@ -47,8 +80,199 @@ class JailManager(Service):
                             guild = self.bot.get_guild(event.guild_id)
                             await self.random_jailing(guild, event.get_causing_user_id())
 
+    async def start_release_scheduler(self):
+        async with self.release_lock:
+            # lookups go to the db until the index below is rebuilt
+            self.active_jails_loaded = False
+            self.release_schedule = {}
+            self.release_heap = []
+            self.active_jails = {}
+            self.active_jail_keys = {}
+            self.jailed_members = {}
+
+            (
+                jails,
+                last_event_id,
+            ) = await self.database.get_active_jails_with_last_event_id()
+            for jail in jails:
+                self.__track_jail(jail)
+                self.__schedule_release(JailRelease(jail, jail.duration, last_event_id))
+
+            self.active_jails_loaded = True
+
+        if self.release_worker is None or self.release_worker.done():
+            self.release_worker = asyncio.create_task(self.__run_release_worker())
+
+        self.logger.log(
+            "init",
+            f"Scheduled {len(self.release_schedule)} jail releases.",
+            cog=self.log_name,
+        )
+
+    async def update_release_schedule(self, event: JailEvent):
+        async with self.release_lock:
+            if event.jail_event_type == JailEventType.RELEASE:
+                self.release_schedule.pop(event.jail_id, None)
+                self.__untrack_jail(event.jail_id)
+                return
+
+            release = self.release_schedule.get(event.jail_id)
+
+            if release is None:
+                (
+                    jail,
+                    last_event_id,
+                ) = await self.database.get_jail_with_last_event_id(event.jail_id)
+                if jail is None or jail.released_on is not None:
+                    return
+                self.__track_jail(jail)
+                release = JailRelease(jail, jail.duration, last_event_id)
+
+            # events written before the jail was read already count towards its duration
+            if event.id is not None and event.id <= release.last_event_id:
+                self.__schedule_release(release)
+                return
+
+            release.duration += event.duration
+            if event.id is not None:
+                release.last_event_id = event.id
+            self.__schedule_release(release)
+
+    def get_scheduled_release(self, jail_id: int) -> JailRelease:
+        return self.release_schedule.get(jail_id)
+
+    def __track_jail(self, jail: UserJail):
+        key = (jail.guild_id, jail.member_id)
+        replaced = self.active_jails.get(key)
+        if replaced is not None:
+            self.active_jail_keys.pop(replaced.id, None)
+
+        self.active_jails[key] = jail
+        self.active_jail_keys[jail.id] = key
+        self.jailed_members.setdefault(jail.guild_id, set()).add(jail.member_id)
+
+    def __untrack_jail(self, jail_id: int):
+        key = self.active_jail_keys.pop(jail_id, None)
+        if key is None:
+            return
+
+        guild_id, member_id = key
+        del self.active_jails[key]
+        members = self.jailed_members[guild_id]
+        members.discard(member_id)
+        if len(members) == 0:
+            del self.jailed_members[guild_id]
+
+    async def get_active_jails_by_member(
+        self, guild_id: int, member_id: int
+    ) -> list[UserJail]:
+        if not self.active_jails_loaded:
+            return await self.database.get_active_jails_by_member(guild_id, member_id)
+
+        jail = self.active_jails.get((guild_id, member_id))
+        if jail is None:
+            return []
+        return [jail]
+
+    async def is_jailed(self, guild_id: int, member_id: int) -> bool:
+        affected_jails = await self.get_active_jails_by_member(guild_id, member_id)
+        return len(affected_jails) > 0
+
+    async def get_jailed_members(self, guild_id: int) -> set[int]:
+        if not self.active_jails_loaded:
+            active_jails = await self.database.get_active_jails_by_guild(guild_id)
+            return {jail.member_id for jail in active_jails}
+
+        return set(self.jailed_members.get(guild_id, ()))
+
+    def __schedule_release(self, release: JailRelease, timestamp: float = None):
+        if timestamp is None:
+            timestamp = release.get_release_timestamp()
+        release.scheduled_on = timestamp
+        self.release_schedule[release.jail.id] = release
+        heapq.heappush(self.release_heap, (timestamp, release.jail.id))
+        self.release_wakeup.set()
+
+    def __get_next_release(self) -> JailRelease:
+        while len(self.release_heap) > 0:
+            timestamp, jail_id = self.release_heap[0]
+            release = self.release_schedule.get(jail_id)
+            if release is not None and release.scheduled_on == timestamp:
+                return release
+            heapq.heappop(self.release_heap)
+        return None
+
+    async def __run_release_worker(self):
+        while True:
+            self.release_wakeup.clear()
+            release = self.__get_next_release()
+
+            timeout = None
+            if release is not None:
+                timeout = release.scheduled_on - datetime.datetime.now().timestamp()
+
+            if timeout is None or timeout > 0:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self.release_wakeup.wait(), timeout)
+                continue
+
+            heapq.heappop(self.release_heap)
+            del self.release_schedule[release.jail.id]
+
+            try:
+                await self.release_jail(release)
+            except Exception as e:
+                self.logger.error(
+                    release.jail.guild_id,
+                    f"Failed to release jail sentence `{release.jail.id}`: {e}",
+                    cog=self.log_name,
+                )
+                retry_timestamp = (
+                    datetime.datetime.now().timestamp() + self.RELEASE_RETRY_DELAY
+                )
+                self.__schedule_release(release, retry_timestamp)
+
+    async def release_jail(self, release: JailRelease):
+        jail = await self.database.get_jail(release.jail.id)
+        if jail is None or jail.released_on is not None:
+            return
+
+        guild_id = jail.guild_id
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(jail.member_id) if guild is not None else None
+        duration = BotUtil.strfdelta(release.duration, inputtype="minutes")
+
+        if member is not None:
+            jail_role = await self.settings_manager.get_jail_role(guild_id)
+            role = member.get_role(jail_role)
+            if role is not None:
+                await member.remove_roles(role)
+
+            self.logger.log(
+                guild_id,
+                f"User {member.name} was released from jail after {duration}.",
+                cog=self.log_name,
+            )
+        else:
+            self.logger.log(
+                guild_id,
+                f"Member or guild not found, user {jail.member_id} was marked as released.",
+                cog=self.log_name,
+            )
+
+        time_now = datetime.datetime.now()
+        event = JailEvent(
+            time_now, guild_id, JailEventType.RELEASE, self.bot.user.id, 0, jail.id
+        )
+        await self.controller.dispatch_event(event)
+
+        if member is not None:
+            await self.announce(
+                guild, f"<@{member.id}> was released from jail after {duration}."
+            )
+
     async def get_active_jail(self, guild_id: int, user: discord.Member) -> UserJail:
-        affected_jails = await self.database.get_active_jails_by_member(guild_id, user.id)
+        affected_jails = await self.get_active_jails_by_member(guild_id, user.id)
         
         jail_role = await self.settings_manager.get_jail_role(guild_id)
         
@@ -58,12 +282,11 @@ class JailManager(Service):
         return affected_jails[0]
 
     async def get_jail_duration(self, jail: UserJail) -> int:
-        events = await self.database.get_jail_events_by_jail(jail.id)
-        total_duration = 0
-        for event in events:
-            total_duration += event.duration
-
-        return total_duration
+        # the schedule sees every jail event, the row only those stored before it was loaded
+        release = self.release_schedule.get(jail.id)
+        if release is not None:
+            return release.duration
+        return jail.duration
 
     async def get_jail_remaining(self, jail: UserJail) -> float:
         duration = await self.get_jail_duration(jail)
@@ -79,12 +302,11 @@ class JailManager(Service):
             await channel.send(message, *args, **kwargs)
 
     async def jail_user(self, guild_id: int, jailed_by_id: int, user: discord.Member, duration: int) -> bool:
-        active_jails = await self.database.get_active_jails_by_guild(guild_id)
-        jailed_members = [jail.member_id for jail in active_jails]
+        jailed = await self.is_jailed(guild_id, user.id)
         
         jail_role = await self.settings_manager.get_jail_role(guild_id)
         
-        if user.id in jailed_members or user.get_role(jail_role) is not None:
+        if jailed or user.get_role(jail_role) is not None:
             return False
         
         await user.add_roles(self.bot.get_guild(guild_id).get_role(jail_role))
@@ -93,6 +315,8 @@ class JailManager(Service):
         jail = UserJail(guild_id, user.id, time_now)
         
         jail = await self.database.log_jail_sentence(jail)
+        # tracked right away so a second sentence can't slip in before the event lands
+        self.__track_jail(jail)
         
         time_now = datetime.datetime.now()
         event = JailEvent(time_now, guild_id, JailEventType.JAIL, jailed_by_id, duration, jail.id)
@@ -101,27 +325,23 @@ class JailManager(Service):
         return True
     
     async def release_user(self, guild_id: int, released_by_id: int, user: discord.Member) -> str:
-        active_jails = await self.database.get_active_jails_by_guild(guild_id)
-        jailed_members = [jail.member_id for jail in active_jails]
+        affected_jails = await self.get_active_jails_by_member(guild_id, user.id)
         
         jail_role = await self.settings_manager.get_jail_role(guild_id)
         
-        if user.id not in jailed_members or user.get_role(jail_role) is None:
+        if len(affected_jails) == 0 or user.get_role(jail_role) is None:
             return False
         
         
         await user.remove_roles(user.get_role(jail_role))
         
-        affected_jails = await self.database.get_active_jails_by_member(guild_id, user.id)
-                
-        if len(affected_jails) > 0:
-            jail = affected_jails[0]
-            remaining = await self.get_jail_remaining(jail)
-            response = f'Their remaining sentence of `{BotUtil.strfdelta(remaining, inputtype='minutes')}` will be forgiven.'
+        jail = affected_jails[0]
+        remaining = await self.get_jail_remaining(jail)
+        response = f'Their remaining sentence of `{BotUtil.strfdelta(remaining, inputtype='minutes')}` will be forgiven.'
 
-            time_now = datetime.datetime.now()
-            event = JailEvent(time_now, guild_id, JailEventType.RELEASE, released_by_id, 0, jail.id)
-            await self.controller.dispatch_event(event)
+        time_now = datetime.datetime.now()
+        event = JailEvent(time_now, guild_id, JailEventType.RELEASE, released_by_id, 0, jail.id)
+        await self.controller.dispatch_event(event)
             
         return response
     
@@ -134,12 +354,8 @@ class JailManager(Service):
             if amount >= 100:
                 users.append(user_id)
 
-        jails = await self.database.get_active_jails_by_guild(guild_id)
-
-        for jail in jails:
-            jailed_member_id = jail.member_id
-            if jailed_member_id in users:
-                users.remove(jailed_member_id)
+        jailed_members = await self.get_jailed_members(guild_id)
+        users = [user_id for user_id in users if user_id not in jailed_members]
 
         victims = random.sample(users, min(5, len(users)))
 
@@ -26,6 +26,8 @@ from control.settings_manager import SettingsManager
 
 class PredictionManager(Service):
 
+    EVENT_TYPES = [EventType.PREDICTION]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -3,12 +3,16 @@ from abc import ABC, abstractmethod
 from datalayer.database import Database
 from discord.ext import commands
 from events.bot_event import BotEvent
+from events.types import EventType
 
 from control.logger import BotLogger
 
 
 class Service(ABC):
 
+    # event types delivered to listen_for_event, None subscribes to every event
+    EVENT_TYPES: list[EventType] = None
+
     def __init__(
         self,
         bot: commands.Bot,
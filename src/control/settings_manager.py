@@ -1,3 +1,7 @@
+import copy
+import json
+from typing import Any
+
 from datalayer.database import Database
 from datalayer.settings import GuildSettings, ModuleSettings
 from discord.ext import commands
@@ -11,6 +15,8 @@ from control.service import Service
 
 class SettingsManager(Service):
 
+    EVENT_TYPES = []
+
     DEFAULT_KEY = "defaults"
 
     GENERAL_SUBSETTINGS_KEY = "general"
@@ -295,18 +301,51 @@ class SettingsManager(Service):
         self.settings.add_module(combat_settings)
         self.settings.add_module(karma_settings)
 
+        self.settings_cache: dict[int, dict[tuple[str, str], Any]] = {}
+        self.settings_versions: dict[int, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     async def listen_for_event(self, event: BotEvent) -> None:
         pass
 
+    async def __get_guild_settings(self, guild: int) -> dict[tuple[str, str], Any]:
+        guild_settings = self.settings_cache.get(guild)
+        if guild_settings is not None:
+            self.cache_hits += 1
+            return guild_settings
+
+        self.cache_misses += 1
+        version = self.settings_versions.get(guild, 0)
+        guild_settings = await self.database.get_guild_settings(guild)
+        # an update that landed during the read may be missing from the result
+        if self.settings_versions.get(guild, 0) == version:
+            self.settings_cache[guild] = guild_settings
+        return guild_settings
+
+    def get_cache_stats(self) -> tuple[int, int, int]:
+        return len(self.settings_cache), self.cache_hits, self.cache_misses
+
     async def update_setting(
         self, guild: int, subsetting_key: str, key: str, value
     ) -> None:
         await self.database.update_setting(guild, subsetting_key, key, value)
+        self.settings_versions[guild] = self.settings_versions.get(guild, 0) + 1
+
+        guild_settings = self.settings_cache.get(guild)
+        if guild_settings is not None:
+            # store what a fresh database read would return
+            guild_settings[(str(subsetting_key), str(key))] = json.loads(
+                json.dumps(value)
+            )
 
     async def get_setting(self, guild: int, subsetting_key: str, key: str):
-        result = await self.database.get_setting(guild, subsetting_key, key)
+        guild_settings = await self.__get_guild_settings(guild)
+        result = guild_settings.get((str(subsetting_key), str(key)))
 
         if result is not None:
+            if isinstance(result, list | dict):
+                return copy.deepcopy(result)
             return result
 
         return self.settings.get_default_setting(subsetting_key, key)
@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+import datetime
+import heapq
+
+import discord
+from discord.ext import commands
+
+from control.controller import Controller
+from control.logger import BotLogger
+from control.role_manager import RoleManager
+from control.service import Service
+from datalayer.database import Database
+from events.bot_event import BotEvent
+from events.timeout_event import TimeoutEvent
+from events.types import EventType
+
+
+class TimeoutRelease:
+
+    def __init__(self, guild_id: int, member_id: int, released_on: float):
+        self.guild_id = guild_id
+        self.member_id = member_id
+        self.released_on = released_on
+        self.notices: list[discord.Message] = []
+
+
+class TimeoutManager(Service):
+
+    EVENT_TYPES = [EventType.TIMEOUT]
+    RELEASE_RETRY_DELAY = 60
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        logger: BotLogger,
+        database: Database,
+        controller: Controller,
+    ):
+        super().__init__(bot, logger, database)
+        self.controller = controller
+        self.role_manager: RoleManager = self.controller.get_service(RoleManager)
+        self.log_name = "Police"
+
+        self.release_schedule: dict[tuple[int, int], TimeoutRelease] = {}
+        # (release timestamp, guild id, member id), outdated entries are skipped when popped
+        self.release_heap: list[tuple[float, int, int]] = []
+        self.release_wakeup = asyncio.Event()
+        self.release_worker: asyncio.Task = None
+
+    async def listen_for_event(self, event: BotEvent):
+        match event.type:
+            case EventType.TIMEOUT:
+                self.schedule_timeout(event)
+
+    async def start_timeout_scheduler(self):
+        timestamp_now = int(datetime.datetime.now().timestamp())
+
+        # the logged timeout events are the schedule, so a restart picks up where it left off.
+        # on a reconnect the releases are merged into the running schedule, which keeps their notices
+        for event in await self.database.get_active_timeout_events(timestamp_now):
+            self.schedule_timeout(event)
+
+        if self.release_worker is None or self.release_worker.done():
+            self.release_worker = asyncio.create_task(self.__run_release_worker())
+
+        self.logger.log(
+            "init",
+            f"Scheduled {len(self.release_schedule)} timeout releases.",
+            cog=self.log_name,
+        )
+
+    def schedule_timeout(self, event: TimeoutEvent) -> TimeoutRelease:
+        return self.__schedule_release(
+            event.guild_id, event.member_id, event.get_timestamp() + event.duration
+        )
+
+    def is_timed_out(self, guild_id: int, member_id: int) -> bool:
+        return (guild_id, member_id) in self.release_schedule
+
+    def get_scheduled_release(self, guild_id: int, member_id: int) -> TimeoutRelease:
+        return self.release_schedule.get((guild_id, member_id))
+
+    def add_notice(self, guild_id: int, member_id: int, notice: discord.Message):
+        release = self.release_schedule.get((guild_id, member_id))
+        if release is not None:
+            release.notices.append(notice)
+
+    def __schedule_release(
+        self, guild_id: int, member_id: int, released_on: float
+    ) -> TimeoutRelease:
+        key = (guild_id, member_id)
+        release = self.release_schedule.get(key)
+
+        if release is None:
+            release = TimeoutRelease(guild_id, member_id, released_on)
+            self.release_schedule[key] = release
+        elif release.released_on >= released_on:
+            return release
+
+        release.released_on = released_on
+        heapq.heappush(self.release_heap, (released_on, guild_id, member_id))
+        self.release_wakeup.set()
+        return release
+
+    def __pop_due_releases(self, timestamp: float) -> dict[int, list[TimeoutRelease]]:
+        due: dict[int, list[TimeoutRelease]] = {}
+        while len(self.release_heap) > 0:
+            released_on, guild_id, member_id = self.release_heap[0]
+            release = self.release_schedule.get((guild_id, member_id))
+
+            if release is not None and release.released_on == released_on:
+                if released_on > timestamp:
+                    break
+                del self.release_schedule[(guild_id, member_id)]
+                due.setdefault(guild_id, []).append(release)
+
+            heapq.heappop(self.release_heap)
+        return due
+
+    async def __run_release_worker(self):
+        while True:
+            self.release_wakeup.clear()
+            timestamp_now = datetime.datetime.now().timestamp()
+            due = self.__pop_due_releases(timestamp_now)
+
+            for guild_id, releases in due.items():
+                try:
+                    await self.release_guild(guild_id, releases)
+                except Exception as e:
+                    self.logger.error(
+                        guild_id,
+                        f"Failed to lift {len(releases)} timeouts: {e}",
+                        cog=self.log_name,
+                    )
+                    for release in releases:
+                        retry = self.__schedule_release(
+                            guild_id,
+                            release.member_id,
+                            timestamp_now + self.RELEASE_RETRY_DELAY,
+                        )
+                        retry.notices.extend(release.notices)
+
+            if len(due) > 0:
+                continue
+
+            timeout = None
+            if len(self.release_heap) > 0:
+                timeout = self.release_heap[0][0] - timestamp_now
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.release_wakeup.wait(), timeout)
+
+    async def release_guild(self, guild_id: int, releases: list[TimeoutRelease]):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+
+        for release in releases:
+            while len(release.notices) > 0:
+                with contextlib.suppress(discord.HTTPException):
+                    await release.notices[-1].delete()
+                release.notices.pop()
+
+        # one role lookup and one log line for every timeout of the guild that ran out
+        timeout_role = await self.role_manager.get_timeout_role(guild)
+        released = []
+
+        for release in releases:
+            # a new timeout may have come in while earlier members were handled
+            if self.is_timed_out(guild_id, release.member_id):
+                continue
+
+            member = guild.get_member(release.member_id)
+            if member is None or member.get_role(timeout_role.id) is None:
+                continue
+
+            try:
+                await member.remove_roles(timeout_role)
+            except discord.Forbidden:
+                self.logger.log(
+                    guild_id,
+                    f"Missing permissions to change user roles of {member.name}.",
+                    cog=self.log_name,
+                )
+                continue
+
+            released.append(member.name)
+
+        if len(released) > 0:
+            self.logger.log(
+                guild_id,
+                f"Rate limit was reset and old permissions reinstated for {', '.join(released)}.",
+                cog=self.log_name,
+            )
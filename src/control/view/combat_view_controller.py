@@ -23,6 +23,8 @@ from control.view.view_controller import ViewController
 
 class CombatViewController(ViewController):
 
+    EVENT_TYPES = [EventType.ENCOUNTER]
+
     def __init__(
         self,
         bot: commands.Bot,
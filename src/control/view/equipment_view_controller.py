@@ -32,6 +32,8 @@ from control.view.view_controller import ViewController
 
 class EquipmentViewController(ViewController):
 
+    EVENT_TYPES = [EventType.INVENTORY]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -28,6 +28,8 @@ from control.view.view_controller import ViewController
 
 class GardenViewController(ViewController):
 
+    EVENT_TYPES = [EventType.BEANS, EventType.INVENTORY]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -72,6 +72,8 @@ class InventorySellAction(InventoryInteraction):
 
 class InventoryViewController(ViewController):
 
+    EVENT_TYPES = [EventType.BEANS, EventType.INVENTORY]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -165,7 +165,7 @@ class LootBoxViewController(ViewController):
         )
         if not success:
             time_now = datetime.datetime.now()
-            affected_jails = await self.database.get_active_jails_by_member(
+            affected_jails = await self.jail_manager.get_active_jails_by_member(
                 guild_id, member.id
             )
             if len(affected_jails) > 0:
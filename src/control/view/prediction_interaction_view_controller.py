@@ -21,6 +21,8 @@ from control.view.view_controller import ViewController
 
 class PredictionInteractionViewController(ViewController):
 
+    EVENT_TYPES = [EventType.PREDICTION]
+
     def __init__(
         self,
         bot: commands.Bot,
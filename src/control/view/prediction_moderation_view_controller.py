@@ -24,6 +24,8 @@ from control.view.view_controller import ViewController
 
 class PredictionModerationViewController(ViewController):
 
+    EVENT_TYPES = [EventType.PREDICTION]
+
     def __init__(
         self,
         bot: commands.Bot,
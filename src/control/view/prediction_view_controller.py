@@ -24,6 +24,8 @@ from control.view.view_controller import ViewController
 
 class PredictionViewController(ViewController):
 
+    EVENT_TYPES = [EventType.PREDICTION, EventType.BEANS]
+
     def __init__(
         self,
         bot: commands.Bot,
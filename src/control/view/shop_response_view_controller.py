@@ -213,7 +213,7 @@ class ShopResponseViewController(ViewController):
                 jail_announcement = f'<@{shop_data.selected_user.id}> was sentenced to Jail by <@{member_id}> using a **{shop_data.item.name}**. They will be released <t:{release}:R>.'
                 
             case ItemType.RELEASE:
-                affected_jails = await self.database.get_active_jails_by_member(guild_id, member_id)
+                affected_jails = await self.jail_manager.get_active_jails_by_member(guild_id, member_id)
                 if len(affected_jails) > 0:
                     await interaction.followup.send('You cannot use this while you are in jail.', ephemeral=True)
                     return
@@ -260,7 +260,7 @@ class ShopResponseViewController(ViewController):
                 jail_announcement = f'<@{member_id}> was released from Jail by bribing the mods with beans. ' + response
             case ItemType.JAIL_REDUCTION:
                 
-                affected_jails = await self.database.get_active_jails_by_member(guild_id, member_id)
+                affected_jails = await self.jail_manager.get_active_jails_by_member(guild_id, member_id)
                 
                 if len(affected_jails) == 0:
                     await interaction.followup.send('You are currently not in jail.', ephemeral=True)
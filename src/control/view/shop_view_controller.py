@@ -41,6 +41,8 @@ class ShopInteraction:
 
 class ShopViewController(ViewController):
 
+    EVENT_TYPES = [EventType.BEANS, EventType.INVENTORY]
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -9,6 +9,8 @@ from control.service import Service
 
 class ViewController(Service):
 
+    EVENT_TYPES = []
+
     def __init__(
         self,
         bot: commands.Bot,
@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import datetime
+import sqlite3
+
+import aiosqlite
+
+from control.logger import BotLogger
+
+
+class PooledConnection:
+
+    def __init__(self, connection: aiosqlite.Connection):
+        self.connection = connection
+        self.last_checked = datetime.datetime.now()
+
+
+class ConnectionPool:
+
+    IN_MEMORY_DB = ":memory:"
+
+    PRAGMA_PROFILES = {
+        "default": {},
+        "wal": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+        },
+        "wal_safe": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -16000,
+            "mmap_size": 67108864,
+            "temp_store": "MEMORY",
+        },
+    }
+
+    def __init__(
+        self,
+        logger: BotLogger,
+        db_file: str,
+        reader_count: int = 2,
+        timeout: int = 30,
+        health_check_interval: int = 60,
+        pragma_profile: str = "default",
+    ):
+        if pragma_profile not in self.PRAGMA_PROFILES:
+            raise ValueError(f"Unknown pragma profile '{pragma_profile}'.")
+
+        self.logger = logger
+        self.db_file = db_file
+        self.pragma_profile = pragma_profile
+        self.pragmas: dict[str, str | int] = self.PRAGMA_PROFILES[pragma_profile]
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.reader_count = max(0, reader_count)
+        self.log_name = "DB"
+
+        if self.db_file == self.IN_MEMORY_DB:
+            # every connection would see its own private in memory database
+            self.reader_count = 0
+
+        self.writer: PooledConnection = None
+        self.writer_lock = asyncio.Lock()
+        self.readers: asyncio.Queue[PooledConnection] = None
+        self.reader_connections: list[PooledConnection] = []
+        self.opened = False
+        self.closing = False
+        self.open_lock = asyncio.Lock()
+
+    async def __connect(self) -> PooledConnection:
+        connection = await aiosqlite.connect(self.db_file, timeout=self.timeout)
+        for pragma, value in self.pragmas.items():
+            await connection.execute(f"PRAGMA {pragma}={value};")
+        return PooledConnection(connection)
+
+    async def __disconnect(self, pooled: PooledConnection):
+        try:
+            await pooled.connection.close()
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(self.log_name, f"Failed to close connection: {e}")
+
+    async def __health_check(self, pooled: PooledConnection) -> PooledConnection:
+        now = datetime.datetime.now()
+        if (
+            pooled.connection.is_alive()
+            and (now - pooled.last_checked).total_seconds()
+            < self.health_check_interval
+        ):
+            return pooled
+
+        try:
+            if not pooled.connection.is_alive():
+                raise sqlite3.OperationalError("connection thread stopped")
+            async with pooled.connection.execute("SELECT 1;") as cursor:
+                await cursor.fetchone()
+            pooled.last_checked = now
+            return pooled
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(
+                self.log_name, f"Connection failed health check, reconnecting: {e}"
+            )
+            await self.__disconnect(pooled)
+            replacement = await self.__connect()
+            pooled.connection = replacement.connection
+            pooled.last_checked = replacement.last_checked
+            return pooled
+
+    async def get_pragma_values(self) -> dict[str, str | int]:
+        values = {}
+        async with self.read() as connection:
+            for pragma in self.pragmas:
+                async with connection.execute(f"PRAGMA {pragma};") as cursor:
+                    row = await cursor.fetchone()
+                    values[pragma] = row[0] if row is not None else None
+        return values
+
+    async def run_maintenance(self):
+        async with self.write() as connection:
+            if self.pragmas.get("journal_mode") == "WAL":
+                await connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            await connection.execute("PRAGMA optimize;")
+
+    async def open(self):
+        async with self.open_lock:
+            if self.opened:
+                return
+
+            self.writer = await self.__connect()
+            self.readers = asyncio.Queue()
+            self.reader_connections = []
+
+            for _ in range(self.reader_count):
+                reader = await self.__connect()
+                self.reader_connections.append(reader)
+                self.readers.put_nowait(reader)
+
+            self.opened = True
+            self.logger.log(
+                self.log_name,
+                f"Opened connection pool with 1 writer and {self.reader_count} readers.",
+            )
+
+    async def close(self):
+        async with self.open_lock:
+            if not self.opened:
+                return
+
+            # no new checkouts, connections still in use are closed once they come back
+            self.closing = True
+            try:
+                for _ in self.reader_connections:
+                    reader = await self.readers.get()
+                    await self.__disconnect(reader)
+
+                async with self.writer_lock:
+                    await self.__disconnect(self.writer)
+            finally:
+                self.closing = False
+
+            self.opened = False
+            self.reader_connections = []
+            self.readers = None
+            self.writer = None
+            self.logger.log(self.log_name, "Closed connection pool.")
+
+    @contextlib.asynccontextmanager
+    async def write(self):
+        if self.closing:
+            raise sqlite3.ProgrammingError("Connection pool is closing.")
+
+        if not self.opened:
+            await self.open()
+
+        async with self.writer_lock:
+            writer = await self.__health_check(self.writer)
+            try:
+                yield writer.connection
+            except BaseException:
+                if writer.connection.in_transaction:
+                    await writer.connection.rollback()
+                raise
+
+    @contextlib.asynccontextmanager
+    async def read(self):
+        if self.closing:
+            raise sqlite3.ProgrammingError("Connection pool is closing.")
+
+        if not self.opened:
+            await self.open()
+
+        if self.reader_count <= 0:
+            async with self.write() as connection:
+                yield connection
+            return
+
+        reader = await self.readers.get()
+        try:
+            reader = await self.__health_check(reader)
+            yield reader.connection
+        finally:
+            self.readers.put_nowait(reader)
@@ -1,5 +1,6 @@
 import datetime
 import json
+import re
 from typing import Any
 
 import aiosqlite
@@ -19,6 +20,7 @@ from combat.gear import (
 )
 from combat.gear.bases import *  # noqa: F403
 from combat.gear.gear import Droppable
+from combat.gear.registry import BASE_REGISTRY
 from combat.gear.types import (
     Base,
     EquipmentSlot,
@@ -29,6 +31,7 @@ from combat.gear.types import (
 from combat.skills.skill import BaseSkill, Skill
 from combat.skills.skills import *  # noqa: F403
 from combat.skills.types import SkillType
+from config import Config
 from control.logger import BotLogger
 from discord.ext import commands
 from events.bat_event import BatEvent
@@ -38,12 +41,9 @@ from events.combat_event import CombatEvent
 from events.encounter_event import EncounterEvent
 from events.garden_event import GardenEvent
 from events.interaction_event import InteractionEvent
-from events.inventory_event import InventoryEvent
 from events.jail_event import JailEvent
 from events.karma_event import KarmaEvent
 from events.lootbox_event import LootBoxEvent
-from events.prediction_event import PredictionEvent
-from events.quote_event import QuoteEvent
 from events.spam_event import SpamEvent
 from events.timeout_event import TimeoutEvent
 from events.types import (
@@ -58,6 +58,8 @@ from items import BaseSeed
 from items.types import ItemState, ItemType
 from view.types import EmojiType
 
+from datalayer.connection_pool import ConnectionPool
+from datalayer.event_journal import EventJournal
 from datalayer.garden import Plot, PlotModifiers, UserGarden
 from datalayer.jail import UserJail
 from datalayer.lootbox import LootBox
@@ -107,6 +109,7 @@ class Database:
     JAIL_MEMBER_COL = "jail_member"
     JAIL_JAILED_ON_COL = "jail_jailed_on"
     JAIL_RELEASED_ON_COL = "jail_released_on"
+    JAIL_DURATION_COL = "jail_duration"
     CREATE_JAIL_TABLE = f"""
     CREATE TABLE if not exists {JAIL_TABLE} (
         {JAIL_ID_COL}  INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -116,6 +119,18 @@ class Database:
         {JAIL_RELEASED_ON_COL} INTEGER
     );"""
 
+    SELECT_ACTIVE_JAILS = f"""
+    SELECT * FROM {JAIL_TABLE} 
+    WHERE {JAIL_RELEASED_ON_COL} IS NULL 
+    OR {JAIL_RELEASED_ON_COL} = 0;"""
+
+    SELECT_ACTIVE_MEMBER_JAILS = f"""
+    SELECT * FROM {JAIL_TABLE} 
+    WHERE {JAIL_MEMBER_COL} = ?
+    AND {JAIL_GUILD_ID_COL} = ?
+    AND ({JAIL_RELEASED_ON_COL} IS NULL 
+    OR {JAIL_RELEASED_ON_COL} = 0);"""
+
     EVENT_TABLE = "events"
     EVENT_ID_COL = "evnt_id"
     EVENT_TIMESTAMP_COL = "evnt_timestamp"
@@ -129,6 +144,19 @@ class Database:
         {EVENT_TYPE_COL} TEXT
     );"""
 
+    INSERT_EVENTS = f"""
+    INSERT INTO {EVENT_TABLE} (
+        {EVENT_TIMESTAMP_COL},
+        {EVENT_GUILD_ID_COL},
+        {EVENT_TYPE_COL})
+    VALUES {{}}
+    RETURNING {EVENT_ID_COL};"""
+    # keeps a multi row insert below the host parameter limit of older sqlite builds
+    INSERT_EVENTS_CHUNK_SIZE = 250
+
+    SELECT_LAST_EVENT_ID = f"""
+    SELECT MAX({EVENT_ID_COL}) AS last_event_id FROM {EVENT_TABLE};"""
+
     INTERACTION_EVENT_TABLE = "interactionevents"
     INTERACTION_EVENT_ID_COL = "inev_id"
     INTERACTION_EVENT_TYPE_COL = "inev_type"
@@ -143,6 +171,14 @@ class Database:
         PRIMARY KEY ({INTERACTION_EVENT_ID_COL})
     );"""
 
+    INSERT_INTERACTION_EVENT = f"""
+    INSERT INTO {INTERACTION_EVENT_TABLE} (
+        {INTERACTION_EVENT_ID_COL},
+        {INTERACTION_EVENT_TYPE_COL},
+        {INTERACTION_EVENT_FROM_COL},
+        {INTERACTION_EVENT_TO_COL})
+    VALUES (?, ?, ?, ?);"""
+
     JAIL_EVENT_TABLE = "jailevents"
     JAIL_EVENT_ID_COL = "jaev_id"
     JAIL_EVENT_TYPE_COL = "jaev_type"
@@ -159,6 +195,26 @@ class Database:
         PRIMARY KEY ({JAIL_EVENT_ID_COL})
     );"""
 
+    INSERT_JAIL_EVENT = f"""
+    INSERT INTO {JAIL_EVENT_TABLE} (
+        {JAIL_EVENT_ID_COL},
+        {JAIL_EVENT_TYPE_COL},
+        {JAIL_EVENT_BY_COL},
+        {JAIL_EVENT_DURATION_COL},
+        {JAIL_EVENT_JAILREFERENCE_COL})
+    VALUES (?, ?, ?, ?, ?);"""
+
+    UPDATE_JAIL_DURATION = f"""
+    UPDATE {JAIL_TABLE} SET {JAIL_DURATION_COL} = {JAIL_DURATION_COL} + ?
+    WHERE {JAIL_ID_COL} = ?;"""
+
+    SELECT_JAIL_EVENTS_BY_JAIL = f"""
+    SELECT * FROM {JAIL_EVENT_TABLE} 
+    INNER JOIN {EVENT_TABLE} ON {EVENT_TABLE}.{EVENT_ID_COL} = {JAIL_EVENT_TABLE}.{JAIL_EVENT_ID_COL}
+    WHERE {JAIL_EVENT_JAILREFERENCE_COL} = ?
+    AND {EVENT_TIMESTAMP_COL} > ?
+    AND {EVENT_TIMESTAMP_COL} <= ?;"""
+
     TIMEOUT_EVENT_TABLE = "timeoutevents"
     TIMEOUT_EVENT_ID_COL = "toev_id"
     TIMEOUT_EVENT_MEMBER_COL = "toev_member"
@@ -171,6 +227,13 @@ class Database:
         PRIMARY KEY ({TIMEOUT_EVENT_ID_COL})
     );"""
 
+    INSERT_TIMEOUT_EVENT = f"""
+    INSERT INTO {TIMEOUT_EVENT_TABLE} (
+        {TIMEOUT_EVENT_ID_COL},
+        {TIMEOUT_EVENT_MEMBER_COL},
+        {TIMEOUT_EVENT_DURATION_COL})
+    VALUES (?, ?, ?);"""
+
     SPAM_EVENT_TABLE = "spamevents"
     SPAM_EVENT_ID_COL = "spev_id"
     SPAM_EVENT_MEMBER_COL = "spev_member"
@@ -181,6 +244,12 @@ class Database:
         PRIMARY KEY ({SPAM_EVENT_ID_COL})
     );"""
 
+    INSERT_SPAM_EVENT = f"""
+    INSERT INTO {SPAM_EVENT_TABLE} (
+        {SPAM_EVENT_ID_COL},
+        {SPAM_EVENT_MEMBER_COL})
+    VALUES (?, ?);"""
+
     QUOTE_TABLE = "quotes"
     QUOTE_ID_COL = "quot_id"
     QUOTE_GUILD_COL = "quot_guild_id"
@@ -214,6 +283,12 @@ class Database:
         PRIMARY KEY ({QUOTE_EVENT_ID_COL})
     );"""
 
+    INSERT_QUOTE_EVENT = f"""
+    INSERT INTO {QUOTE_EVENT_TABLE} (
+        {QUOTE_EVENT_ID_COL},
+        {QUOTE_EVENT_REF_COL})
+    VALUES (?, ?);"""
+
     BEANS_EVENT_TABLE = "beansevents"
     BEANS_EVENT_ID_COL = "bnev_id"
     BEANS_EVENT_MEMBER_COL = "bnev_member"
@@ -228,6 +303,24 @@ class Database:
         PRIMARY KEY ({BEANS_EVENT_ID_COL})
     );"""
 
+    INSERT_BEANS_EVENT = f"""
+    INSERT INTO {BEANS_EVENT_TABLE} (
+        {BEANS_EVENT_ID_COL},
+        {BEANS_EVENT_MEMBER_COL},
+        {BEANS_EVENT_TYPE_COL},
+        {BEANS_EVENT_VALUE_COL})
+    VALUES (?, ?, ?, ?);"""
+
+    SELECT_LAST_BEANS_EVENT = f"""
+    SELECT * FROM {BEANS_EVENT_TABLE} 
+    INNER JOIN {EVENT_TABLE} ON {EVENT_TABLE}.{EVENT_ID_COL} = {BEANS_EVENT_TABLE}.{BEANS_EVENT_ID_COL}
+    WHERE {BEANS_EVENT_MEMBER_COL} = ?
+    AND {EVENT_GUILD_ID_COL} = ?
+    AND {BEANS_EVENT_TYPE_COL} = ?
+    AND {EVENT_TIMESTAMP_COL} > ?
+    AND {EVENT_TIMESTAMP_COL} <= ?
+    ORDER BY {EVENT_TIMESTAMP_COL} DESC LIMIT 1;"""
+
     INVENTORY_ITEM_TABLE = "inventoryitems"
     INVENTORY_ITEM_GUILD_COL = "init_guild_id"
     INVENTORY_ITEM_MEMBER_COL = "init_member_id"
@@ -258,6 +351,14 @@ class Database:
         PRIMARY KEY ({INVENTORY_EVENT_ID_COL})
     );"""
 
+    INSERT_INVENTORY_EVENT = f"""
+    INSERT INTO {INVENTORY_EVENT_TABLE} (
+        {INVENTORY_EVENT_ID_COL},
+        {INVENTORY_EVENT_MEMBER_COL},
+        {INVENTORY_EVENT_ITEM_TYPE_COL},
+        {INVENTORY_EVENT_AMOUNT_COL})
+    VALUES (?, ?, ?, ?);"""
+
     LOOTBOX_TABLE = "lootbox"
     LOOTBOX_ID_COL = "lobo_id"
     LOOTBOX_GUILD_COL = "lobo_guild_id"
@@ -300,6 +401,14 @@ class Database:
         PRIMARY KEY ({LOOTBOX_EVENT_ID_COL})
     );"""
 
+    INSERT_LOOTBOX_EVENT = f"""
+    INSERT INTO {LOOTBOX_EVENT_TABLE} (
+        {LOOTBOX_EVENT_ID_COL},
+        {LOOTBOX_EVENT_LOOTBOX_ID_COL},
+        {LOOTBOX_EVENT_MEMBER_COL},
+        {LOOTBOX_EVENT_TYPE_COL})
+    VALUES (?, ?, ?, ?);"""
+
     BAT_EVENT_TABLE = "batevents"
     BAT_EVENT_ID_COL = "btev_event_id"
     BAT_EVENT_USED_BY_COL = "btev_used_by_id"
@@ -314,6 +423,14 @@ class Database:
         PRIMARY KEY ({BAT_EVENT_ID_COL})
     );"""
 
+    INSERT_BAT_EVENT = f"""
+    INSERT INTO {BAT_EVENT_TABLE} (
+        {BAT_EVENT_ID_COL},
+        {BAT_EVENT_USED_BY_COL},
+        {BAT_EVENT_TARGET_COL},
+        {BAT_EVENT_DURATION_COL})
+    VALUES (?, ?, ?, ?);"""
+
     CUSTOM_COLOR_TABLE = "customcolor"
     CUSTOM_COLOR_GUILD_COL = "cuco_guild_id"
     CUSTOM_COLOR_MEMBER_COL = "cuco_member_id"
@@ -406,6 +523,16 @@ class Database:
         PRIMARY KEY ({PREDICTION_EVENT_ID_COL})
     );"""
 
+    INSERT_PREDICTION_EVENT = f"""
+    INSERT INTO {PREDICTION_EVENT_TABLE} (
+        {PREDICTION_EVENT_ID_COL},
+        {PREDICTION_EVENT_PREDICTION_ID_COL},
+        {PREDICTION_EVENT_OUTCOME_ID_COL},
+        {PREDICTION_EVENT_MEMBER_ID_COL},
+        {PREDICTION_EVENT_TYPE_COL},
+        {PREDICTION_EVENT_AMOUNT_COL})
+    VALUES (?, ?, ?, ?, ?, ?);"""
+
     GARDEN_TABLE = "gardens"
     GARDEN_ID = "grdn_id"
     GARDEN_GUILD_ID = "grdn_guild_id"
@@ -449,6 +576,24 @@ class Database:
         PRIMARY KEY ({GARDEN_EVENT_ID_COL})
     );"""
 
+    INSERT_GARDEN_EVENT = f"""
+    INSERT INTO {GARDEN_EVENT_TABLE} (
+        {GARDEN_EVENT_ID_COL},
+        {GARDEN_EVENT_GARDEN_ID_COL},
+        {GARDEN_EVENT_PLOT_ID_COL},
+        {GARDEN_EVENT_MEMBER_ID},
+        {GARDEN_EVENT_TYPE_COL},
+        {GARDEN_EVENT_PAYLOAD_COL})
+    VALUES (?, ?, ?, ?, ?, ?);"""
+
+    SELECT_GARDEN_EVENTS = f"""
+    SELECT * FROM {GARDEN_EVENT_TABLE}
+    INNER JOIN {EVENT_TABLE} ON {EVENT_TABLE}.{EVENT_ID_COL} = {GARDEN_EVENT_TABLE}.{GARDEN_EVENT_ID_COL}
+    WHERE {GARDEN_EVENT_GARDEN_ID_COL} = ?
+    AND {EVENT_TIMESTAMP_COL} > ?
+    AND {EVENT_TIMESTAMP_COL} <= ?
+    ORDER BY {EVENT_TIMESTAMP_COL} DESC;"""
+
     GUILD_SEASON_TABLE = "guildseason"
     GUILD_SEASON_GUILD_ID_COL = "gdsn_guild_id"
     GUILD_SEASON_GUILD_LEVEL_COL = "gdsn_guild_level"
@@ -505,6 +650,20 @@ class Database:
         PRIMARY KEY ({ENCOUNTER_EVENT_ID_COL})
     );"""
 
+    INSERT_ENCOUNTER_EVENT = f"""
+    INSERT INTO {ENCOUNTER_EVENT_TABLE} (
+        {ENCOUNTER_EVENT_ID_COL},
+        {ENCOUNTER_EVENT_ENCOUNTER_ID_COL},
+        {ENCOUNTER_EVENT_MEMBER_ID},
+        {ENCOUNTER_EVENT_TYPE_COL})
+    VALUES (?, ?, ?, ?);"""
+
+    SELECT_ENCOUNTER_EVENTS = f"""
+    SELECT * FROM {ENCOUNTER_EVENT_TABLE}
+    INNER JOIN {EVENT_TABLE} ON {EVENT_TABLE}.{EVENT_ID_COL} = {ENCOUNTER_EVENT_TABLE}.{ENCOUNTER_EVENT_ID_COL}
+    WHERE {ENCOUNTER_EVENT_ENCOUNTER_ID_COL} = ?
+    ORDER BY {EVENT_ID_COL} DESC;"""
+
     USER_GEAR_TABLE = "usergear"
     USER_GEAR_ID_COL = "usgr_id"
     USER_GEAR_GUILD_ID_COL = "usgr_guild_id"
@@ -532,6 +691,21 @@ class Database:
         {USER_GEAR_IS_LOCKED_COL} INTEGER
     );"""
 
+    INSERT_USER_DROPS = f"""
+    INSERT INTO {USER_GEAR_TABLE} (
+        {USER_GEAR_GUILD_ID_COL},
+        {USER_GEAR_MEMBER_ID_COL},
+        {USER_GEAR_BASE_TYPE_COL},
+        {USER_GEAR_TYPE_COL},
+        {USER_GEAR_LEVEL_COL},
+        {USER_GEAR_RARITY_COL},
+        {USER_GEAR_GENERATOR_VERSION_COL},
+        {USER_GEAR_IS_SCRAPPED_COL},
+        {USER_GEAR_IS_LOCKED_COL})
+    VALUES {{}}
+    RETURNING {USER_GEAR_ID_COL};"""
+    INSERT_USER_DROPS_CHUNK_SIZE = 250
+
     USER_GEAR_MODIFIER_TABLE = "usergearmodifiers"
     USER_GEAR_MODIFIER_GEAR_ID_COL = "ugmo_gear_id"
     USER_GEAR_MODIFIER_TYPE_COL = "ugmo_type"
@@ -543,6 +717,12 @@ class Database:
         {USER_GEAR_MODIFIER_VALUE_COL} REAL,
         PRIMARY KEY ({USER_GEAR_MODIFIER_GEAR_ID_COL}, {USER_GEAR_MODIFIER_TYPE_COL})
     );"""
+    INSERT_USER_GEAR_MODIFIER = f"""
+    INSERT INTO {USER_GEAR_MODIFIER_TABLE} (
+        {USER_GEAR_MODIFIER_GEAR_ID_COL},
+        {USER_GEAR_MODIFIER_TYPE_COL},
+        {USER_GEAR_MODIFIER_VALUE_COL})
+    VALUES (?, ?, ?);"""
 
     USER_GEAR_SKILL_TABLE = "usergearskills"
     USER_GEAR_SKILL_GEAR_ID_COL = "usk_gear_id"
@@ -553,6 +733,11 @@ class Database:
         {USER_GEAR_SKILL_TYPE_COL} TEXT,
         PRIMARY KEY ({USER_GEAR_SKILL_GEAR_ID_COL}, {USER_GEAR_SKILL_TYPE_COL})
     );"""
+    INSERT_USER_GEAR_SKILL = f"""
+    INSERT INTO {USER_GEAR_SKILL_TABLE} (
+        {USER_GEAR_SKILL_GEAR_ID_COL},
+        {USER_GEAR_SKILL_TYPE_COL})
+    VALUES (?, ?);"""
 
     USER_EQUIPMENT_TABLE = "userequipment"
     USER_EQUIPMENT_GUILD_ID_COL = "useq_guild_id"
@@ -614,6 +799,24 @@ class Database:
         PRIMARY KEY ({COMBAT_EVENT_ID_COL})
     );"""
 
+    INSERT_COMBAT_EVENT = f"""
+    INSERT INTO {COMBAT_EVENT_TABLE} (
+        {COMBAT_EVENT_ID_COL},
+        {COMBAT_EVENT_ENCOUNTER_ID_COL},
+        {COMBAT_EVENT_MEMBER_ID},
+        {COMBAT_EVENT_TARGET_ID},
+        {COMBAT_EVENT_SKILL_TYPE},
+        {COMBAT_EVENT_SKILL_VALUE},
+        {COMBAT_EVENT_SKILL_ID},
+        {COMBAT_EVENT_TYPE_COL})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?);"""
+
+    SELECT_COMBAT_EVENTS = f"""
+    SELECT * FROM {COMBAT_EVENT_TABLE}
+    INNER JOIN {EVENT_TABLE} ON {EVENT_TABLE}.{EVENT_ID_COL} = {COMBAT_EVENT_TABLE}.{COMBAT_EVENT_ID_COL}
+    WHERE {COMBAT_EVENT_ENCOUNTER_ID_COL} = ?
+    ORDER BY {EVENT_ID_COL} DESC;"""
+
     KARMA_EVENT_TABLE = "karmaevents"
     KARMA_EVENT_ID_COL = "kaev_id"
     KARMA_EVENT_RECIPIENT_ID = "kaev_recipient_id"
@@ -628,6 +831,222 @@ class Database:
         PRIMARY KEY ({KARMA_EVENT_ID_COL})
     );"""
 
+    INSERT_KARMA_EVENT = f"""
+    INSERT INTO {KARMA_EVENT_TABLE} (
+        {KARMA_EVENT_ID_COL},
+        {KARMA_EVENT_RECIPIENT_ID},
+        {KARMA_EVENT_GIVER_ID},
+        {KARMA_EVENT_AMOUNT})
+    VALUES (?, ?, ?, ?);"""
+
+    BEANS_BALANCE_TABLE = "beansbalances"
+    BEANS_BALANCE_GUILD_COL = "bnbl_guild_id"
+    BEANS_BALANCE_MEMBER_COL = "bnbl_member"
+    BEANS_BALANCE_SEASON_COL = "bnbl_season"
+    BEANS_BALANCE_VALUE_COL = "bnbl_balance"
+    CREATE_BEANS_BALANCE_TABLE = f"""
+    CREATE TABLE if not exists {BEANS_BALANCE_TABLE} (
+        {BEANS_BALANCE_GUILD_COL} INTEGER, 
+        {BEANS_BALANCE_MEMBER_COL} INTEGER, 
+        {BEANS_BALANCE_SEASON_COL} TEXT, 
+        {BEANS_BALANCE_VALUE_COL} INTEGER, 
+        PRIMARY KEY ({BEANS_BALANCE_GUILD_COL}, {BEANS_BALANCE_MEMBER_COL}, {BEANS_BALANCE_SEASON_COL})
+    );"""
+
+    UPSERT_BEANS_BALANCE = f"""
+    INSERT INTO {BEANS_BALANCE_TABLE} (
+        {BEANS_BALANCE_GUILD_COL},
+        {BEANS_BALANCE_MEMBER_COL},
+        {BEANS_BALANCE_SEASON_COL},
+        {BEANS_BALANCE_VALUE_COL})
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT({BEANS_BALANCE_GUILD_COL}, {BEANS_BALANCE_MEMBER_COL}, {BEANS_BALANCE_SEASON_COL})
+    DO UPDATE SET {BEANS_BALANCE_VALUE_COL}={BEANS_BALANCE_VALUE_COL} + excluded.{BEANS_BALANCE_VALUE_COL};"""
+
+    SELECT_MEMBER_BEANS = f"""
+    SELECT {BEANS_BALANCE_VALUE_COL} FROM {BEANS_BALANCE_TABLE} 
+    WHERE {BEANS_BALANCE_GUILD_COL} = ?
+    AND {BEANS_BALANCE_MEMBER_COL} = ?
+    AND {BEANS_BALANCE_SEASON_COL} = ?;"""
+
+    INVENTORY_COUNT_TABLE = "inventorycounts"
+    INVENTORY_COUNT_GUILD_COL = "incn_guild_id"
+    INVENTORY_COUNT_MEMBER_COL = "incn_member_id"
+    INVENTORY_COUNT_ITEM_TYPE_COL = "incn_item_type"
+    INVENTORY_COUNT_SEASON_COL = "incn_season"
+    INVENTORY_COUNT_AMOUNT_COL = "incn_amount"
+    CREATE_INVENTORY_COUNT_TABLE = f"""
+    CREATE TABLE if not exists {INVENTORY_COUNT_TABLE} (
+        {INVENTORY_COUNT_GUILD_COL} INTEGER, 
+        {INVENTORY_COUNT_MEMBER_COL} INTEGER, 
+        {INVENTORY_COUNT_ITEM_TYPE_COL} TEXT, 
+        {INVENTORY_COUNT_SEASON_COL} TEXT, 
+        {INVENTORY_COUNT_AMOUNT_COL} INTEGER, 
+        PRIMARY KEY ({INVENTORY_COUNT_GUILD_COL}, {INVENTORY_COUNT_SEASON_COL}, {INVENTORY_COUNT_MEMBER_COL}, {INVENTORY_COUNT_ITEM_TYPE_COL})
+    );"""
+
+    UPSERT_INVENTORY_COUNT = f"""
+    INSERT INTO {INVENTORY_COUNT_TABLE} (
+        {INVENTORY_COUNT_GUILD_COL},
+        {INVENTORY_COUNT_MEMBER_COL},
+        {INVENTORY_COUNT_ITEM_TYPE_COL},
+        {INVENTORY_COUNT_SEASON_COL},
+        {INVENTORY_COUNT_AMOUNT_COL})
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT({INVENTORY_COUNT_GUILD_COL}, {INVENTORY_COUNT_SEASON_COL}, {INVENTORY_COUNT_MEMBER_COL}, {INVENTORY_COUNT_ITEM_TYPE_COL})
+    DO UPDATE SET {INVENTORY_COUNT_AMOUNT_COL}={INVENTORY_COUNT_AMOUNT_COL} + excluded.{INVENTORY_COUNT_AMOUNT_COL};"""
+
+    # left open for an optional item type filter
+    SELECT_MEMBER_ITEM_COUNTS = f"""
+    SELECT * FROM {INVENTORY_COUNT_TABLE} 
+    WHERE {INVENTORY_COUNT_GUILD_COL} = ?
+    AND {INVENTORY_COUNT_SEASON_COL} = ?
+    AND {INVENTORY_COUNT_MEMBER_COL} = ?"""
+
+    SCHEMA_VERSION_TABLE = "schemaversion"
+    SCHEMA_VERSION_COL = "scve_version"
+    SCHEMA_VERSION_DESCRIPTION_COL = "scve_description"
+    SCHEMA_VERSION_APPLIED_ON_COL = "scve_applied_on"
+    CREATE_SCHEMA_VERSION_TABLE = f"""
+    CREATE TABLE if not exists {SCHEMA_VERSION_TABLE} (
+        {SCHEMA_VERSION_COL} INTEGER, 
+        {SCHEMA_VERSION_DESCRIPTION_COL} TEXT, 
+        {SCHEMA_VERSION_APPLIED_ON_COL} INTEGER, 
+        PRIMARY KEY ({SCHEMA_VERSION_COL})
+    );"""
+
+    CREATE_EVENT_GUILD_TIMESTAMP_INDEX = f"""
+    CREATE INDEX if not exists idx_{EVENT_TABLE}_guild_timestamp 
+    ON {EVENT_TABLE} ({EVENT_GUILD_ID_COL}, {EVENT_TIMESTAMP_COL});"""
+
+    CREATE_BEANS_EVENT_MEMBER_INDEX = f"""
+    CREATE INDEX if not exists idx_{BEANS_EVENT_TABLE}_member 
+    ON {BEANS_EVENT_TABLE} ({BEANS_EVENT_MEMBER_COL}, {BEANS_EVENT_VALUE_COL});"""
+
+    CREATE_INVENTORY_EVENT_MEMBER_INDEX = f"""
+    CREATE INDEX if not exists idx_{INVENTORY_EVENT_TABLE}_member_item 
+    ON {INVENTORY_EVENT_TABLE} ({INVENTORY_EVENT_MEMBER_COL}, {INVENTORY_EVENT_ITEM_TYPE_COL}, {INVENTORY_EVENT_AMOUNT_COL});"""
+
+    CREATE_GARDEN_EVENT_GARDEN_INDEX = f"""
+    CREATE INDEX if not exists idx_{GARDEN_EVENT_TABLE}_garden 
+    ON {GARDEN_EVENT_TABLE} ({GARDEN_EVENT_GARDEN_ID_COL});"""
+
+    CREATE_COMBAT_EVENT_ENCOUNTER_INDEX = f"""
+    CREATE INDEX if not exists idx_{COMBAT_EVENT_TABLE}_encounter 
+    ON {COMBAT_EVENT_TABLE} ({COMBAT_EVENT_ENCOUNTER_ID_COL});"""
+
+    CREATE_ENCOUNTER_EVENT_ENCOUNTER_INDEX = f"""
+    CREATE INDEX if not exists idx_{ENCOUNTER_EVENT_TABLE}_encounter 
+    ON {ENCOUNTER_EVENT_TABLE} ({ENCOUNTER_EVENT_ENCOUNTER_ID_COL});"""
+
+    CREATE_JAIL_MEMBER_INDEX = f"""
+    CREATE INDEX if not exists idx_{JAIL_TABLE}_member 
+    ON {JAIL_TABLE} ({JAIL_MEMBER_COL}, {JAIL_GUILD_ID_COL}, {JAIL_RELEASED_ON_COL});"""
+
+    CREATE_JAIL_RELEASED_ON_INDEX = f"""
+    CREATE INDEX if not exists idx_{JAIL_TABLE}_released_on 
+    ON {JAIL_TABLE} ({JAIL_RELEASED_ON_COL}, {JAIL_GUILD_ID_COL});"""
+
+    CREATE_JAIL_EVENT_SENTENCE_INDEX = f"""
+    CREATE INDEX if not exists idx_{JAIL_EVENT_TABLE}_sentence 
+    ON {JAIL_EVENT_TABLE} ({JAIL_EVENT_JAILREFERENCE_COL});"""
+
+    ADD_JAIL_DURATION_COLUMN = f"""
+    ALTER TABLE {JAIL_TABLE} ADD COLUMN {JAIL_DURATION_COL} INTEGER NOT NULL DEFAULT 0;"""
+
+    REBUILD_JAIL_DURATIONS = f"""
+    UPDATE {JAIL_TABLE} SET {JAIL_DURATION_COL} = (
+        SELECT COALESCE(SUM({JAIL_EVENT_DURATION_COL}), 0) FROM {JAIL_EVENT_TABLE} 
+        WHERE {JAIL_EVENT_JAILREFERENCE_COL} = {JAIL_TABLE}.{JAIL_ID_COL}
+    );"""
+
+    REBUILD_ACTIVE_JAIL_DURATIONS = f"""
+    UPDATE {JAIL_TABLE} SET {JAIL_DURATION_COL} = (
+        SELECT COALESCE(SUM({JAIL_EVENT_DURATION_COL}), 0) FROM {JAIL_EVENT_TABLE} 
+        WHERE {JAIL_EVENT_JAILREFERENCE_COL} = {JAIL_TABLE}.{JAIL_ID_COL}
+    )
+    WHERE {JAIL_RELEASED_ON_COL} IS NULL 
+    OR {JAIL_RELEASED_ON_COL} = 0;"""
+
+    # (version, description, statements), applied in order by create_tables
+    MIGRATIONS = [
+        (
+            1,
+            "Add indexes for hot event, beans, inventory, garden, combat and jail lookups.",
+            [
+                CREATE_EVENT_GUILD_TIMESTAMP_INDEX,
+                CREATE_BEANS_EVENT_MEMBER_INDEX,
+                CREATE_INVENTORY_EVENT_MEMBER_INDEX,
+                CREATE_GARDEN_EVENT_GARDEN_INDEX,
+                CREATE_COMBAT_EVENT_ENCOUNTER_INDEX,
+                CREATE_ENCOUNTER_EVENT_ENCOUNTER_INDEX,
+                CREATE_JAIL_MEMBER_INDEX,
+                CREATE_JAIL_RELEASED_ON_INDEX,
+            ],
+        ),
+        (
+            2,
+            "Add beans balance projection.",
+            [CREATE_BEANS_BALANCE_TABLE],
+        ),
+        (
+            3,
+            "Add inventory count projection.",
+            [CREATE_INVENTORY_COUNT_TABLE],
+        ),
+        (
+            4,
+            "Add cached jail sentence duration.",
+            [
+                CREATE_JAIL_EVENT_SENTENCE_INDEX,
+                ADD_JAIL_DURATION_COLUMN,
+                REBUILD_JAIL_DURATIONS,
+            ],
+        ),
+    ]
+
+    # (name, query, task) of lookups that must never fall back to a table scan,
+    # the queries are the same constants the lookups run
+    HOT_QUERIES = [
+        ("member beans", SELECT_MEMBER_BEANS, (0, 0, "")),
+        ("last beans event", SELECT_LAST_BEANS_EVENT, (0, 0, "", 0, 0)),
+        ("member item counts", SELECT_MEMBER_ITEM_COUNTS, (0, "", 0)),
+        ("garden events", SELECT_GARDEN_EVENTS, (0, 0, 0)),
+        ("combat events", SELECT_COMBAT_EVENTS, (0,)),
+        ("encounter events", SELECT_ENCOUNTER_EVENTS, (0,)),
+        ("active member jails", SELECT_ACTIVE_MEMBER_JAILS, (0, 0)),
+        ("active jails", SELECT_ACTIVE_JAILS, ()),
+        ("jail events", SELECT_JAIL_EVENTS_BY_JAIL, (0, 0, 0)),
+    ]
+
+    # every table the event journal writes to, reads elsewhere may skip the flush
+    JOURNAL_TABLES = re.compile(
+        r"\b(?:"
+        + "|".join(
+            [
+                EVENT_TABLE,
+                INTERACTION_EVENT_TABLE,
+                JAIL_TABLE,
+                JAIL_EVENT_TABLE,
+                TIMEOUT_EVENT_TABLE,
+                SPAM_EVENT_TABLE,
+                QUOTE_EVENT_TABLE,
+                BEANS_EVENT_TABLE,
+                BEANS_BALANCE_TABLE,
+                INVENTORY_EVENT_TABLE,
+                INVENTORY_COUNT_TABLE,
+                LOOTBOX_EVENT_TABLE,
+                BAT_EVENT_TABLE,
+                PREDICTION_EVENT_TABLE,
+                GARDEN_EVENT_TABLE,
+                ENCOUNTER_EVENT_TABLE,
+                COMBAT_EVENT_TABLE,
+                KARMA_EVENT_TABLE,
+            ]
+        )
+        + r")\b"
+    )
+
     PERMANENT_ITEMS = [
         ItemType.REACTION_SPAM,
         ItemType.LOTTERY_TICKET,
@@ -656,9 +1075,32 @@ class Database:
         self.bot = bot
         self.logger = logger
         self.db_file = db_file
+        self.pool = ConnectionPool(
+            logger,
+            db_file,
+            reader_count=Config.DB_READER_POOL_SIZE,
+            timeout=Config.DB_CONNECTION_TIMEOUT,
+            health_check_interval=Config.DB_HEALTH_CHECK_INTERVAL,
+            pragma_profile=Config.DB_PRAGMA_PROFILE,
+        )
+        self.journal = EventJournal(
+            logger,
+            self.__write_events,
+            max_queue_size=Config.DB_EVENT_QUEUE_SIZE,
+            batch_size=Config.DB_EVENT_BATCH_SIZE,
+            flush_interval=Config.DB_EVENT_FLUSH_INTERVAL / 1000,
+        )
+
+    async def close(self):
+        await self.journal.close()
+        await self.pool.close()
+
+    async def run_maintenance(self):
+        await self.pool.run_maintenance()
 
     async def create_tables(self):
-        async with aiosqlite.connect(self.db_file) as db:
+        await self.pool.open()
+        async with self.pool.write() as db:
             await db.execute(self.CREATE_SETTINGS_TABLE)
             await db.execute(self.CREATE_JAIL_TABLE)
             await db.execute(self.CREATE_EVENT_TABLE)
@@ -696,10 +1138,93 @@ class Database:
             await db.execute(self.CREATE_USER_EQUIPMENT_TABLE)
             await db.execute(self.CREATE_USER_EQUIPPED_SKILLS_TABLE)
             await db.execute(self.CREATE_KARMA_EVENT_TABLE)
+            await db.execute(self.CREATE_SCHEMA_VERSION_TABLE)
             await db.commit()
-            self.logger.log(
-                "DB", f"Loaded DB version {aiosqlite.__version__} from {self.db_file}."
-            )
+            await self.__run_migrations(db)
+
+        if await self.__projection_missing(
+            self.BEANS_EVENT_TABLE, self.BEANS_BALANCE_TABLE
+        ):
+            self.logger.log("DB", "Beans balance projection is empty, rebuilding.")
+            await self.verify_beans_balances(rebuild=True)
+
+        if await self.__projection_missing(
+            self.INVENTORY_EVENT_TABLE, self.INVENTORY_COUNT_TABLE
+        ):
+            self.logger.log("DB", "Inventory count projection is empty, rebuilding.")
+            await self.verify_inventory_counts(rebuild=True)
+
+        for name, detail in await self.verify_query_plans():
+            self.logger.error("DB", f"Hot query '{name}' uses a table scan: {detail}")
+
+        pragmas = await self.pool.get_pragma_values()
+        pragma_info = ", ".join([f"{k}={v}" for k, v in pragmas.items()])
+        self.logger.log(
+            "DB",
+            f"Loaded DB version {aiosqlite.__version__} from {self.db_file} "
+            f"with pragma profile '{self.pool.pragma_profile}' ({pragma_info}).",
+        )
+
+    async def __run_migrations(self, db: aiosqlite.Connection):
+        async with db.execute(
+            f"SELECT MAX({self.SCHEMA_VERSION_COL}) FROM {self.SCHEMA_VERSION_TABLE};"
+        ) as cursor:
+            row = await cursor.fetchone()
+        current_version = row[0] if row[0] is not None else 0
+
+        for version, description, statements in sorted(self.MIGRATIONS):
+            if version <= current_version:
+                continue
+            try:
+                for statement in statements:
+                    await db.execute(statement)
+                await db.execute(
+                    f"""
+                    INSERT INTO {self.SCHEMA_VERSION_TABLE} (
+                    {self.SCHEMA_VERSION_COL},
+                    {self.SCHEMA_VERSION_DESCRIPTION_COL},
+                    {self.SCHEMA_VERSION_APPLIED_ON_COL})
+                    VALUES (?, ?, ?);
+                    """,
+                    (version, description, int(datetime.datetime.now().timestamp())),
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                self.logger.error("DB", f"Migration to schema version {version} failed.")
+                raise
+            self.logger.log("DB", f"Migrated schema to version {version}: {description}")
+
+    async def get_schema_version(self) -> int:
+        command = f"""
+            SELECT MAX({self.SCHEMA_VERSION_COL}) AS version FROM {self.SCHEMA_VERSION_TABLE};
+        """
+        rows = await self.__query_select(command)
+        if not rows or rows[0]["version"] is None:
+            return 0
+        return rows[0]["version"]
+
+    async def verify_query_plans(self) -> list[tuple[str, str]]:
+        regressions = []
+        async with self.pool.read() as db:
+            for name, query, task in self.HOT_QUERIES:
+                async with db.execute(f"EXPLAIN QUERY PLAN {query}", task) as cursor:
+                    plan = await cursor.fetchall()
+                for row in plan:
+                    detail = row[-1]
+                    if detail.startswith("SCAN") and "USING" not in detail:
+                        regressions.append((name, detail))
+        return regressions
+
+    def __get_timestamp_seasons(self, timestamp: int) -> list[Season]:
+        seasons = []
+        for season, (start, end) in self.SEASONS.items():
+            if timestamp <= start.value:
+                continue
+            if end is not None and timestamp > end.value:
+                continue
+            seasons.append(season)
+        return seasons
 
     def __get_season_interval(self, season: Season):
         start_timestamp = self.SEASONS[season][0].value
@@ -711,15 +1236,22 @@ class Database:
 
         return start_timestamp, end_timestamp
 
+    async def __flush_journal_for(self, query: str):
+        # only queries touching journaled tables have to see queued events
+        if self.journal.has_pending() and self.JOURNAL_TABLES.search(query):
+            await self.journal.flush()
+
     async def __query_select(self, query: str, task=None):
-        async with aiosqlite.connect(self.db_file, timeout=30) as db:  # noqa: SIM117
+        await self.__flush_journal_for(query)
+        async with self.pool.read() as db:  # noqa: SIM117
             async with db.execute(query, task) as cursor:
                 rows = await cursor.fetchall()
                 headings = [x[0] for x in cursor.description]
                 return self.__parse_rows(rows, headings)
 
     async def __query_insert(self, query: str, task=None) -> int:
-        async with aiosqlite.connect(self.db_file, timeout=30) as db:
+        await self.__flush_journal_for(query)
+        async with self.pool.write() as db:
             cursor = await db.execute(query, task)
             insert_id = cursor.lastrowid
             await db.commit()
@@ -757,6 +1289,24 @@ class Database:
 
         return json.loads(rows[0][self.SETTINGS_VALUE_COL])
 
+    async def get_guild_settings(self, guild_id: int) -> dict[tuple[str, str], Any]:
+        command = f"""
+            SELECT * FROM {self.SETTINGS_TABLE} 
+            WHERE {self.SETTINGS_GUILD_ID_COL}=?;
+        """
+        task = (int(guild_id),)
+
+        rows = await self.__query_select(command, task)
+        if not rows:
+            return {}
+
+        return {
+            (row[self.SETTINGS_MODULE_COL], row[self.SETTINGS_KEY_COL]): json.loads(
+                row[self.SETTINGS_VALUE_COL]
+            )
+            for row in rows
+        }
+
     async def update_setting(self, guild_id: int, module: str, key: str, value):
         value = json.dumps(value)
 
@@ -770,307 +1320,255 @@ class Database:
 
         return await self.__query_insert(command, task)
 
-    async def __create_base_event(self, event: BotEvent) -> int:
-        command = f"""
-                INSERT INTO {self.EVENT_TABLE} (
-                {self.EVENT_TIMESTAMP_COL}, 
-                {self.EVENT_GUILD_ID_COL}, 
-                {self.EVENT_TYPE_COL}) 
-                VALUES (?, ?, ?);
-            """
-        task = (event.get_timestamp(), event.guild_id, event.type)
-
-        return await self.__query_insert(command, task)
-
-    async def __create_interaction_event(
-        self, event_id: int, event: InteractionEvent
-    ) -> int:
-        command = f"""
-            INSERT INTO {self.INTERACTION_EVENT_TABLE} (
-            {self.INTERACTION_EVENT_ID_COL},
-            {self.INTERACTION_EVENT_TYPE_COL},
-            {self.INTERACTION_EVENT_FROM_COL},
-            {self.INTERACTION_EVENT_TO_COL}) 
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.interaction_type,
-            event.from_user_id,
-            event.to_user_id,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_timeout_event(self, event_id: int, event: TimeoutEvent) -> int:
-        command = f"""
-            INSERT INTO {self.TIMEOUT_EVENT_TABLE} (
-            {self.TIMEOUT_EVENT_ID_COL},
-            {self.TIMEOUT_EVENT_MEMBER_COL},
-            {self.TIMEOUT_EVENT_DURATION_COL})
-            VALUES (?, ?, ?);
-        """
-        task = (event_id, event.member_id, event.duration)
-
-        return await self.__query_insert(command, task)
-
-    async def __create_spam_event(self, event_id: int, event: SpamEvent) -> int:
-        command = f"""
-            INSERT INTO {self.SPAM_EVENT_TABLE} (
-            {self.SPAM_EVENT_ID_COL},
-            {self.SPAM_EVENT_MEMBER_COL})
-            VALUES (?, ?);
-        """
-        task = (event_id, event.member_id)
-
-        return await self.__query_insert(command, task)
-
-    async def __create_jail_event(self, event_id: int, event: JailEvent) -> int:
-        command = f"""
-            INSERT INTO {self.JAIL_EVENT_TABLE} (
-            {self.JAIL_EVENT_ID_COL},
-            {self.JAIL_EVENT_TYPE_COL},
-            {self.JAIL_EVENT_BY_COL},
-            {self.JAIL_EVENT_DURATION_COL},
-            {self.JAIL_EVENT_JAILREFERENCE_COL})
-            VALUES (?, ?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.jail_event_type,
-            event.caused_by_id,
-            event.duration,
-            event.jail_id,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_quote_event(self, event_id: int, event: QuoteEvent) -> int:
-        command = f"""
-            INSERT INTO {self.QUOTE_EVENT_TABLE} (
-            {self.QUOTE_EVENT_ID_COL},
-            {self.QUOTE_EVENT_REF_COL})
-            VALUES (?, ?);
-        """
-        task = (event_id, event.quote_id)
-
-        return await self.__query_insert(command, task)
-
-    async def __create_beans_event(self, event_id: int, event: BeansEvent) -> int:
-        command = f"""
-            INSERT INTO {self.BEANS_EVENT_TABLE} (
-            {self.BEANS_EVENT_ID_COL},
-            {self.BEANS_EVENT_MEMBER_COL},
-            {self.BEANS_EVENT_TYPE_COL},
-            {self.BEANS_EVENT_VALUE_COL})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.member_id,
-            event.beans_event_type,
-            event.value,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_inventory_event(
-        self, event_id: int, event: InventoryEvent
-    ) -> int:
-        command = f"""
-            INSERT INTO {self.INVENTORY_EVENT_TABLE} (
-            {self.INVENTORY_EVENT_ID_COL},
-            {self.INVENTORY_EVENT_MEMBER_COL},
-            {self.INVENTORY_EVENT_ITEM_TYPE_COL},
-            {self.INVENTORY_EVENT_AMOUNT_COL})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.member_id,
-            event.item_type,
-            event.amount,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_loot_box_event(self, event_id: int, event: LootBoxEvent) -> int:
-        command = f"""
-            INSERT INTO {self.LOOTBOX_EVENT_TABLE} (
-            {self.LOOTBOX_EVENT_ID_COL},
-            {self.LOOTBOX_EVENT_LOOTBOX_ID_COL},
-            {self.LOOTBOX_EVENT_MEMBER_COL},
-            {self.LOOTBOX_EVENT_TYPE_COL})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.lootbox_id,
-            event.member_id,
-            event.loot_box_event_type,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_bat_event(self, event_id: int, event: BatEvent) -> int:
-        command = f"""
-            INSERT INTO {self.BAT_EVENT_TABLE} (
-            {self.BAT_EVENT_ID_COL},
-            {self.BAT_EVENT_USED_BY_COL},
-            {self.BAT_EVENT_TARGET_COL},
-            {self.BAT_EVENT_DURATION_COL})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (event_id, event.used_by_id, event.target_id, event.duration)
-
-        return await self.__query_insert(command, task)
-
-    async def __create_prediction_event(
-        self, event_id: int, event: PredictionEvent
-    ) -> int:
-        command = f"""
-            INSERT INTO {self.PREDICTION_EVENT_TABLE} (
-            {self.PREDICTION_EVENT_ID_COL},
-            {self.PREDICTION_EVENT_PREDICTION_ID_COL},
-            {self.PREDICTION_EVENT_OUTCOME_ID_COL},
-            {self.PREDICTION_EVENT_MEMBER_ID_COL},
-            {self.PREDICTION_EVENT_TYPE_COL},
-            {self.PREDICTION_EVENT_AMOUNT_COL})
-            VALUES (?, ?, ?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.prediction_id,
-            event.outcome_id,
-            event.member_id,
-            event.prediction_event_type,
-            event.amount,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_garden_event(self, event_id: int, event: GardenEvent) -> int:
-        command = f"""
-            INSERT INTO {self.GARDEN_EVENT_TABLE} (
-            {self.GARDEN_EVENT_ID_COL},
-            {self.GARDEN_EVENT_GARDEN_ID_COL},
-            {self.GARDEN_EVENT_PLOT_ID_COL},
-            {self.GARDEN_EVENT_MEMBER_ID},
-            {self.GARDEN_EVENT_TYPE_COL},
-            {self.GARDEN_EVENT_PAYLOAD_COL})
-            VALUES (?, ?, ?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.garden_id,
-            event.plot_id,
-            event.member_id,
-            event.garden_event_type,
-            event.payload,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_encounter_event(
-        self, event_id: int, event: EncounterEvent
-    ) -> int:
-        command = f"""
-            INSERT INTO {self.ENCOUNTER_EVENT_TABLE} (
-            {self.ENCOUNTER_EVENT_ID_COL},
-            {self.ENCOUNTER_EVENT_ENCOUNTER_ID_COL},
-            {self.ENCOUNTER_EVENT_MEMBER_ID},
-            {self.ENCOUNTER_EVENT_TYPE_COL})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.encounter_id,
-            event.member_id,
-            event.encounter_event_type,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_combat_event(self, event_id: int, event: CombatEvent) -> int:
-        command = f"""
-            INSERT INTO {self.COMBAT_EVENT_TABLE} (
-            {self.COMBAT_EVENT_ID_COL},
-            {self.COMBAT_EVENT_ENCOUNTER_ID_COL},
-            {self.COMBAT_EVENT_MEMBER_ID},
-            {self.COMBAT_EVENT_TARGET_ID},
-            {self.COMBAT_EVENT_SKILL_TYPE},
-            {self.COMBAT_EVENT_SKILL_VALUE},
-            {self.COMBAT_EVENT_SKILL_ID},
-            {self.COMBAT_EVENT_TYPE_COL})
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.encounter_id,
-            event.member_id,
-            event.target_id,
-            event.skill_type,
-            event.skill_value,
-            event.skill_id,
-            event.combat_event_type,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def __create_karma_event(self, event_id: int, event: KarmaEvent) -> int:
-        command = f"""
-            INSERT INTO {self.KARMA_EVENT_TABLE} (
-            {self.KARMA_EVENT_ID_COL},
-            {self.KARMA_EVENT_RECIPIENT_ID},
-            {self.KARMA_EVENT_GIVER_ID},
-            {self.KARMA_EVENT_AMOUNT})
-            VALUES (?, ?, ?, ?);
-        """
-        task = (
-            event_id,
-            event.recipient_id,
-            event.giver_id,
-            event.amount,
-        )
-
-        return await self.__query_insert(command, task)
-
-    async def log_event(self, event: BotEvent) -> int:
-        event_id = await self.__create_base_event(event)
-
-        if event_id is None:
-            self.logger.error("DB", "Event creation error, id was NoneType")
-            return None
-
+    def __get_event_rows(self, event_id: int, event: BotEvent) -> list[tuple]:
+        # (command, task) pairs for the typed child row and projections
         match event.type:
             case EventType.INTERACTION:
-                return await self.__create_interaction_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_INTERACTION_EVENT,
+                        (
+                            event_id,
+                            event.interaction_type,
+                            event.from_user_id,
+                            event.to_user_id,
+                        ),
+                    )
+                ]
             case EventType.JAIL:
-                return await self.__create_jail_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_JAIL_EVENT,
+                        (
+                            event_id,
+                            event.jail_event_type,
+                            event.caused_by_id,
+                            event.duration,
+                            event.jail_id,
+                        ),
+                    ),
+                    (
+                        self.UPDATE_JAIL_DURATION,
+                        (event.duration, event.jail_id),
+                    ),
+                ]
             case EventType.TIMEOUT:
-                return await self.__create_timeout_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_TIMEOUT_EVENT,
+                        (event_id, event.member_id, event.duration),
+                    )
+                ]
             case EventType.QUOTE:
-                return await self.__create_quote_event(event_id, event)
+                return [(self.INSERT_QUOTE_EVENT, (event_id, event.quote_id))]
             case EventType.SPAM:
-                return await self.__create_spam_event(event_id, event)
+                return [(self.INSERT_SPAM_EVENT, (event_id, event.member_id))]
             case EventType.BEANS:
-                return await self.__create_beans_event(event_id, event)
+                rows = [
+                    (
+                        self.INSERT_BEANS_EVENT,
+                        (
+                            event_id,
+                            event.member_id,
+                            event.beans_event_type,
+                            event.value,
+                        ),
+                    )
+                ]
+                for season in self.__get_timestamp_seasons(event.get_timestamp()):
+                    rows.append(
+                        (
+                            self.UPSERT_BEANS_BALANCE,
+                            (
+                                event.guild_id,
+                                event.member_id,
+                                season.value,
+                                event.value,
+                            ),
+                        )
+                    )
+                return rows
             case EventType.INVENTORY:
-                return await self.__create_inventory_event(event_id, event)
+                rows = [
+                    (
+                        self.INSERT_INVENTORY_EVENT,
+                        (
+                            event_id,
+                            event.member_id,
+                            event.item_type,
+                            event.amount,
+                        ),
+                    )
+                ]
+                for season in self.__get_timestamp_seasons(event.get_timestamp()):
+                    rows.append(
+                        (
+                            self.UPSERT_INVENTORY_COUNT,
+                            (
+                                event.guild_id,
+                                event.member_id,
+                                event.item_type,
+                                season.value,
+                                event.amount,
+                            ),
+                        )
+                    )
+                return rows
             case EventType.LOOTBOX:
-                return await self.__create_loot_box_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_LOOTBOX_EVENT,
+                        (
+                            event_id,
+                            event.lootbox_id,
+                            event.member_id,
+                            event.loot_box_event_type,
+                        ),
+                    )
+                ]
             case EventType.BAT:
-                return await self.__create_bat_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_BAT_EVENT,
+                        (event_id, event.used_by_id, event.target_id, event.duration),
+                    )
+                ]
             case EventType.PREDICTION:
-                return await self.__create_prediction_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_PREDICTION_EVENT,
+                        (
+                            event_id,
+                            event.prediction_id,
+                            event.outcome_id,
+                            event.member_id,
+                            event.prediction_event_type,
+                            event.amount,
+                        ),
+                    )
+                ]
             case EventType.GARDEN:
-                return await self.__create_garden_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_GARDEN_EVENT,
+                        (
+                            event_id,
+                            event.garden_id,
+                            event.plot_id,
+                            event.member_id,
+                            event.garden_event_type,
+                            event.payload,
+                        ),
+                    )
+                ]
             case EventType.ENCOUNTER:
-                return await self.__create_encounter_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_ENCOUNTER_EVENT,
+                        (
+                            event_id,
+                            event.encounter_id,
+                            event.member_id,
+                            event.encounter_event_type,
+                        ),
+                    )
+                ]
             case EventType.COMBAT:
-                return await self.__create_combat_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_COMBAT_EVENT,
+                        (
+                            event_id,
+                            event.encounter_id,
+                            event.member_id,
+                            event.target_id,
+                            event.skill_type,
+                            event.skill_value,
+                            event.skill_id,
+                            event.combat_event_type,
+                        ),
+                    )
+                ]
             case EventType.KARMA:
-                return await self.__create_karma_event(event_id, event)
+                return [
+                    (
+                        self.INSERT_KARMA_EVENT,
+                        (
+                            event_id,
+                            event.recipient_id,
+                            event.giver_id,
+                            event.amount,
+                        ),
+                    )
+                ]
+        return []
+
+    async def __insert_events(
+        self, db: aiosqlite.Connection, events: list[BotEvent]
+    ) -> list[int]:
+        event_ids = []
+        for idx in range(0, len(events), self.INSERT_EVENTS_CHUNK_SIZE):
+            chunk = events[idx : idx + self.INSERT_EVENTS_CHUNK_SIZE]
+            command = self.INSERT_EVENTS.format(", ".join(["(?, ?, ?)"] * len(chunk)))
+            task = [
+                value
+                for event in chunk
+                for value in (event.get_timestamp(), event.guild_id, event.type)
+            ]
+            async with db.execute(command, task) as cursor:
+                rows = await cursor.fetchall()
+            if len(rows) != len(chunk):
+                raise ValueError("Event creation error, missing event ids")
+            # autoincrement ids are handed out in insertion order
+            event_ids.extend(sorted(row[0] for row in rows))
+
+        # group child rows by statement so every prepared statement runs once
+        statements: dict[str, list[tuple]] = {}
+        for event_id, event in zip(event_ids, events, strict=True):
+            for command, task in self.__get_event_rows(event_id, event):
+                if command not in statements:
+                    statements[command] = []
+                statements[command].append(task)
+
+        for command, tasks in statements.items():
+            await db.executemany(command, tasks)
+
+        return event_ids
+
+    async def __write_events(self, events: list[BotEvent]) -> list[int]:
+        async with self.pool.write() as db:
+            try:
+                event_ids = await self.__insert_events(db, events)
+                await db.commit()
+                return event_ids
+            except Exception as e:
+                await db.rollback()
+                if len(events) == 1:
+                    self.logger.error(
+                        "DB", f"Failed to log {events[0].type} event: {e}"
+                    )
+                    return [None]
+
+            # one broken event should not take the rest of the batch down with it
+            event_ids = []
+            for event in events:
+                try:
+                    event_ids.extend(await self.__insert_events(db, [event]))
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    self.logger.error("DB", f"Failed to log {event.type} event: {e}")
+                    event_ids.append(None)
+            return event_ids
+
+    async def queue_event(self, event: BotEvent):
+        await self.journal.enqueue(event)
+
+    async def log_event(self, event: BotEvent) -> int:
+        return await self.journal.log(event)
+
+    async def flush_events(self):
+        await self.journal.flush()
 
     async def log_quote(self, quote: Quote) -> int:
         command = f"""
@@ -1506,15 +2004,47 @@ class Database:
         return await self.__query_insert(command, task)
 
     async def get_active_jails(self) -> list[UserJail]:
+        rows = await self.__query_select(self.SELECT_ACTIVE_JAILS)
+        if not rows:
+            return []
+        return [UserJail.from_db_row(row) for row in rows]
+
+    async def get_active_jails_with_last_event_id(
+        self,
+    ) -> tuple[list[UserJail], int]:
+        # one statement, so the durations include exactly the events up to the id
         command = f"""
-            SELECT * FROM {self.JAIL_TABLE} 
+            SELECT *, (SELECT MAX({self.EVENT_ID_COL}) FROM {self.EVENT_TABLE}) AS last_event_id
+            FROM {self.JAIL_TABLE} 
             WHERE {self.JAIL_RELEASED_ON_COL} IS NULL 
             OR {self.JAIL_RELEASED_ON_COL} = 0;
         """
         rows = await self.__query_select(command)
         if not rows:
-            return []
-        return [UserJail.from_db_row(row) for row in rows]
+            return [], 0
+
+        last_event_id = rows[0]["last_event_id"]
+        return (
+            [UserJail.from_db_row(row) for row in rows],
+            last_event_id if last_event_id is not None else 0,
+        )
+
+    async def get_jail_with_last_event_id(self, jail_id: int) -> tuple[UserJail, int]:
+        command = f"""
+            SELECT *, (SELECT MAX({self.EVENT_ID_COL}) FROM {self.EVENT_TABLE}) AS last_event_id
+            FROM {self.JAIL_TABLE} 
+            WHERE {self.JAIL_ID_COL} = ?
+            LIMIT 1;
+        """
+        rows = await self.__query_select(command, (int(jail_id),))
+        if not rows:
+            return None, 0
+
+        last_event_id = rows[0]["last_event_id"]
+        return (
+            UserJail.from_db_row(rows[0]),
+            last_event_id if last_event_id is not None else 0,
+        )
 
     async def get_jail(self, jail_id: int) -> UserJail:
         command = f"""
@@ -1524,10 +2054,10 @@ class Database:
         """
         rows = await self.__query_select(command)
 
-        if rows and len(rows) < 1:
+        if not rows:
             return None
 
-        return UserJail.from_db_row(rows)
+        return UserJail.from_db_row(rows[0])
 
     async def get_jails_by_guild(self, guild_id: int) -> list[UserJail]:
         command = f"""
@@ -1543,8 +2073,8 @@ class Database:
         command = f"""
             SELECT * FROM {self.JAIL_TABLE} 
             WHERE {self.JAIL_GUILD_ID_COL} = {int(guild_id)}
-            AND {self.JAIL_RELEASED_ON_COL} IS NULL 
-            OR {self.JAIL_RELEASED_ON_COL} = 0;
+            AND ({self.JAIL_RELEASED_ON_COL} IS NULL 
+            OR {self.JAIL_RELEASED_ON_COL} = 0);
         """
         rows = await self.__query_select(command)
         if not rows:
@@ -1554,15 +2084,8 @@ class Database:
     async def get_active_jails_by_member(
         self, guild_id: int, user_id: int
     ) -> list[UserJail]:
-        command = f"""
-            SELECT * FROM {self.JAIL_TABLE} 
-            WHERE {self.JAIL_MEMBER_COL} = ?
-            AND {self.JAIL_GUILD_ID_COL} = ?
-            AND {self.JAIL_RELEASED_ON_COL} IS NULL 
-            OR {self.JAIL_RELEASED_ON_COL} = 0;
-        """
         task = (user_id, guild_id)
-        rows = await self.__query_select(command, task)
+        rows = await self.__query_select(self.SELECT_ACTIVE_MEMBER_JAILS, task)
         if not rows:
             return []
         return [UserJail.from_db_row(row) for row in rows]
@@ -1571,19 +2094,39 @@ class Database:
         self, jail_id: int, season: Season = Season.CURRENT
     ) -> list[JailEvent]:
         start_timestamp, end_timestamp = self.__get_season_interval(season)
-        command = f"""
-            SELECT * FROM {self.JAIL_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.JAIL_EVENT_TABLE}.{self.JAIL_EVENT_ID_COL}
-            WHERE {self.JAIL_EVENT_JAILREFERENCE_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?;
-        """
         task = (jail_id, start_timestamp, end_timestamp)
-        rows = await self.__query_select(command, task)
+        rows = await self.__query_select(self.SELECT_JAIL_EVENTS_BY_JAIL, task)
         if not rows:
             return []
         return [JailEvent.from_db_row(row) for row in rows]
 
+    async def verify_jail_durations(
+        self, rebuild: bool = False
+    ) -> list[tuple[int, int, int, int]]:
+        command = f"""
+            SELECT {self.JAIL_GUILD_ID_COL}, {self.JAIL_ID_COL}, {self.JAIL_DURATION_COL}, SUM({self.JAIL_EVENT_DURATION_COL}) FROM {self.JAIL_TABLE} 
+            LEFT JOIN {self.JAIL_EVENT_TABLE} ON {self.JAIL_EVENT_JAILREFERENCE_COL} = {self.JAIL_ID_COL}
+            WHERE {self.JAIL_RELEASED_ON_COL} IS NULL 
+            OR {self.JAIL_RELEASED_ON_COL} = 0
+            GROUP BY {self.JAIL_ID_COL};
+        """
+        mismatches = []
+
+        await self.journal.flush()
+        # holding the writer keeps new events out until the replay is done
+        async with self.pool.write() as db:
+            async with db.execute(command) as cursor:
+                for guild_id, jail_id, stored, replayed in await cursor.fetchall():
+                    replayed = replayed if replayed is not None else 0
+                    if stored != replayed:
+                        mismatches.append((guild_id, jail_id, stored, replayed))
+
+            if rebuild and len(mismatches) > 0:
+                await db.execute(self.REBUILD_ACTIVE_JAIL_DURATIONS)
+                await db.commit()
+
+        return mismatches
+
     async def get_jail_events_by_user(
         self, user_id: int, season: Season = Season.CURRENT
     ) -> list[JailEvent]:
@@ -1663,6 +2206,18 @@ class Database:
             return []
         return [TimeoutEvent.from_db_row(row) for row in rows]
 
+    async def get_active_timeout_events(self, timestamp: int) -> list[TimeoutEvent]:
+        command = f"""
+            SELECT * FROM {self.TIMEOUT_EVENT_TABLE}
+            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.TIMEOUT_EVENT_TABLE}.{self.TIMEOUT_EVENT_ID_COL}
+            WHERE {self.EVENT_TIMESTAMP_COL} + {self.TIMEOUT_EVENT_DURATION_COL} > ?;
+        """
+        task = (timestamp,)
+        rows = await self.__query_select(command, task)
+        if not rows:
+            return []
+        return [TimeoutEvent.from_db_row(row) for row in rows]
+
     async def get_spam_events_by_user(
         self, user_id: int, season: Season = Season.CURRENT
     ) -> list[SpamEvent]:
@@ -1830,49 +2385,124 @@ class Database:
         return LootBoxEvent.from_db_row(rows[0])
 
     async def get_member_beans(
-        self, guild_id: int, user_id: int, season: Season = Season.CURRENT
-    ) -> int:
-        start_timestamp, end_timestamp = self.__get_season_interval(season)
-        command = f"""
-            SELECT SUM({self.BEANS_EVENT_VALUE_COL}) FROM {self.BEANS_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.BEANS_EVENT_TABLE}.{self.BEANS_EVENT_ID_COL}
-            WHERE {self.BEANS_EVENT_MEMBER_COL} = ?
-            AND {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?;
-        """
-        task = (user_id, guild_id, start_timestamp, end_timestamp)
+        self, guild_id: int, user_id: int, season: Season = Season.CURRENT
+    ) -> int:
+        task = (guild_id, user_id, season.value)
 
-        rows = await self.__query_select(command, task)
+        rows = await self.__query_select(self.SELECT_MEMBER_BEANS, task)
         if not rows or len(rows) < 1:
             return 0
-        output = rows[0][f"SUM({self.BEANS_EVENT_VALUE_COL})"]
+        output = rows[0][self.BEANS_BALANCE_VALUE_COL]
         return output if output is not None else 0
 
     async def get_guild_beans(
         self, guild_id: int, season: Season = Season.CURRENT
     ) -> dict[int, int]:
-        start_timestamp, end_timestamp = self.__get_season_interval(season)
         command = f"""
-            SELECT {self.BEANS_EVENT_MEMBER_COL}, SUM({self.BEANS_EVENT_VALUE_COL}) FROM {self.BEANS_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.BEANS_EVENT_TABLE}.{self.BEANS_EVENT_ID_COL}
-            AND {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?
-            GROUP BY {self.BEANS_EVENT_MEMBER_COL};
+            SELECT {self.BEANS_BALANCE_MEMBER_COL}, {self.BEANS_BALANCE_VALUE_COL} FROM {self.BEANS_BALANCE_TABLE} 
+            WHERE {self.BEANS_BALANCE_GUILD_COL} = ?
+            AND {self.BEANS_BALANCE_SEASON_COL} = ?;
         """
-        task = (guild_id, start_timestamp, end_timestamp)
+        task = (guild_id, season.value)
         rows = await self.__query_select(command, task)
         if not rows or len(rows) < 1:
             return {}
 
         output = {
-            row[self.BEANS_EVENT_MEMBER_COL]: row[f"SUM({self.BEANS_EVENT_VALUE_COL})"]
+            row[self.BEANS_BALANCE_MEMBER_COL]: row[self.BEANS_BALANCE_VALUE_COL]
             for row in rows
         }
 
         return output
 
+    async def __projection_missing(
+        self, event_table: str, projection_table: str
+    ) -> bool:
+        command = f"""
+            SELECT EXISTS (SELECT 1 FROM {event_table}) AS has_events, 
+            EXISTS (SELECT 1 FROM {projection_table}) AS has_projection;
+        """
+        rows = await self.__query_select(command)
+        return bool(rows[0]["has_events"]) and not bool(rows[0]["has_projection"])
+
+    async def __verify_projection(
+        self,
+        projection_table: str,
+        key_cols: list[str],
+        value_col: str,
+        replay_command: str,
+        rebuild: bool,
+    ) -> list[tuple]:
+        # replay_command yields the key columns without the season, then the value
+        insert_command = f"""
+            INSERT INTO {projection_table} (
+            {", ".join(key_cols)},
+            {value_col})
+            VALUES {self.__list_sanitizer([*key_cols, value_col])};
+        """
+        mismatches = []
+
+        await self.journal.flush()
+        # holding the writer keeps new events out until the replay is done
+        async with self.pool.write() as db:
+            expected = {}
+            for season in self.SEASONS:
+                start_timestamp, end_timestamp = self.__get_season_interval(season)
+                async with db.execute(
+                    replay_command, (start_timestamp, end_timestamp)
+                ) as cursor:
+                    for row in await cursor.fetchall():
+                        expected[(*row[:-1], season.value)] = row[-1]
+
+            current = {}
+            async with db.execute(f"SELECT * FROM {projection_table};") as cursor:
+                headings = [x[0] for x in cursor.description]
+                for row in self.__parse_rows(await cursor.fetchall(), headings):
+                    key = tuple(row[col] for col in key_cols)
+                    current[key] = row[value_col]
+
+            for key in expected.keys() | current.keys():
+                expected_value = expected.get(key, 0)
+                current_value = current.get(key, 0)
+                if expected_value != current_value:
+                    mismatches.append((*key, current_value, expected_value))
+
+            if rebuild:
+                await db.execute(f"DELETE FROM {projection_table};")
+                await db.executemany(
+                    insert_command,
+                    [(*key, value) for key, value in expected.items()],
+                )
+                await db.commit()
+
+        return mismatches
+
+    async def verify_beans_balances(
+        self, rebuild: bool = False
+    ) -> list[tuple[int, int, Season, int, int]]:
+        replay_command = f"""
+            SELECT {self.EVENT_GUILD_ID_COL}, {self.BEANS_EVENT_MEMBER_COL}, SUM({self.BEANS_EVENT_VALUE_COL}) FROM {self.BEANS_EVENT_TABLE} 
+            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.BEANS_EVENT_TABLE}.{self.BEANS_EVENT_ID_COL}
+            WHERE {self.EVENT_TIMESTAMP_COL} > ?
+            AND {self.EVENT_TIMESTAMP_COL} <= ?
+            GROUP BY {self.EVENT_GUILD_ID_COL}, {self.BEANS_EVENT_MEMBER_COL};
+        """
+        mismatches = await self.__verify_projection(
+            self.BEANS_BALANCE_TABLE,
+            [
+                self.BEANS_BALANCE_GUILD_COL,
+                self.BEANS_BALANCE_MEMBER_COL,
+                self.BEANS_BALANCE_SEASON_COL,
+            ],
+            self.BEANS_BALANCE_VALUE_COL,
+            replay_command,
+            rebuild,
+        )
+        return [
+            (guild_id, member_id, Season(season), stored, replayed)
+            for guild_id, member_id, season, stored, replayed in mismatches
+        ]
+
     async def get_guild_beans_rankings_current(
         self, guild_id: int, season: Season = Season.CURRENT
     ) -> dict[int, int]:
@@ -2043,19 +2673,9 @@ class Database:
         season: Season = Season.CURRENT,
     ) -> BeansEvent:
         start_timestamp, end_timestamp = self.__get_season_interval(season)
-        command = f"""
-            SELECT * FROM {self.BEANS_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.BEANS_EVENT_TABLE}.{self.BEANS_EVENT_ID_COL}
-            WHERE {self.BEANS_EVENT_MEMBER_COL} = ?
-            AND {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.BEANS_EVENT_TYPE_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?
-            ORDER BY {self.EVENT_TIMESTAMP_COL} DESC LIMIT 1;
-        """
         task = (user_id, guild_id, beans_event_type, start_timestamp, end_timestamp)
 
-        rows = await self.__query_select(command, task)
+        rows = await self.__query_select(self.SELECT_LAST_BEANS_EVENT, task)
         if not rows or len(rows) < 1:
             return None
         return BeansEvent.from_db_row(rows[0])
@@ -2083,66 +2703,38 @@ class Database:
         }
         return rows
 
-    async def get_permanent_item_counts_by_guild(
-        self, guild_id: int
-    ) -> dict[int, dict[ItemType, int]]:
+    def __get_permanent_item_counts_query(self, guild_id: int) -> tuple[str, tuple]:
         item_types = [item.value for item in self.PERMANENT_ITEMS]
         list_sanitized = self.__list_sanitizer(item_types)
         command = f"""
-            SELECT {self.INVENTORY_EVENT_ITEM_TYPE_COL}, {self.INVENTORY_EVENT_MEMBER_COL}, SUM({self.INVENTORY_EVENT_AMOUNT_COL}) FROM {self.INVENTORY_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} 
-            ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.INVENTORY_EVENT_TABLE}.{self.INVENTORY_EVENT_ID_COL}
-            WHERE {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.INVENTORY_EVENT_ITEM_TYPE_COL} in {list_sanitized}
-            GROUP BY {self.INVENTORY_EVENT_MEMBER_COL}, {self.INVENTORY_EVENT_ITEM_TYPE_COL};
+            SELECT * FROM {self.INVENTORY_COUNT_TABLE} 
+            WHERE {self.INVENTORY_COUNT_GUILD_COL} = ?
+            AND {self.INVENTORY_COUNT_SEASON_COL} = ?
+            AND {self.INVENTORY_COUNT_ITEM_TYPE_COL} in {list_sanitized};
         """
-        task = (guild_id, *item_types)
-        rows = await self.__query_select(command, task)
-        if not rows or len(rows) < 1:
-            return {}
+        return command, (guild_id, Season.ALL_TIME.value, *item_types)
 
-        transformed = {}
-        for row in rows:
-            user_id = row[self.INVENTORY_EVENT_MEMBER_COL]
-            item_type = ItemType(row[self.INVENTORY_EVENT_ITEM_TYPE_COL])
-            amount = row[f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"]
-            if amount <= 0:
-                continue
-            if user_id not in transformed:
-                transformed[user_id] = {item_type: amount}
-            else:
-                transformed[user_id][item_type] = amount
-
-        return transformed
-
-    async def get_item_counts_by_guild(
-        self, guild_id: int, season: Season = Season.CURRENT
-    ) -> dict[int, dict[ItemType, int]]:
-        start_timestamp, end_timestamp = self.__get_season_interval(season)
+    def __get_item_counts_query(
+        self, guild_id: int, season: Season
+    ) -> tuple[str, tuple]:
         command = f"""
-            SELECT {self.INVENTORY_EVENT_ITEM_TYPE_COL}, {self.INVENTORY_EVENT_MEMBER_COL}, SUM({self.INVENTORY_EVENT_AMOUNT_COL}) FROM {self.INVENTORY_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} 
-            ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.INVENTORY_EVENT_TABLE}.{self.INVENTORY_EVENT_ID_COL}
-            WHERE {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?
-            GROUP BY {self.INVENTORY_EVENT_MEMBER_COL}, {self.INVENTORY_EVENT_ITEM_TYPE_COL};
+            SELECT * FROM {self.INVENTORY_COUNT_TABLE} 
+            WHERE {self.INVENTORY_COUNT_GUILD_COL} = ?
+            AND {self.INVENTORY_COUNT_SEASON_COL} = ?;
         """
-        task = (guild_id, start_timestamp, end_timestamp)
-        rows = await self.__query_select(command, task)
-
-        permanent_items = await self.get_permanent_item_counts_by_guild(guild_id)
+        return command, (guild_id, season.value)
 
+    def __transform_item_counts(self, rows) -> dict[int, dict[ItemType, int]]:
         if not rows or len(rows) < 1:
-            return permanent_items
+            return {}
 
         transformed = {}
         for row in rows:
-            user_id = row[self.INVENTORY_EVENT_MEMBER_COL]
-            if row[self.INVENTORY_EVENT_ITEM_TYPE_COL] not in ItemType:
+            user_id = row[self.INVENTORY_COUNT_MEMBER_COL]
+            if row[self.INVENTORY_COUNT_ITEM_TYPE_COL] not in ItemType:
                 continue
-            item_type = ItemType(row[self.INVENTORY_EVENT_ITEM_TYPE_COL])
-            amount = row[f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"]
+            item_type = ItemType(row[self.INVENTORY_COUNT_ITEM_TYPE_COL])
+            amount = row[self.INVENTORY_COUNT_AMOUNT_COL]
             if amount <= 0:
                 continue
             if user_id not in transformed:
@@ -2150,6 +2742,13 @@ class Database:
             else:
                 transformed[user_id][item_type] = amount
 
+        return transformed
+
+    def __merge_item_counts(
+        self,
+        transformed: dict[int, dict[ItemType, int]],
+        permanent_items: dict[int, dict[ItemType, int]],
+    ) -> dict[int, dict[ItemType, int]]:
         for user_id, item_counts in permanent_items.items():
             if user_id not in transformed:
                 transformed[user_id] = permanent_items[user_id]
@@ -2159,6 +2758,56 @@ class Database:
 
         return transformed
 
+    async def get_permanent_item_counts_by_guild(
+        self, guild_id: int
+    ) -> dict[int, dict[ItemType, int]]:
+        command, task = self.__get_permanent_item_counts_query(guild_id)
+        rows = await self.__query_select(command, task)
+        return self.__transform_item_counts(rows)
+
+    async def get_item_counts_by_guild(
+        self, guild_id: int, season: Season = Season.CURRENT
+    ) -> dict[int, dict[ItemType, int]]:
+        command, task = self.__get_item_counts_query(guild_id, season)
+        rows = await self.__query_select(command, task)
+
+        permanent_items = await self.get_permanent_item_counts_by_guild(guild_id)
+
+        return self.__merge_item_counts(
+            self.__transform_item_counts(rows), permanent_items
+        )
+
+    async def get_item_counts_snapshot_by_guild(
+        self, guild_id: int
+    ) -> tuple[dict[int, dict[ItemType, int]], int]:
+        queries = [
+            (self.SELECT_LAST_EVENT_ID, ()),
+            self.__get_item_counts_query(guild_id, Season.CURRENT),
+            self.__get_permanent_item_counts_query(guild_id),
+        ]
+        results = []
+
+        # one read transaction, so the counts include exactly the events up to the id
+        async with self.pool.read() as db:
+            await db.execute("BEGIN;")
+            try:
+                for command, task in queries:
+                    async with db.execute(command, task) as cursor:
+                        rows = await cursor.fetchall()
+                        headings = [x[0] for x in cursor.description]
+                        results.append(self.__parse_rows(rows, headings))
+            finally:
+                await db.commit()
+
+        last_event_rows, rows, permanent_rows = results
+        last_event_id = last_event_rows[0]["last_event_id"]
+
+        item_counts = self.__merge_item_counts(
+            self.__transform_item_counts(rows),
+            self.__transform_item_counts(permanent_rows),
+        )
+        return item_counts, last_event_id if last_event_id is not None else 0
+
     async def get_permanent_item_counts_by_user(
         self, guild_id: int, user_id: int, item_types: list[ItemType] = None
     ) -> dict[ItemType, int]:
@@ -2173,25 +2822,23 @@ class Database:
         permanent_types = [item.value for item in permanent_items]
         list_sanitized = self.__list_sanitizer(permanent_types)
         command = f"""
-            SELECT {self.INVENTORY_EVENT_ITEM_TYPE_COL}, SUM({self.INVENTORY_EVENT_AMOUNT_COL}) FROM {self.INVENTORY_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} 
-            ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.INVENTORY_EVENT_TABLE}.{self.INVENTORY_EVENT_ID_COL}
-            WHERE {self.INVENTORY_EVENT_MEMBER_COL} = ?
-            AND {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.INVENTORY_EVENT_ITEM_TYPE_COL} IN {list_sanitized}
-            GROUP BY {self.INVENTORY_EVENT_ITEM_TYPE_COL};
+            SELECT * FROM {self.INVENTORY_COUNT_TABLE} 
+            WHERE {self.INVENTORY_COUNT_GUILD_COL} = ?
+            AND {self.INVENTORY_COUNT_SEASON_COL} = ?
+            AND {self.INVENTORY_COUNT_MEMBER_COL} = ?
+            AND {self.INVENTORY_COUNT_ITEM_TYPE_COL} IN {list_sanitized};
         """
-        task = (user_id, guild_id, *permanent_types)
+        task = (guild_id, Season.ALL_TIME.value, user_id, *permanent_types)
         rows = await self.__query_select(command, task)
         if not rows or len(rows) < 1:
             return {}
 
         return {
-            ItemType(row[self.INVENTORY_EVENT_ITEM_TYPE_COL]): row[
-                f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"
+            ItemType(row[self.INVENTORY_COUNT_ITEM_TYPE_COL]): row[
+                self.INVENTORY_COUNT_AMOUNT_COL
             ]
             for row in rows
-            if row[f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"] > 0
+            if row[self.INVENTORY_COUNT_AMOUNT_COL] > 0
         }
 
     async def get_item_counts_by_user(
@@ -2202,28 +2849,19 @@ class Database:
         item_types: list[ItemType] = None,
     ) -> dict[ItemType, int]:
         item_types_filter = ""
-
-        start_timestamp, end_timestamp = self.__get_season_interval(season)
-        task = (user_id, guild_id, start_timestamp, end_timestamp)
+        task = (guild_id, season.value, user_id)
 
         if item_types is not None:
             types = [item.value for item in item_types]
             list_sanitized = self.__list_sanitizer(types)
             item_types_filter = (
-                f"AND {self.INVENTORY_EVENT_ITEM_TYPE_COL} IN {list_sanitized}"
+                f"AND {self.INVENTORY_COUNT_ITEM_TYPE_COL} IN {list_sanitized}"
             )
-            task = (user_id, guild_id, start_timestamp, end_timestamp, *types)
+            task = (guild_id, season.value, user_id, *types)
 
         command = f"""
-            SELECT {self.INVENTORY_EVENT_ITEM_TYPE_COL}, SUM({self.INVENTORY_EVENT_AMOUNT_COL}) FROM {self.INVENTORY_EVENT_TABLE} 
-            INNER JOIN {self.EVENT_TABLE} 
-            ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.INVENTORY_EVENT_TABLE}.{self.INVENTORY_EVENT_ID_COL}
-            WHERE {self.INVENTORY_EVENT_MEMBER_COL} = ?
-            AND {self.EVENT_GUILD_ID_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?
-            {item_types_filter}
-            GROUP BY {self.INVENTORY_EVENT_ITEM_TYPE_COL};
+            {self.SELECT_MEMBER_ITEM_COUNTS}
+            {item_types_filter};
         """
         rows = await self.__query_select(command, task)
 
@@ -2235,16 +2873,44 @@ class Database:
             return permanent_items
 
         transformed = {
-            ItemType(row[self.INVENTORY_EVENT_ITEM_TYPE_COL]): row[
-                f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"
+            ItemType(row[self.INVENTORY_COUNT_ITEM_TYPE_COL]): row[
+                self.INVENTORY_COUNT_AMOUNT_COL
             ]
             for row in rows
-            if row[f"SUM({self.INVENTORY_EVENT_AMOUNT_COL})"] > 0
-            and row[self.INVENTORY_EVENT_ITEM_TYPE_COL] in ItemType
+            if row[self.INVENTORY_COUNT_AMOUNT_COL] > 0
+            and row[self.INVENTORY_COUNT_ITEM_TYPE_COL] in ItemType
         }
         result = transformed | permanent_items
         return result
 
+    async def verify_inventory_counts(
+        self, rebuild: bool = False
+    ) -> list[tuple[int, int, str, Season, int, int]]:
+        replay_command = f"""
+            SELECT {self.EVENT_GUILD_ID_COL}, {self.INVENTORY_EVENT_MEMBER_COL}, {self.INVENTORY_EVENT_ITEM_TYPE_COL}, SUM({self.INVENTORY_EVENT_AMOUNT_COL}) FROM {self.INVENTORY_EVENT_TABLE} 
+            INNER JOIN {self.EVENT_TABLE} 
+            ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.INVENTORY_EVENT_TABLE}.{self.INVENTORY_EVENT_ID_COL}
+            WHERE {self.EVENT_TIMESTAMP_COL} > ?
+            AND {self.EVENT_TIMESTAMP_COL} <= ?
+            GROUP BY {self.EVENT_GUILD_ID_COL}, {self.INVENTORY_EVENT_MEMBER_COL}, {self.INVENTORY_EVENT_ITEM_TYPE_COL};
+        """
+        mismatches = await self.__verify_projection(
+            self.INVENTORY_COUNT_TABLE,
+            [
+                self.INVENTORY_COUNT_GUILD_COL,
+                self.INVENTORY_COUNT_MEMBER_COL,
+                self.INVENTORY_COUNT_ITEM_TYPE_COL,
+                self.INVENTORY_COUNT_SEASON_COL,
+            ],
+            self.INVENTORY_COUNT_AMOUNT_COL,
+            replay_command,
+            rebuild,
+        )
+        return [
+            (guild_id, member_id, item_type, Season(season), stored, replayed)
+            for guild_id, member_id, item_type, season, stored, replayed in mismatches
+        ]
+
     async def get_prediction_by_id(self, prediction_id: int) -> Prediction:
 
         command = f"""
@@ -2643,16 +3309,8 @@ class Database:
             plots.append(plot)
 
         start_timestamp, end_timestamp = self.__get_season_interval(season)
-        command = f"""
-            SELECT * FROM {self.GARDEN_EVENT_TABLE}
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.GARDEN_EVENT_TABLE}.{self.GARDEN_EVENT_ID_COL}
-            WHERE {self.GARDEN_EVENT_GARDEN_ID_COL} = ?
-            AND {self.EVENT_TIMESTAMP_COL} > ?
-            AND {self.EVENT_TIMESTAMP_COL} <= ?
-            ORDER BY {self.EVENT_TIMESTAMP_COL} DESC;
-        """
         task = (garden_id, start_timestamp, end_timestamp)
-        rows = await self.__query_select(command, task)
+        rows = await self.__query_select(self.SELECT_GARDEN_EVENTS, task)
         if not rows or len(rows) < 1:
             return plots
 
@@ -2995,13 +3653,8 @@ class Database:
     async def get_encounter_events_by_encounter_id(
         self, encounter_id: int
     ) -> list[EncounterEvent]:
-        command = f"""
-            SELECT * FROM {self.ENCOUNTER_EVENT_TABLE}
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.ENCOUNTER_EVENT_TABLE}.{self.ENCOUNTER_EVENT_ID_COL}
-            WHERE {self.ENCOUNTER_EVENT_ENCOUNTER_ID_COL} = {int(encounter_id)}
-            ORDER BY {self.EVENT_ID_COL} DESC;
-        """
-        rows = await self.__query_select(command)
+        task = (encounter_id,)
+        rows = await self.__query_select(self.SELECT_ENCOUNTER_EVENTS, task)
         if not rows:
             return []
 
@@ -3010,13 +3663,8 @@ class Database:
     async def get_combat_events_by_encounter_id(
         self, encounter_id: int
     ) -> list[CombatEvent]:
-        command = f"""
-            SELECT * FROM {self.COMBAT_EVENT_TABLE}
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.COMBAT_EVENT_TABLE}.{self.COMBAT_EVENT_ID_COL}
-            WHERE {self.COMBAT_EVENT_ENCOUNTER_ID_COL} = {int(encounter_id)}
-            ORDER BY {self.EVENT_ID_COL} DESC;
-        """
-        rows = await self.__query_select(command)
+        task = (encounter_id,)
+        rows = await self.__query_select(self.SELECT_COMBAT_EVENTS, task)
         if not rows:
             return []
 
@@ -3091,56 +3739,82 @@ class Database:
 
         return insert_id
 
-    async def get_skill_by_id(self, skill_id: int) -> Skill:
-        if skill_id is None:
-            return None
-
-        command = f""" 
-            SELECT * FROM {self.USER_GEAR_TABLE} 
-            WHERE {self.USER_GEAR_ID_COL} = {int(skill_id)}
-            ;
-        """
-        rows = await self.__query_select(command)
-        if not rows:
-            return None
+    async def log_user_drops(
+        self,
+        guild_id: int,
+        drops: list[tuple[int, Droppable]],
+        generator_version: str,
+    ) -> list[int]:
+        if len(drops) == 0:
+            return []
 
-        id = rows[0][self.USER_GEAR_ID_COL]
-        skill_type = SkillType(rows[0][self.USER_GEAR_TYPE_COL])
-        base_class = globals()[skill_type]
-        base_skill: BaseSkill = base_class()  # noqa: F405
-        rarity = Rarity(rows[0][self.USER_GEAR_RARITY_COL])
-        level = rows[0][self.USER_GEAR_LEVEL_COL]
-        locked = int(rows[0][self.USER_GEAR_IS_LOCKED_COL]) == 1
+        async with self.pool.write() as db:
+            try:
+                drop_ids = []
+                for idx in range(0, len(drops), self.INSERT_USER_DROPS_CHUNK_SIZE):
+                    chunk = drops[idx : idx + self.INSERT_USER_DROPS_CHUNK_SIZE]
+                    command = self.INSERT_USER_DROPS.format(
+                        ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+                    )
+                    task = [
+                        value
+                        for member_id, drop in chunk
+                        for value in (
+                            guild_id,
+                            member_id,
+                            drop.base.base_type.value,
+                            drop.type.value,
+                            drop.level,
+                            drop.rarity.value,
+                            generator_version,
+                            0,
+                            0,
+                        )
+                    ]
+                    async with db.execute(command, task) as cursor:
+                        rows = await cursor.fetchall()
+                    if len(rows) != len(chunk):
+                        raise ValueError("Drop creation error, missing gear ids")
+                    # autoincrement ids are handed out in insertion order
+                    drop_ids.extend(sorted(row[0] for row in rows))
+
+                modifier_rows = []
+                skill_rows = []
+                for drop_id, (_, drop) in zip(drop_ids, drops, strict=True):
+                    if drop.base.base_type != Base.GEAR:
+                        continue
+                    gear: Gear = drop
+                    for modifier, value in gear.modifiers.items():
+                        modifier_rows.append((drop_id, modifier.value, value))
+                    for skill_type in gear.skills:
+                        skill_rows.append((drop_id, skill_type.value))
+
+                await db.executemany(self.INSERT_USER_GEAR_MODIFIER, modifier_rows)
+                await db.executemany(self.INSERT_USER_GEAR_SKILL, skill_rows)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        return drop_ids
+
+    def __get_skill_from_row(self, row: dict[str, Any]) -> Skill:
+        skill_type = SkillType(row[self.USER_GEAR_TYPE_COL])
+        base_skill: BaseSkill = BASE_REGISTRY.create(skill_type)
 
         return Skill(
             base_skill=base_skill,
-            rarity=rarity,
-            level=level,
-            locked=locked,
-            id=id,
+            rarity=Rarity(row[self.USER_GEAR_RARITY_COL]),
+            level=row[self.USER_GEAR_LEVEL_COL],
+            locked=int(row[self.USER_GEAR_IS_LOCKED_COL]) == 1,
+            id=row[self.USER_GEAR_ID_COL],
         )
 
-    async def get_gear_by_id(self, gear_id: int) -> Gear:
-        if gear_id is None:
-            return None
-
-        command = f""" 
-            SELECT * FROM {self.USER_GEAR_TABLE} 
-            LEFT JOIN {self.USER_GEAR_MODIFIER_TABLE} ON {self.USER_GEAR_MODIFIER_GEAR_ID_COL} = {self.USER_GEAR_ID_COL}
-            LEFT JOIN {self.USER_GEAR_SKILL_TABLE} ON {self.USER_GEAR_SKILL_GEAR_ID_COL} = {self.USER_GEAR_ID_COL}
-            WHERE {self.USER_GEAR_ID_COL} = {int(gear_id)}
-            AND {self.USER_GEAR_IS_SCRAPPED_COL} = 0
-            ;
-        """
-        rows = await self.__query_select(command)
-        if not rows:
-            return None
-
+    def __get_gear_from_rows(self, rows: list[dict[str, Any]]) -> Gear:
         id = rows[0][self.USER_GEAR_ID_COL]
         name = rows[0][self.USER_GEAR_NAME_COL]
         gear_base_type = GearBaseType(rows[0][self.USER_GEAR_TYPE_COL])
-        base_class = globals()[gear_base_type]
-        gear_base: GearBase = base_class()  # noqa: F405
+        gear_base: GearBase = BASE_REGISTRY.create(gear_base_type)  # noqa: F405
         rarity = Rarity(rows[0][self.USER_GEAR_RARITY_COL])
         level = rows[0][self.USER_GEAR_LEVEL_COL]
         locked = int(rows[0][self.USER_GEAR_IS_LOCKED_COL]) == 1
@@ -3173,6 +3847,64 @@ class Database:
             id=id,
         )
 
+    async def get_skill_by_id(self, skill_id: int) -> Skill:
+        if skill_id is None:
+            return None
+
+        skills = await self.get_skills_by_ids([skill_id])
+        return skills.get(skill_id)
+
+    async def get_skills_by_ids(self, skill_ids: list[int]) -> dict[int, Skill]:
+        skill_ids = list({int(id) for id in skill_ids if id is not None})
+        if len(skill_ids) == 0:
+            return {}
+
+        command = f"""
+            SELECT * FROM {self.USER_GEAR_TABLE}
+            WHERE {self.USER_GEAR_ID_COL} IN {self.__list_sanitizer(skill_ids)}
+            ;
+        """
+        rows = await self.__query_select(command, skill_ids)
+        if not rows:
+            return {}
+
+        return {
+            row[self.USER_GEAR_ID_COL]: self.__get_skill_from_row(row) for row in rows
+        }
+
+    async def get_gear_by_id(self, gear_id: int) -> Gear:
+        if gear_id is None:
+            return None
+
+        gear = await self.get_gear_by_ids([gear_id])
+        return gear.get(gear_id)
+
+    async def get_gear_by_ids(self, gear_ids: list[int]) -> dict[int, Gear]:
+        gear_ids = list({int(id) for id in gear_ids if id is not None})
+        if len(gear_ids) == 0:
+            return {}
+
+        command = f"""
+            SELECT * FROM {self.USER_GEAR_TABLE}
+            LEFT JOIN {self.USER_GEAR_MODIFIER_TABLE} ON {self.USER_GEAR_MODIFIER_GEAR_ID_COL} = {self.USER_GEAR_ID_COL}
+            LEFT JOIN {self.USER_GEAR_SKILL_TABLE} ON {self.USER_GEAR_SKILL_GEAR_ID_COL} = {self.USER_GEAR_ID_COL}
+            WHERE {self.USER_GEAR_ID_COL} IN {self.__list_sanitizer(gear_ids)}
+            AND {self.USER_GEAR_IS_SCRAPPED_COL} = 0
+            ;
+        """
+        rows = await self.__query_select(command, gear_ids)
+        if not rows:
+            return {}
+
+        rows_by_gear: dict[int, list[dict[str, Any]]] = {}
+        for row in rows:
+            rows_by_gear.setdefault(row[self.USER_GEAR_ID_COL], []).append(row)
+
+        return {
+            gear_id: self.__get_gear_from_rows(gear_rows)
+            for gear_id, gear_rows in rows_by_gear.items()
+        }
+
     async def delete_gear_by_ids(self, gear_ids: list[int]):
         if gear_ids is None or len(gear_ids) == 0:
             return
@@ -3233,10 +3965,14 @@ class Database:
         if not rows:
             return skills
 
+        equipped = await self.get_skills_by_ids(
+            [row[self.USER_EQUIPPED_SKILLS_SKILL_ID_COL] for row in rows]
+        )
+
         for row in rows:
             skill_id = row[self.USER_EQUIPPED_SKILLS_SKILL_ID_COL]
             slot = row[self.USER_EQUIPPED_SKILLS_SLOT_COL]
-            skill = await self.get_skill_by_id(skill_id)
+            skill = equipped.get(skill_id)
             if skill is not None:
                 skills[slot] = skill
 
@@ -3314,52 +4050,75 @@ class Database:
     async def get_user_equipment(
         self, guild_id: int, member_id: int
     ) -> CharacterEquipment:
-        await self.create_user_equipment(guild_id, member_id)
+        equipment = await self.get_user_equipment_many(guild_id, [member_id])
+        return equipment.get(member_id)
+
+    async def get_user_equipment_many(
+        self, guild_id: int, member_ids: list[int]
+    ) -> dict[int, CharacterEquipment]:
+        member_ids = list(dict.fromkeys(member_ids))
+        if len(member_ids) == 0:
+            return {}
 
-        command = f""" 
-            SELECT * FROM {self.USER_EQUIPMENT_TABLE} 
-            WHERE {self.USER_EQUIPMENT_GUILD_ID_COL} = ?
-            AND {self.USER_EQUIPMENT_MEMBER_ID_COL} = ?
-            LIMIT 1;
+        command = f"""
+            INSERT OR IGNORE INTO {self.USER_EQUIPMENT_TABLE}
+            ({self.USER_EQUIPMENT_GUILD_ID_COL}, {self.USER_EQUIPMENT_MEMBER_ID_COL})
+            VALUES {", ".join(["(?, ?)" for _ in member_ids])};
         """
+        task = [value for member_id in member_ids for value in (guild_id, member_id)]
+        await self.__query_insert(command, task)
 
-        task = (guild_id, member_id)
+        command = f"""
+            SELECT * FROM {self.USER_EQUIPMENT_TABLE}
+            WHERE {self.USER_EQUIPMENT_GUILD_ID_COL} = ?
+            AND {self.USER_EQUIPMENT_MEMBER_ID_COL} IN {self.__list_sanitizer(member_ids)}
+            ;
+        """
+        task = (guild_id, *member_ids)
         rows = await self.__query_select(command, task)
         if not rows:
-            return None
-        row = rows[0]
+            return {}
 
-        weapon = None
-        weapon_id = row[self.USER_EQUIPMENT_WEAPON_ID_COL]
-        if weapon_id is not None and weapon_id < 0:
+        gear_columns = [
+            self.USER_EQUIPMENT_WEAPON_ID_COL,
+            self.USER_EQUIPMENT_HEADGEAR_ID_COL,
+            self.USER_EQUIPMENT_BODYGEAR_ID_COL,
+            self.USER_EQUIPMENT_LEGGEAR_ID_COL,
+            self.USER_EQUIPMENT_ACCESSORY_1_ID_COL,
+            self.USER_EQUIPMENT_ACCESSORY_2_ID_COL,
+        ]
+        gear_ids = [
+            row[column]
+            for row in rows
+            for column in gear_columns
+            if row[column] is not None and row[column] >= 0
+        ]
+        gear = await self.get_gear_by_ids(gear_ids)
+
+        equipment = {}
+        for row in rows:
+            member_id = row[self.USER_EQUIPMENT_MEMBER_ID_COL]
+
+            weapon_id = row[self.USER_EQUIPMENT_WEAPON_ID_COL]
             match weapon_id:
                 case -1:
                     weapon = DefaultStick()
                 case -2:
                     weapon = DefaultWand()
+                case _:
+                    weapon = gear.get(weapon_id)
+
+            equipment[member_id] = CharacterEquipment(
+                member_id=member_id,
+                weapon=weapon,
+                head_gear=gear.get(row[self.USER_EQUIPMENT_HEADGEAR_ID_COL]),
+                body_gear=gear.get(row[self.USER_EQUIPMENT_BODYGEAR_ID_COL]),
+                leg_gear=gear.get(row[self.USER_EQUIPMENT_LEGGEAR_ID_COL]),
+                accessory_1=gear.get(row[self.USER_EQUIPMENT_ACCESSORY_1_ID_COL]),
+                accessory_2=gear.get(row[self.USER_EQUIPMENT_ACCESSORY_2_ID_COL]),
+            )
 
-        if weapon is None:
-            weapon = await self.get_gear_by_id(weapon_id)
-
-        head_gear = await self.get_gear_by_id(row[self.USER_EQUIPMENT_HEADGEAR_ID_COL])
-        body_gear = await self.get_gear_by_id(row[self.USER_EQUIPMENT_BODYGEAR_ID_COL])
-        leg_gear = await self.get_gear_by_id(row[self.USER_EQUIPMENT_LEGGEAR_ID_COL])
-        accessory_1 = await self.get_gear_by_id(
-            row[self.USER_EQUIPMENT_ACCESSORY_1_ID_COL]
-        )
-        accessory_2 = await self.get_gear_by_id(
-            row[self.USER_EQUIPMENT_ACCESSORY_2_ID_COL]
-        )
-
-        return CharacterEquipment(
-            member_id=member_id,
-            weapon=weapon,
-            head_gear=head_gear,
-            body_gear=body_gear,
-            leg_gear=leg_gear,
-            accessory_1=accessory_1,
-            accessory_2=accessory_2,
-        )
+        return equipment
 
     async def update_user_equipment(
         self, guild_id: int, member_id: int, gear: Gear, acc_slot_2: bool = False
@@ -3416,16 +4175,13 @@ class Database:
         rows = await self.__query_select(command, task)
         if not rows:
             return []
-        equipment = []
-        for row in rows:
-            match type:
-                case Base.GEAR:
-                    item = await self.get_gear_by_id(row[self.USER_GEAR_ID_COL])
-                case Base.SKILL:
-                    item = await self.get_skill_by_id(row[self.USER_GEAR_ID_COL])
-            equipment.append(item)
-
-        return equipment
+        gear_ids = [row[self.USER_GEAR_ID_COL] for row in rows]
+        match type:
+            case Base.GEAR:
+                items = await self.get_gear_by_ids(gear_ids)
+                return [items.get(gear_id) for gear_id in gear_ids]
+            case Base.SKILL:
+                return [self.__get_skill_from_row(row) for row in rows]
 
     async def get_user_skill_inventory(
         self, guild_id: int, member_id: int
@@ -3448,8 +4204,7 @@ class Database:
         for row in rows:
             if row[self.USER_EQUIPPED_SKILLS_SKILL_ID_COL] is not None:
                 continue
-            gear_piece = await self.get_skill_by_id(row[self.USER_GEAR_ID_COL])
-            skills.append(gear_piece)
+            skills.append(self.__get_skill_from_row(row))
 
         return skills
 
@@ -3467,12 +4222,10 @@ class Database:
         rows = await self.__query_select(command, task)
         if not rows:
             return []
-        armory = []
-        for row in rows:
-            gear_piece = await self.get_gear_by_id(row[self.USER_GEAR_ID_COL])
-            armory.append(gear_piece)
+        gear_ids = [row[self.USER_GEAR_ID_COL] for row in rows]
+        armory = await self.get_gear_by_ids(gear_ids)
 
-        return armory
+        return [armory.get(gear_id) for gear_id in gear_ids]
 
     async def get_user_skill_stacks_used(
         self, guild_id: int, member_id: int
@@ -3505,8 +4258,7 @@ class Database:
         for row in rows:
             skill_type = SkillType(row[self.COMBAT_EVENT_SKILL_TYPE])
             skill_id = row[self.COMBAT_EVENT_SKILL_ID]
-            base_class = globals()[skill_type]
-            base_skill: BaseSkill = base_class()  # noqa: F405
+            base_skill: BaseSkill = BASE_REGISTRY.get_prototype(skill_type)
 
             if base_skill.reset_after_encounter:
                 if current_encounter_id is None:
@@ -3526,13 +4278,8 @@ class Database:
     async def get_opponent_skill_stacks_used(
         self, encounter_id: int
     ) -> dict[SkillType, int]:
-        command = f"""
-            SELECT * FROM {self.COMBAT_EVENT_TABLE}
-            INNER JOIN {self.EVENT_TABLE} ON {self.EVENT_TABLE}.{self.EVENT_ID_COL} = {self.COMBAT_EVENT_TABLE}.{self.COMBAT_EVENT_ID_COL}
-            WHERE {self.COMBAT_EVENT_ENCOUNTER_ID_COL} = {int(encounter_id)}
-            ORDER BY {self.EVENT_ID_COL} DESC;
-        """
-        rows = await self.__query_select(command)
+        task = (encounter_id,)
+        rows = await self.__query_select(self.SELECT_COMBAT_EVENTS, task)
         if not rows:
             return {}
 
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+
+from control.logger import BotLogger
+from events.bot_event import BotEvent
+
+
+class JournalEntry:
+
+    def __init__(self, event: BotEvent, future: asyncio.Future):
+        self.event = event
+        self.future = future
+
+
+class EventJournal:
+
+    def __init__(
+        self,
+        logger: BotLogger,
+        writer: Callable[[list[BotEvent]], Awaitable[list[int]]],
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.005,
+    ):
+        self.logger = logger
+        self.writer = writer
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval)
+        self.log_name = "DB"
+
+        self.queue: asyncio.Queue[JournalEntry] = None
+        self.worker: asyncio.Task = None
+        self.wakeup: asyncio.Event = None
+        self.pending: set[asyncio.Future] = set()
+        self.flush_requested = False
+
+        self.batches_written = 0
+        self.events_written = 0
+        self.largest_batch = 0
+
+    def __ensure_worker(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self.wakeup = asyncio.Event()
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self.__run())
+
+    def has_pending(self) -> bool:
+        return len(self.pending) > 0
+
+    async def enqueue(self, event: BotEvent) -> asyncio.Future:
+        self.__ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self.pending.add(future)
+        # waits while the queue is full, slowing producers down to disk speed
+        await self.queue.put(JournalEntry(event, future))
+        self.wakeup.set()
+        return future
+
+    async def log(self, event: BotEvent) -> int:
+        future = await self.enqueue(event)
+        self.flush_requested = True
+        self.wakeup.set()
+        return await future
+
+    async def flush(self):
+        if len(self.pending) == 0:
+            return
+        self.__ensure_worker()
+        self.flush_requested = True
+        self.wakeup.set()
+        await asyncio.wait(list(self.pending))
+
+    async def close(self):
+        await self.flush()
+        if self.worker is not None:
+            self.worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.worker
+            self.worker = None
+
+    async def __run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                while not self.queue.empty() and len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+
+                remaining = deadline - loop.time()
+                if (
+                    len(batch) >= self.batch_size
+                    or self.flush_requested
+                    or remaining <= 0
+                ):
+                    break
+
+                self.wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), remaining)
+
+            await self.__write(batch)
+
+    async def __write(self, batch: list[JournalEntry]):
+        try:
+            event_ids = await self.writer([entry.event for entry in batch])
+        except Exception as e:
+            self.logger.error(
+                self.log_name, f"Failed to write batch of {len(batch)} events: {e}"
+            )
+            event_ids = [None for _ in batch]
+
+        for entry, event_id in zip(batch, event_ids, strict=True):
+            # in-memory copies of the event can be matched against db rows
+            if entry.event.id is None:
+                entry.event.id = event_id
+            if not entry.future.done():
+                entry.future.set_result(event_id)
+            self.pending.discard(entry.future)
+
+        self.batches_written += 1
+        self.events_written += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        if len(self.pending) == 0:
+            self.flush_requested = False
+
+    def get_stats(self) -> tuple[int, int, int, int]:
+        queued = self.queue.qsize() if self.queue is not None else 0
+        return self.events_written, self.batches_written, self.largest_batch, queued
@@ -11,12 +11,14 @@ class UserJail:
         jailed_on: datetime.datetime,
         released_on: datetime.datetime = None,
         id: int = None,
+        duration: int = 0,
     ):
         self.guild_id = guild_id
         self.member_id = member_id
         self.jailed_on = jailed_on
         self.released_on = released_on
         self.id = id
+        self.duration = duration
 
     def get_jailed_on_timestamp(self) -> int:
         return int(self.jailed_on.timestamp())
@@ -40,6 +42,7 @@ class UserJail:
             jail.jailed_on,
             released_on,
             jail_id,
+            jail.duration,
         )
 
     @staticmethod
@@ -59,4 +62,5 @@ class UserJail:
                 else None
             ),
             row[Database.JAIL_ID_COL],
+            row[Database.JAIL_DURATION_COL],
         )
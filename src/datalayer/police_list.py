@@ -1,56 +1,124 @@
 import collections
 import datetime
-import itertools
+import sys
+import time
+from array import array
 
 
-class PoliceListNode:
+class MessageWindow:
 
-    def __init__(self, author_id: int):
-        self.author_id = author_id
-        self.spam_message_queue = collections.deque(maxlen=50)
-        self.timeout_message_queue = collections.deque(maxlen=50)
-        self.timeout_flag = False
+    __slots__ = ("size", "timestamps", "count", "start")
+
+    def __init__(self, size: int):
+        self.size = size
+        # millisecond timestamps, slot i % size holds the i-th tracked message
+        self.timestamps = array("q", [0]) * size
+        self.count = 0
+        self.start = 0
+
+    def __len__(self) -> int:
+        return min(self.count - self.start, self.size)
 
-    def __threshold_check(
-        self, queue: collections.deque, interval: int, limit: int, offset: int = 0
-    ) -> bool:
-        if len(queue) < (limit + offset):
+    def append(self, timestamp: int) -> None:
+        if len(self) > 0:
+            # keeps the window ordered so its span is newest minus oldest
+            timestamp = max(timestamp, self.timestamps[(self.count - 1) % self.size])
+        self.timestamps[self.count % self.size] = timestamp
+        self.count += 1
+
+    def clear(self) -> None:
+        # count keeps growing so cached positions never match a cleared window
+        self.start = self.count
+
+    def within(self, interval: int, limit: int, offset: int = 0) -> bool:
+        if limit < 1 or len(self) < (limit + offset):
             return False
 
-        min_time = datetime.datetime.max
-        max_time = datetime.datetime.min
+        newest = self.timestamps[(self.count - 1 - offset) % self.size]
+        oldest = self.timestamps[(self.count - offset - limit) % self.size]
+        return newest - oldest < interval
+
+    def get_size(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.timestamps)
+
 
-        slice_start = len(queue) - (limit + offset)
-        slice_end = len(queue) - offset
+class PoliceListNode:
 
-        slice_result = list(itertools.islice(queue, slice_start, slice_end))
+    QUEUE_SIZE = 50
 
-        for timestamp in slice_result:
-            min_time = min([min_time, timestamp.replace(tzinfo=None)])
-            max_time = max([max_time, timestamp.replace(tzinfo=None)])
+    __slots__ = (
+        "author_id",
+        "spam_messages",
+        "timeout_messages",
+        "timeout_flag",
+        "last_seen",
+        "spam_streak",
+        "spam_streak_count",
+        "spam_streak_settings",
+    )
 
-        difference = max_time - min_time
-        return difference.total_seconds() < interval
+    def __init__(self, author_id: int):
+        self.author_id = author_id
+        self.spam_messages = MessageWindow(self.QUEUE_SIZE)
+        self.timeout_messages = MessageWindow(self.QUEUE_SIZE)
+        self.timeout_flag = False
+        self.last_seen = time.monotonic()
+
+        # consecutive spam windows ending at the latest message
+        self.spam_streak = 0
+        self.spam_streak_count = 0
+        self.spam_streak_settings: tuple[int, int] = None
+
+    @staticmethod
+    def __to_millis(timestamp: datetime.datetime) -> int:
+        return int(timestamp.timestamp() * 1000)
+
+    def __get_spam_streak(self, interval: int, limit: int) -> int:
+        window = self.spam_messages
+        settings = (interval, limit)
+
+        if settings == self.spam_streak_settings:
+            if self.spam_streak_count == window.count:
+                return self.spam_streak
+
+            if self.spam_streak_count == window.count - 1:
+                # every window of the old streak moved back by one message
+                streak = 0
+                if window.within(interval * 1000, limit):
+                    streak = min(self.spam_streak + 1, len(window) - limit + 1)
+                self.spam_streak = streak
+                self.spam_streak_count = window.count
+                return streak
+
+        streak = 0
+        while window.within(interval * 1000, limit, streak):
+            streak += 1
+
+        self.spam_streak = streak
+        self.spam_streak_count = window.count
+        self.spam_streak_settings = settings
+        return streak
 
     def track_spam_message(self, message_timestamp: datetime.datetime) -> None:
-        self.spam_message_queue.append(message_timestamp)
+        self.last_seen = time.monotonic()
+        self.spam_messages.append(self.__to_millis(message_timestamp))
 
     def track_timeout_message(self, message_timestamp: datetime.datetime) -> None:
-        self.timeout_message_queue.append(message_timestamp)
+        self.last_seen = time.monotonic()
+        self.timeout_messages.append(self.__to_millis(message_timestamp))
 
     def spam_check(self, interval: int, limit: int, offset: int = 0) -> bool:
-        return self.__threshold_check(self.spam_message_queue, interval, limit, offset)
+        if offset == 0:
+            return self.__get_spam_streak(interval, limit) > 0
+        return self.spam_messages.within(interval * 1000, limit, offset)
 
     def check_spam_score_increase(self, interval: int, limit: int) -> bool:
         # only returns true for every limit'th message the user was spamming in a row
-        offset = 0
-        while self.spam_check(interval, limit, offset):
-            offset += 1
-
+        offset = self.__get_spam_streak(interval, limit)
         return offset == 1 or (offset - 1) % limit == 0
 
     def timeout_check(self, interval: int, limit: int) -> bool:
-        return self.__threshold_check(self.timeout_message_queue, interval, limit, 0)
+        return self.timeout_messages.within(interval * 1000, limit)
 
     def is_in_timeout(self) -> datetime.datetime:
         return self.timeout_flag
@@ -60,26 +128,60 @@ class PoliceListNode:
 
     def release(self) -> None:
         self.timeout_flag = False
-        self.timeout_message_queue.clear()
+        self.timeout_messages.clear()
+
+    def get_size(self) -> int:
+        return (
+            sys.getsizeof(self)
+            + self.spam_messages.get_size()
+            + self.timeout_messages.get_size()
+        )
 
 
 class PoliceList:
 
-    def __init__(self):
-        self.users: dict[int, PoliceListNode] = {}
+    MAX_USERS = 5000
+    IDLE_TTL = 60 * 60
+
+    def __init__(self, max_users: int = MAX_USERS, idle_ttl: float = IDLE_TTL):
+        # least recently active user first
+        self.users: collections.OrderedDict[int, PoliceListNode] = (
+            collections.OrderedDict()
+        )
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.evicted = 0
+
+    def __evict(self) -> None:
+        # timeouts are tracked by the timeout manager, a fresh node is a released one
+        now = time.monotonic()
+        while len(self.users) > 0:
+            node = next(iter(self.users.values()))
+            idle = now - node.last_seen >= self.idle_ttl
+
+            if not idle and len(self.users) <= self.max_users:
+                return
+
+            self.users.popitem(last=False)
+            self.evicted += 1
 
     def add_user(self, author_id: int) -> None:
         self.users[author_id] = PoliceListNode(author_id)
+        self.users.move_to_end(author_id)
+        self.__evict()
 
     def track_spam_message(
         self, user_id: int, message_timestamp: datetime.datetime
     ) -> None:
         self.users[user_id].track_spam_message(message_timestamp)
+        self.users.move_to_end(user_id)
+        self.__evict()
 
     def track_timeout_message(
         self, user_id: int, message_timestamp: datetime.datetime
     ) -> None:
         self.users[user_id].track_timeout_message(message_timestamp)
+        self.users.move_to_end(user_id)
 
     def remove_user(self, author_id: int) -> None:
         del self.users[author_id]
@@ -95,3 +197,10 @@ class PoliceList:
 
     def mark_as_notified(self, author_id: int) -> None:
         self.users[author_id].notify()
+
+    def get_stats(self) -> tuple[int, int, int]:
+        # tracked users, evicted users, approximate bytes held by the tracker
+        size = sys.getsizeof(self.users) + sum(
+            node.get_size() for node in self.users.values()
+        )
+        return len(self.users), self.evicted, size
@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+import discord
+from discord.ext import commands
+
+from combat.skills.types import SkillType
+from control.logger import BotLogger
+from datalayer.database import Database
+from datalayer.types import UserInteraction
+from events.bat_event import BatEvent
+from events.beans_event import BeansEvent
+from events.bot_event import BotEvent
+from events.combat_event import CombatEvent
+from events.encounter_event import EncounterEvent
+from events.garden_event import GardenEvent
+from events.interaction_event import InteractionEvent
+from events.inventory_event import InventoryEvent
+from events.jail_event import JailEvent
+from events.karma_event import KarmaEvent
+from events.lootbox_event import LootBoxEvent
+from events.prediction_event import PredictionEvent
+from events.quote_event import QuoteEvent
+from events.spam_event import SpamEvent
+from events.timeout_event import TimeoutEvent
+from events.types import (
+    BeansEventType,
+    CombatEventType,
+    EncounterEventType,
+    EventType,
+    GardenEventType,
+    JailEventType,
+    LootBoxEventType,
+    PredictionEventType,
+)
+from items.types import ItemType
+
+GUILD_ID = 1
+MEMBER_ID = 2
+OTHER_MEMBER_ID = 3
+
+
+def create_event(event_type: EventType, idx: int) -> BotEvent:
+    now = datetime.datetime.now()
+    match event_type:
+        case EventType.INTERACTION:
+            return InteractionEvent(
+                now, GUILD_ID, UserInteraction.SLAP, MEMBER_ID, OTHER_MEMBER_ID
+            )
+        case EventType.JAIL:
+            return JailEvent(now, GUILD_ID, JailEventType.SLAP, MEMBER_ID, 5, idx)
+        case EventType.TIMEOUT:
+            return TimeoutEvent(now, GUILD_ID, MEMBER_ID, 60)
+        case EventType.QUOTE:
+            return QuoteEvent(now, GUILD_ID, idx)
+        case EventType.SPAM:
+            return SpamEvent(now, GUILD_ID, MEMBER_ID)
+        case EventType.BEANS:
+            return BeansEvent(now, GUILD_ID, BeansEventType.DAILY, MEMBER_ID, 1)
+        case EventType.INVENTORY:
+            return InventoryEvent(now, GUILD_ID, MEMBER_ID, ItemType.LOOTBOX, 1)
+        case EventType.LOOTBOX:
+            return LootBoxEvent(now, GUILD_ID, idx, MEMBER_ID, LootBoxEventType.CLAIM)
+        case EventType.BAT:
+            return BatEvent(now, GUILD_ID, MEMBER_ID, OTHER_MEMBER_ID, 5)
+        case EventType.PREDICTION:
+            return PredictionEvent(
+                now, GUILD_ID, idx, MEMBER_ID, PredictionEventType.PLACE_BET, 1, 10
+            )
+        case EventType.GARDEN:
+            return GardenEvent(
+                now, GUILD_ID, idx, 0, MEMBER_ID, GardenEventType.WATER, None
+            )
+        case EventType.ENCOUNTER:
+            return EncounterEvent(
+                now, GUILD_ID, idx, MEMBER_ID, EncounterEventType.MEMBER_ENGAGE
+            )
+        case EventType.COMBAT:
+            return CombatEvent(
+                now,
+                GUILD_ID,
+                idx,
+                MEMBER_ID,
+                OTHER_MEMBER_ID,
+                SkillType.NORMAL_ATTACK,
+                10,
+                None,
+                CombatEventType.MEMBER_TURN,
+            )
+        case EventType.KARMA:
+            return KarmaEvent(now, GUILD_ID, 1, MEMBER_ID, OTHER_MEMBER_ID)
+    return None
+
+
+async def benchmark(event_count: int, awaited: bool, read_every: int):
+    bot = commands.Bot(command_prefix="/", intents=discord.Intents.none())
+    with tempfile.TemporaryDirectory() as directory:
+        logger = BotLogger(bot, os.path.join(directory, "benchmark.log"))
+        database = Database(bot, logger, os.path.join(directory, "benchmark.sqlite"))
+        await database.create_tables()
+
+        print(
+            f"{'event type':<14}{'events':>10}{'seconds':>10}{'events/s':>12}{'batches':>10}{'avg batch':>11}"
+        )
+        for event_type in EventType:
+            if create_event(event_type, 0) is None:
+                continue
+
+            events = [create_event(event_type, idx) for idx in range(event_count)]
+            _, batches_before, _, _ = database.journal.get_stats()
+            start = time.perf_counter()
+            for idx, event in enumerate(events):
+                if awaited:
+                    await database.log_event(event)
+                else:
+                    await database.queue_event(event)
+                if read_every > 0 and idx % read_every == 0:
+                    await database.get_guild_settings(GUILD_ID)
+            await database.flush_events()
+            duration = time.perf_counter() - start
+            _, batches_after, _, _ = database.journal.get_stats()
+            batches = batches_after - batches_before
+
+            print(
+                f"{event_type.value:<14}{event_count:>10}{duration:>10.3f}{event_count / duration:>12.0f}{batches:>10}{event_count / batches:>11.1f}"
+            )
+
+        await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event logging micro benchmark.")
+    parser.add_argument("-n", "--events", type=int, default=5000)
+    parser.add_argument(
+        "--awaited",
+        action="store_true",
+        help="wait for every event to be written before logging the next one",
+    )
+    parser.add_argument(
+        "--read-every",
+        type=int,
+        default=0,
+        help="read the guild settings after every n-th event to mix in reads",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.events, args.awaited, args.read_every))
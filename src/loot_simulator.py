@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from combat.enemies.enemy import Enemy
+from combat.enemies.types import EnemyType
+from combat.gear.gear import Gear
+from combat.gear.types import Base, GearModifierType, Rarity
+from control.combat.combat_enemy_manager import CombatEnemyManager
+from control.combat.combat_gear_manager import CombatGearManager
+from control.controller import Controller
+
+CHUNK_SIZE = 20000
+
+gear_manager: CombatGearManager = None
+enemy_manager: CombatEnemyManager = None
+
+
+class ModifierStats:
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min_value = None
+        self.max_value = None
+        self.total_quality = 0.0
+
+    def add(self, value: float, quality: float):
+        self.count += 1
+        self.total += value
+        self.total_quality += quality
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def merge(self, other: "ModifierStats"):
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.total_quality += other.total_quality
+        if self.min_value is None or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        if self.max_value is None or other.max_value > self.max_value:
+            self.max_value = other.max_value
+
+
+class LevelStats:
+
+    def __init__(self, level: int):
+        self.level = level
+        self.kills = 0
+        self.drops = 0
+        self.skills = 0
+        self.rarities: Counter[Rarity] = Counter()
+        self.beans: Counter[int] = Counter()
+        self.loot_amounts: Counter[int] = Counter()
+        self.modifiers: dict[GearModifierType, ModifierStats] = {}
+
+    def add_modifier(self, modifier_type: GearModifierType, value, quality):
+        if modifier_type not in self.modifiers:
+            self.modifiers[modifier_type] = ModifierStats()
+        self.modifiers[modifier_type].add(value, quality)
+
+    def merge(self, other: "LevelStats"):
+        self.kills += other.kills
+        self.drops += other.drops
+        self.skills += other.skills
+        self.rarities.update(other.rarities)
+        self.beans.update(other.beans)
+        self.loot_amounts.update(other.loot_amounts)
+        for modifier_type, stats in other.modifiers.items():
+            if modifier_type not in self.modifiers:
+                self.modifiers[modifier_type] = ModifierStats()
+            self.modifiers[modifier_type].merge(stats)
+
+
+def get_percentile(values: Counter[int], percentile: float) -> int:
+    target = sum(values.values()) * percentile
+    seen = 0
+    for value in sorted(values):
+        seen += values[value]
+        if seen >= target:
+            return value
+    return None
+
+
+def init_worker():
+    global gear_manager, enemy_manager
+    # services only touch the db when persisting, which the simulator never does
+    controller = Controller(None, None, None)
+    gear_manager = controller.get_service(CombatGearManager)
+    enemy_manager = controller.get_service(CombatEnemyManager)
+
+
+def get_enemies(level: int, enemy_type: EnemyType | None) -> list[Enemy]:
+    if enemy_type is not None:
+        return [enemy_manager.get_enemy(enemy_type)]
+
+    enemies = [enemy_manager.get_enemy(enemy_type) for enemy_type in EnemyType]
+    eligible = [
+        enemy for enemy in enemies if enemy.min_level <= level <= enemy.max_level
+    ]
+    if len(eligible) > 0:
+        return eligible
+    return enemies
+
+
+async def simulate_chunk(
+    level: int,
+    kills: int,
+    seed: int,
+    enemy_type: EnemyType | None,
+    exclude_skills: bool,
+) -> LevelStats:
+    rng = random.Random(seed)
+    enemies = get_enemies(level, enemy_type)
+    stats = LevelStats(level)
+
+    for _ in range(kills):
+        enemy = rng.choice(enemies)
+        stats.kills += 1
+        stats.beans[enemy.roll_beans_amount(level, rng)] += 1
+
+        loot_amount = enemy.roll_loot_amount(level, rng)
+        stats.loot_amounts[loot_amount] += 1
+
+        for _ in range(loot_amount):
+            drop = await gear_manager.generate_drop(
+                None, None, level, enemy, exclude_skills, rng
+            )
+            if drop is None:
+                continue
+
+            stats.drops += 1
+            stats.rarities[drop.rarity] += 1
+
+            if drop.base.base_type == Base.SKILL:
+                stats.skills += 1
+                continue
+
+            gear: Gear = drop
+            for modifier_type, value in gear.modifiers.items():
+                min_roll, max_roll = await gear_manager.get_modifier_boundaries(
+                    gear.base, level, modifier_type
+                )
+                quality = 1.0
+                if max_roll > min_roll:
+                    # integer modifiers are floored and can land below min_roll
+                    quality = (value - min_roll) / (max_roll - min_roll)
+                    quality = min(1.0, max(0.0, quality))
+                stats.add_modifier(modifier_type, value, quality)
+
+    return stats
+
+
+def run_chunk(task: tuple) -> LevelStats:
+    return asyncio.run(simulate_chunk(*task))
+
+
+def print_report(stats: LevelStats, show_modifiers: bool):
+    print("=" * 72)
+    print(
+        f"Level {stats.level}: {stats.kills} kills, {stats.drops} drops, "
+        f"{stats.drops / max(1, stats.kills):.2f} drops/kill, "
+        f"{stats.skills / max(1, stats.drops) * 100:.2f}% skills"
+    )
+
+    beans_total = sum(value * count for value, count in stats.beans.items())
+    print(
+        f"  beans: mean {beans_total / max(1, stats.kills):.1f}, "
+        f"min {min(stats.beans)}, p50 {get_percentile(stats.beans, 0.5)}, "
+        f"p90 {get_percentile(stats.beans, 0.9)}, max {max(stats.beans)}"
+    )
+    loot_amounts = ", ".join(
+        f"{amount}: {count / stats.kills * 100:.1f}%"
+        for amount, count in sorted(stats.loot_amounts.items())
+    )
+    print(f"  loot amount: {loot_amounts}")
+
+    rarities = ", ".join(
+        f"{rarity.value}: {stats.rarities[rarity] / max(1, stats.drops) * 100:.2f}%"
+        for rarity in Rarity
+        if stats.rarities[rarity] > 0
+    )
+    print(f"  rarity: {rarities}")
+
+    if not show_modifiers:
+        return
+
+    print(
+        f"  {'modifier':<24}{'rolls':>10}{'mean':>12}{'min':>12}{'max':>12}{'quality':>10}"
+    )
+    for modifier_type, modifier in sorted(
+        stats.modifiers.items(), key=lambda item: item[0].value
+    ):
+        print(
+            f"  {modifier_type.value:<24}{modifier.count:>10}"
+            f"{modifier.total / modifier.count:>12.2f}{modifier.min_value:>12.2f}"
+            f"{modifier.max_value:>12.2f}{modifier.total_quality / modifier.count:>10.3f}"
+        )
+
+
+def simulate(
+    levels: list[int],
+    kills: int,
+    workers: int,
+    seed: int,
+    enemy_type: EnemyType | None,
+    exclude_skills: bool,
+    show_modifiers: bool,
+):
+    seeder = random.Random(seed)
+    tasks = []
+    for level in levels:
+        remaining = kills
+        while remaining > 0:
+            chunk = min(CHUNK_SIZE, remaining)
+            tasks.append(
+                (level, chunk, seeder.getrandbits(64), enemy_type, exclude_skills)
+            )
+            remaining -= chunk
+
+    results = {level: LevelStats(level) for level in levels}
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        for stats in pool.map(run_chunk, tasks):
+            results[stats.level].merge(stats)
+    duration = time.perf_counter() - start
+
+    for level in levels:
+        print_report(results[level], show_modifiers)
+
+    total_drops = sum(stats.drops for stats in results.values())
+    print("=" * 72)
+    print(
+        f"Simulated {kills * len(levels)} kills and {total_drops} drops "
+        f"in {duration:.2f}s ({total_drops / duration:.0f} drops/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Monte-Carlo simulation of encounter loot and bean payouts."
+    )
+    parser.add_argument("-l", "--levels", type=int, nargs="+", default=range(1, 13))
+    parser.add_argument(
+        "-n", "--kills", type=int, default=100000, help="simulated kills per level"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument(
+        "-e",
+        "--enemy",
+        choices=[enemy_type.value for enemy_type in EnemyType],
+        default=None,
+        help="enemy to simulate, defaults to every enemy spawning at the level",
+    )
+    parser.add_argument("--exclude-skills", action="store_true")
+    parser.add_argument(
+        "--modifiers", action="store_true", help="report modifier roll statistics"
+    )
+    args = parser.parse_args()
+    enemy_type = EnemyType(args.enemy) if args.enemy is not None else None
+
+    simulate(
+        list(args.levels),
+        args.kills,
+        args.workers,
+        args.seed,
+        enemy_type,
+        args.exclude_skills,
+        args.modifiers,
+    )
@@ -13,6 +13,8 @@ from view.view_menu import ViewMenu
 
 class CombatTurnView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(
         self,
         controller: Controller,
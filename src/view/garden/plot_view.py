@@ -15,6 +15,8 @@ from view.view_menu import ViewMenu
 
 class PlotView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(
         self,
         controller: Controller,
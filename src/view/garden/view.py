@@ -19,6 +19,8 @@ class GardenViewState(Enum):
 
 class GardenView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(
         self,
         controller: Controller,
@@ -8,6 +8,8 @@ from view.view_menu import ViewMenu
 
 class LootBoxView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(self, controller: Controller, owner_id: int = None):
         super().__init__(timeout=None)
         self.controller = controller
@@ -12,6 +12,8 @@ from view.view_menu import ViewMenu
 
 class PredictionInfoView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(
         self,
         controller: Controller,
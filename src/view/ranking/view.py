@@ -12,6 +12,8 @@ from view.view_menu import ViewMenu
 
 class RankingView(ViewMenu):
 
+    RECEIVES_BROADCASTS = False
+
     def __init__(
         self, controller: Controller, interaction: discord.Interaction, season: Season
     ):
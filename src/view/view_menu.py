@@ -9,6 +9,10 @@ class ViewMenu(discord.ui.View, ABC):
 
     class_counter = 0
 
+    # views that only react to events addressed to their own id opt out of
+    # view agnostic events
+    RECEIVES_BROADCASTS: bool = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.id = ViewMenu.class_counter